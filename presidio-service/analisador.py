@@ -0,0 +1,44 @@
+"""
+AnalyzerEngine Instrumentado - tempo de NLP, reconhecedores e contexto
+
+O AnalyzerEngine.analyze do Presidio executa, em uma única chamada, o
+pipeline spaCy, todos os reconhecedores e o realce por contexto. Esta
+subclasse separa essas etapas no Cronometro da requisição (metricas.py),
+sem alterar o resultado da análise.
+
+O realce por contexto padrão é trocado pelo RealceContextoIndexado
+(contexto_documento.py), que indexa o documento uma vez, e os reconhecedores
+que não podem casar no texto são pulados (prefiltro.py).
+"""
+from presidio_analyzer import AnalyzerEngine
+
+from contexto_documento import RealceContextoIndexado
+from metricas import cronometro_atual
+from prefiltro import prefiltrar
+
+
+class AnalisadorInstrumentado(AnalyzerEngine):
+    """
+    AnalyzerEngine que registra as etapas nlp / reconhecedores / contexto
+    """
+
+    def __init__(self, **kwargs):
+        if kwargs.get("context_aware_enhancer") is None:
+            kwargs["context_aware_enhancer"] = RealceContextoIndexado()
+        super().__init__(**kwargs)
+
+    def analyze(self, text: str, language: str, **kwargs):
+        cronometro = cronometro_atual()
+
+        # NLP fora do analyze() para ter o tempo separado dos reconhecedores
+        # (análise em lote e caminho só-regex já trazem os artefatos prontos)
+        if kwargs.get("nlp_artifacts") is None:
+            with cronometro.etapa("nlp"):
+                kwargs["nlp_artifacts"] = self.nlp_engine.process_text(text, language)
+
+        with cronometro.etapa("reconhecedores"), prefiltrar(text):
+            return super().analyze(text, language, **kwargs)
+
+    def _enhance_using_context(self, *args, **kwargs):
+        with cronometro_atual().etapa("contexto"):
+            return super()._enhance_using_context(*args, **kwargs)
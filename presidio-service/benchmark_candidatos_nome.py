@@ -0,0 +1,51 @@
+"""
+Benchmark e sondas do gerador de candidatos a nome (candidatos_nome.py)
+
+Sondas: trechos com sobrenomes raros (fora do léxico de algumas centenas de
+nomes), nomes com hífen/apóstrofo e conectores nas pontas. O candidato tem
+de cobrir o nome inteiro - o léxico só pontua, não corta.
+
+Depois mede, na amostra do e-SIC, candidatos e tempo do gerador.
+"""
+import time
+
+from candidatos_nome import GeradorCandidatosNome
+
+REPETICOES = 5
+
+# (texto, nome que o candidato deve cobrir inteiro)
+SONDAS = [
+    ("Meu nome é Maria Silva Zanotelli e moro em Taguatinga", "Maria Silva Zanotelli"),
+    ("Falei com Joaquim Xavantes Borba ontem", "Joaquim Xavantes Borba"),
+    ("A servidora Iolanda Kowalczyk Tavares atendeu", "Iolanda Kowalczyk Tavares"),
+    ("Reclamação contra Wenceslau Bittencourt Pimpão", "Wenceslau Bittencourt Pimpão"),
+    ("Assinado: Ana-Maria Silva", "Ana-Maria Silva"),
+    ("O paciente O'Brien McDonald aguardou", "O'Brien McDonald"),
+    ("Encaminhado a D'Ávila Souza", "D'Ávila Souza"),
+    ("Encaminhado a Pedro d’Ávila Marçal", "Pedro d’Ávila Marçal"),
+    ("Atendido por José da Silva e Santos", "José da Silva e Santos"),
+]
+
+gerador = GeradorCandidatosNome()
+
+falhas = 0
+print(f"{'sonda':<36}candidatos")
+for texto, nome in SONDAS:
+    resultados = gerador.analyze(texto, ["PERSON"])
+    candidatos = [(texto[r.start:r.end], r.score) for r in resultados]
+    inicio = texto.index(nome)
+    cobre = any(r.start <= inicio and r.end >= inicio + len(nome) for r in resultados)
+    falhas += not cobre
+    print(f"{'✅' if cobre else '❌'} {nome:<34}{candidatos}")
+print(f"\nSondas cobertas: {len(SONDAS) - falhas}/{len(SONDAS)}\n")
+
+with open("../AMOSTRA_e-SIC.txt", encoding="utf-8") as f:
+    amostra = f.read()
+
+inicio = time.perf_counter()
+for _ in range(REPETICOES):
+    resultados = gerador.analyze(amostra, ["PERSON"])
+tempo = (time.perf_counter() - inicio) / REPETICOES * 1000
+
+print(f"Amostra: {len(amostra)} caracteres | média de {REPETICOES} execuções")
+print(f"Candidatos: {len(resultados)} | {tempo:.1f} ms")
@@ -0,0 +1,70 @@
+"""
+Casos de colisão entre identificadores numéricos (malha_numerica.py)
+
+Para cada caso, os resultados (tipo, trecho, score) de reconhecedores
+diferentes sobre os mesmos dígitos passam pelo resolver_colisoes e conferem:
+
+- o tipo que fica é o esperado
+- o texto tarjado com os resultados resolvidos é o mesmo da anonimização
+  com todos os resultados (a malha não muda a escolha por score). No empate
+  de score a anonimização escolhe pela ordem da lista; ali decide a malha
+
+Não precisa da API nem do spaCy.
+"""
+from presidio_analyzer import RecognizerResult
+from presidio_anonymizer import AnonymizerEngine
+from presidio_anonymizer.entities import OperatorConfig
+
+from malha_numerica import resolver_colisoes
+
+# (texto, [(tipo, trecho, score)], tipo que deve ficar no trecho do primeiro resultado)
+CASOS = [
+    # 11 dígitos com dígito de CPF inválido e DDD + 9 válidos: o CPF tem score
+    # maior (contexto "CPF") e continua vencendo, como na anonimização
+    ("Meu CPF é 61912345678.", [("BR_CPF", "61912345678", 0.9), ("BR_PHONE", "61912345678", 0.85)], "BR_CPF"),
+    # O mesmo número com o telefone mais bem pontuado
+    ("Ligue 61912345678 amanhã.", [("BR_CPF", "61912345678", 0.55), ("BR_PHONE", "61912345678", 1.0)], "BR_PHONE"),
+    # Empate de score: decide a malha (DDD + 9 plausível > CPF com dígito inválido)
+    ("Contato 61912345678.", [("BR_CPF", "61912345678", 0.85), ("BR_PHONE", "61912345678", 0.85)], "BR_PHONE"),
+    # Empate de score com CPF de dígito válido: CPF (nível forte)
+    ("Contato 61912345625.", [("BR_CPF", "61912345625", 0.85), ("BR_PHONE", "61912345625", 0.85)], "BR_CPF"),
+    # 8 dígitos: CEP × RG no mesmo span, score decide
+    ("Número 70040020 no cadastro.", [("BR_RG", "70040020", 0.6), ("BR_CEP", "70040020", 0.5)], "BR_RG"),
+    # Span mais longo vence o contido, qualquer que seja o score
+    ("CNPJ 12.345.678/0001-95 ok", [("BR_CNPJ", "12.345.678/0001-95", 0.6), ("BR_RG", "12.345.678", 0.9)], "BR_CNPJ"),
+]
+
+
+def resultado(texto: str, tipo: str, trecho: str, score: float) -> RecognizerResult:
+    inicio = texto.index(trecho)
+    return RecognizerResult(tipo, inicio, inicio + len(trecho), score)
+
+
+def tarjar(anonimizador: AnonymizerEngine, texto: str, resultados: list) -> str:
+    operadores = {"DEFAULT": OperatorConfig("custom", {"lambda": lambda _: "<X>"})}
+    for r in resultados:
+        operadores[r.entity_type] = OperatorConfig("replace", {"new_value": f"<{r.entity_type}>"})
+    return anonimizador.anonymize(texto, resultados, operadores).text
+
+
+anonimizador = AnonymizerEngine()
+falhas = 0
+print(f"{'caso':<34}{'fica':<14}{'esperado':<14}tarjado igual")
+for texto, especificacao, esperado in CASOS:
+    resultados = [resultado(texto, *item) for item in especificacao]
+    resolvidos = resolver_colisoes(texto, list(resultados))
+
+    primeiro = resultados[0]
+    fica = [r.entity_type for r in resolvidos if r.start == primeiro.start and r.end == primeiro.end]
+    fica = fica[0] if len(fica) == 1 else "/".join(fica) or "-"
+    # Sem a malha, a anonimização escolhe sozinha entre todos os resultados
+    igual = tarjar(anonimizador, texto, [resultado(texto, *item) for item in especificacao]) == \
+        tarjar(anonimizador, texto, resolvidos)
+
+    empate = len({score for _, _, score in especificacao}) == 1
+    ok = fica == esperado and (igual or empate)
+    falhas += not ok
+    situacao = "empate (malha)" if empate else ("sim" if igual else "NÃO")
+    print(f"{'✅' if ok else '❌'} {texto:<32}{fica:<14}{esperado:<14}{situacao}")
+
+print(f"\nCasos corretos: {len(CASOS) - falhas}/{len(CASOS)}")
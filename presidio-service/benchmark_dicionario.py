@@ -0,0 +1,60 @@
+"""
+Benchmark do reconhecedor por dicionário (reconhecedor_dicionario.py)
+
+Cresce o vocabulário de saúde com termos sintéticos e mede, na amostra do
+e-SIC, a alternância de regex `\\b(termo|termo|...)\\b` (como era o
+BrazilHealthDataRecognizer) contra a trie de palavras, conferindo que os
+dois encontram os mesmos trechos.
+"""
+import random
+import time
+
+from presidio_analyzer import Pattern, PatternRecognizer
+
+from brazilian_recognizers import BrazilHealthDataRecognizer
+from reconhecedor_dicionario import ReconhecedorDicionario, TermosDicionario, normalizar
+
+TAMANHOS = (21, 1_000, 5_000, 20_000)
+REPETICOES = 5
+
+
+def vocabulario(tamanho: int):
+    """Condições reais do reconhecedor + termos sintéticos (sem acento, para a regex ser comparável)"""
+    rng = random.Random(tamanho)
+    termos = [normalizar(t) for t in BrazilHealthDataRecognizer.HEALTH_CONDITIONS]
+    while len(termos) < tamanho:
+        termos.append("".join(rng.choices("abcdefghijlmnoprstuv", k=rng.randint(6, 12))))
+    return sorted(set(termos))[:tamanho]
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        resultado = funcao()
+    return resultado, (time.perf_counter() - inicio) / REPETICOES * 1000
+
+
+with open("../AMOSTRA_e-SIC.txt", encoding="utf-8") as f:
+    texto = f.read()
+
+print(f"Amostra: {len(texto)} caracteres | média de {REPETICOES} execuções\n")
+print(f"{'termos':>8}{'regex (ms)':>12}{'dicionário (ms)':>17}  mesmos trechos")
+for tamanho in TAMANHOS:
+    termos = vocabulario(tamanho)
+    por_regex = PatternRecognizer(
+        supported_entity="BR_HEALTH_DATA",
+        patterns=[Pattern("health_simple", r"\b(" + "|".join(termos) + r")\b", 0.65)],
+    )
+    por_dicionario = ReconhecedorDicionario(
+        supported_entity="BR_HEALTH_DATA",
+        termos=[TermosDicionario("health_simple", termos, 0.65)],
+    )
+    # Compila a regex fora da medição
+    por_regex.analyze(texto, [])
+
+    esperado, t_regex = cronometrar(lambda: por_regex.analyze(texto, []))
+    # Texto novo a cada execução: inclui a divisão em palavras no tempo
+    obtido, t_dicionario = cronometrar(lambda: por_dicionario.analyze("".join(texto), []))
+
+    mesmos = sorted((r.start, r.end) for r in esperado) == sorted((r.start, r.end) for r in obtido)
+    print(f"{tamanho:>8}{t_regex:>12.1f}{t_dicionario:>17.1f}  {'✅' if mesmos else '⚠️'}")
@@ -0,0 +1,59 @@
+"""
+Benchmark dos dígitos verificadores (digitos_verificadores.py)
+
+Valida os mesmos números pela chamada única, pelo lote NumPy e, se
+instalado, pelo validate_docbr, e confere que os três concordam.
+"""
+import random
+import time
+
+from digitos_verificadores import NUMPY_AVAILABLE, VALIDADORES, validar_lote
+
+try:
+    import validate_docbr
+    REFERENCIAS = {
+        "BR_CPF": validate_docbr.CPF(),
+        "BR_CNPJ": validate_docbr.CNPJ(),
+        "BR_PIS_PASEP": validate_docbr.PIS(),
+        "BR_CNS": validate_docbr.CNS(),
+        "BR_VOTER_ID": validate_docbr.TituloEleitoral(),
+        "BR_RENAVAM": validate_docbr.RENAVAM(),
+        "BR_DRIVER_LICENSE": validate_docbr.CNH(),
+    }
+except ImportError:
+    REFERENCIAS = {}
+
+QUANTIDADE = 100_000
+
+
+def numeros(entidade: str, tamanho: int):
+    """Metade gerados válidos (se houver validate_docbr), metade aleatórios"""
+    gerador = REFERENCIAS.get(entidade)
+    lista = [gerador.generate() for _ in range(QUANTIDADE // 2)] if gerador else []
+    while len(lista) < QUANTIDADE:
+        lista.append("".join(random.choices("0123456789", k=tamanho)))
+    return lista
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
+print(f"{QUANTIDADE} números por documento (NumPy: {'sim' if NUMPY_AVAILABLE else 'não'})\n")
+print(f"{'Documento':<20}{'única (ms)':>12}{'lote (ms)':>12}{'docbr (ms)':>12}  concordância")
+for entidade, (validador, tamanho) in VALIDADORES.items():
+    lista = numeros(entidade, tamanho)
+    unica, t_unica = cronometrar(lambda: [validador(n) for n in lista])
+    lote, t_lote = cronometrar(lambda: validar_lote(entidade, lista))
+
+    t_docbr = "-"
+    concorda = unica == lote
+    referencia = REFERENCIAS.get(entidade)
+    if referencia:
+        esperado, t = cronometrar(lambda: [bool(referencia.validate(n)) for n in lista])
+        t_docbr = f"{t:.1f}"
+        concorda = concorda and unica == esperado
+
+    print(f"{entidade:<20}{t_unica:>12.1f}{t_lote:>12.1f}{t_docbr:>12}  {'✅' if concorda else '⚠️'}")
@@ -0,0 +1,51 @@
+"""
+Benchmark de vazão: /api/processar (um texto por chamada) vs /api/processar/lote
+
+Divide a amostra do e-SIC em manifestações curtas e mede textos/segundo
+nos dois caminhos. Requer a API rodando em localhost:8000.
+"""
+import time
+import requests
+
+URL = "http://localhost:8000"
+LINHAS_POR_TEXTO = 6
+
+# Carregar amostra e dividir em blocos de linhas (aproxima uma manifestação cada)
+with open("../AMOSTRA_e-SIC.txt", encoding="utf-8") as f:
+    linhas = f.read().split("\n")
+
+textos = [
+    "\n".join(linhas[i:i + LINHAS_POR_TEXTO])
+    for i in range(0, len(linhas), LINHAS_POR_TEXTO)
+]
+print(f"Textos: {len(textos)} ({sum(len(t) for t in textos)} caracteres)")
+
+# Caminho 1: uma requisição por texto
+inicio = time.perf_counter()
+individuais = [
+    requests.post(f"{URL}/api/processar", json={"texto": texto}).json()
+    for texto in textos
+]
+tempo_individual = time.perf_counter() - inicio
+
+# Caminho 2: uma requisição para o lote inteiro
+inicio = time.perf_counter()
+lote = requests.post(f"{URL}/api/processar/lote", json={"textos": textos}).json()
+tempo_lote = time.perf_counter() - inicio
+
+print(f"\n{'='*60}")
+print("RESULTADO DO BENCHMARK")
+print(f"{'='*60}")
+print(f"Individual: {tempo_individual:.2f}s ({len(textos) / tempo_individual:.1f} textos/s)")
+print(f"Lote:       {tempo_lote:.2f}s ({len(textos) / tempo_lote:.1f} textos/s)")
+print(f"Speedup:    {tempo_individual / tempo_lote:.1f}x")
+
+# Os dois caminhos devem produzir exatamente a mesma anonimização
+divergentes = [
+    i for i, (a, b) in enumerate(zip(individuais, lote["resultados"]))
+    if a["textoTarjado"] != b["textoTarjado"]
+]
+if divergentes:
+    print(f"⚠️  {len(divergentes)} textos com resultado diferente: {divergentes[:10]}")
+else:
+    print("✅ Resultados idênticos nos dois caminhos")
@@ -0,0 +1,82 @@
+"""
+Benchmark do pré-filtro de reconhecedores (prefiltro.py)
+
+Divide a amostra do e-SIC em manifestações curtas (sem a coluna de ID),
+analisa cada uma com todos os reconhecedores e com só os que passam no
+pré-filtro, e compara tempo e resultado. A amostra foi escolhida por ter
+dados pessoais (quase toda manifestação tem dígitos), então o mesmo é medido
+também com os dígitos removidos, como na maioria das manifestações reais.
+Não precisa da API nem do spaCy.
+"""
+import inspect
+import re
+import time
+
+import brazilian_recognizers
+from brazilian_name_recognizer import BrazilianNameRecognizer
+from prefiltro import DIGITO, aplicavel, caracteristicas
+from presidio_analyzer import EntityRecognizer
+
+LINHAS_POR_MANIFESTACAO = 5
+RODADAS = 5
+
+
+def criar_reconhecedores():
+    classes = [
+        classe for nome, classe in inspect.getmembers(brazilian_recognizers, inspect.isclass)
+        if issubclass(classe, EntityRecognizer) and classe.__module__ == brazilian_recognizers.__name__
+    ]
+    return [classe() for classe in classes] + [BrazilianNameRecognizer()]
+
+
+def manifestacoes(texto):
+    linhas = [re.sub(r"^\s*\d+\s{2,}", "", linha).strip() for linha in texto.splitlines()[1:]]
+    linhas = [linha for linha in linhas if linha]
+    return [
+        " ".join(linhas[i:i + LINHAS_POR_MANIFESTACAO])
+        for i in range(0, len(linhas), LINHAS_POR_MANIFESTACAO)
+    ]
+
+
+def analisar(textos, filtrar):
+    resultados = []
+    executados = 0
+    for texto in textos:
+        bits = caracteristicas(texto) if filtrar else None
+        for reconhecedor in reconhecedores:
+            if bits is not None and not aplicavel(reconhecedor, bits):
+                continue
+            executados += 1
+            resultados.extend(
+                (texto, r.entity_type, r.start, r.end, r.score)
+                for r in reconhecedor.analyze(texto, reconhecedor.supported_entities)
+            )
+    return sorted(resultados), executados
+
+
+def medir(textos, filtrar):
+    melhor = float("inf")
+    for _ in range(RODADAS):
+        inicio = time.perf_counter()
+        resultado = analisar(textos, filtrar)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
+
+
+with open("../AMOSTRA_e-SIC.txt", encoding="utf-8") as f:
+    textos = manifestacoes(f.read())
+reconhecedores = criar_reconhecedores()
+analisar(textos, False)  # compila as regex antes de medir
+
+for titulo, lote in (("Amostra", textos), ("Sem dígitos", [re.sub(r"\d", "", t) for t in textos])):
+    (todos, executados_todos), t_todos = medir(lote, False)
+    (filtrados, executados_filtrados), t_filtrados = medir(lote, True)
+
+    print(f"\n{'='*60}")
+    print(f"RESULTADO DO BENCHMARK - {titulo}")
+    print(f"{'='*60}")
+    print(f"Manifestações:    {len(lote)} ({sum(1 for t in lote if not caracteristicas(t) & DIGITO)} sem dígitos)")
+    print(f"Reconhecedores:   {executados_todos / len(lote):.1f} → {executados_filtrados / len(lote):.1f} por texto")
+    print(f"Tempo:            {t_todos * 1000:.1f} ms → {t_filtrados * 1000:.1f} ms "
+          f"({(1 - t_filtrados / t_todos) * 100:.1f}% menos)")
+    print(f"Resultado igual:  {'✅' if todos == filtrados else '⚠️'}")
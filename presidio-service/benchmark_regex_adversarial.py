@@ -0,0 +1,149 @@
+"""
+Benchmark adversarial dos padrões dos reconhecedores (motor_regex.py)
+
+Gera textos feitos para provocar backtracking (sequências longas de palavras
+capitalizadas, cabeçalhos em maiúsculas, tabelas com muitos espaços,
+conectores, dígitos) e uma amostra aleatória (fuzz) dos mesmos elementos.
+Mede cada padrão em dois tamanhos e mostra:
+
+- os padrões mais lentos e o expoente de crescimento (1 = linear, 2 = quadrático)
+- o tempo do mesmo caso com o orçamento de RegexProtegida e se ela devolve
+  os mesmos matches do `regex` sem orçamento (retomada em trechos)
+- com RE2 instalado: o tempo no RE2 e em quantos padrões o resultado na
+  amostra do e-SIC difere do `regex` (\\b, \\w, \\d e \\s são ASCII no RE2)
+
+Não precisa da API nem do spaCy.
+"""
+import inspect
+import math
+import random
+import time
+
+import regex
+
+import brazilian_recognizers
+import motor_regex
+from brazilian_name_recognizer import BrazilianNameRecognizer
+from motor_regex import RE2_AVAILABLE, RegexProtegida
+from presidio_analyzer import PatternRecognizer
+
+TAMANHOS = (4_000, 16_000)
+# Limite de cada medição sem proteção (para o benchmark terminar)
+LIMITE_SEGUNDOS = 20.0
+SEMENTE = 42
+
+NOMES = ["Maria", "José", "Antônio", "Souza", "Lima", "Pereira", "Silva", "Costa", "Ana", "Paulo"]
+CONECTORES = ["da", "de", "do", "dos", "e"]
+PALAVRAS = ["processo", "pedido", "informação", "secretaria", "anexo", "maria", "ana", "souza"]
+
+
+def _capitalizadas(rng, n):
+    return " ".join(rng.choice(NOMES) for _ in range(n // 6))
+
+
+GERADORES = {
+    # Cabeçalhos/tabelas: palavras capitalizadas sem pontuação
+    "capitalizadas": _capitalizadas,
+    "maiusculas": lambda rng, n: _capitalizadas(rng, n).upper(),
+    "linhas_de_nomes": lambda rng, n: "\n".join(_capitalizadas(rng, 30) for _ in range(n // 30)),
+    "conectores": lambda rng, n: " ".join(
+        f"{rng.choice(NOMES)} {rng.choice(CONECTORES)}" for _ in range(n // 9)
+    ),
+    # Tabela alinhada com espaços: nome + coluna em branco
+    "colunas_com_espacos": lambda rng, n: ("Maria" + " " * 50) * (n // 55),
+    # Prosa em minúsculas sem pontuação (com (?i) qualquer palavra é "capitalizada")
+    "prosa_minuscula": lambda rng, n: " ".join(rng.choice(PALAVRAS) for _ in range(n // 8)),
+    "digitos": lambda rng, n: "1" * n,
+    "digitos_com_separadores": lambda rng, n: "1.2-3/" * (n // 6),
+    # Fuzz: mistura aleatória de todos os elementos acima
+    "fuzz": lambda rng, n: "".join(
+        rng.choice([
+            rng.choice(NOMES) + " ", rng.choice(CONECTORES) + " ", rng.choice(PALAVRAS) + " ",
+            " " * rng.randint(1, 40), "\n", str(rng.randint(0, 10**11)), ".", "-", "/", ", ",
+        ])
+        for _ in range(n // 5)
+    )[:n],
+}
+
+
+def criar_reconhecedores():
+    classes = [
+        classe for nome, classe in inspect.getmembers(brazilian_recognizers, inspect.isclass)
+        if issubclass(classe, PatternRecognizer) and classe.__module__ == brazilian_recognizers.__name__
+    ]
+    return [classe() for classe in classes] + [BrazilianNameRecognizer()]
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    try:
+        funcao()
+    except TimeoutError:
+        return LIMITE_SEGUNDOS
+    return time.perf_counter() - inicio
+
+
+def medir_padroes(reconhecedores, textos):
+    """(tempo no maior tamanho, expoente, caso, reconhecedor, padrão) de cada padrão × caso"""
+    linhas = []
+    for reconhecedor in reconhecedores:
+        flags = reconhecedor.global_regex_flags
+        for pattern in reconhecedor.patterns:
+            compilada = regex.compile(pattern.regex, flags=flags)
+            for caso, por_tamanho in textos.items():
+                tempos = [
+                    cronometrar(lambda: list(compilada.finditer(por_tamanho[n], timeout=LIMITE_SEGUNDOS)))
+                    for n in TAMANHOS
+                ]
+                expoente = math.log(max(tempos[1], 1e-6) / max(tempos[0], 1e-6)) / math.log(TAMANHOS[1] / TAMANHOS[0])
+                linhas.append((tempos[1], expoente, caso, reconhecedor, pattern))
+    linhas.sort(key=lambda linha: -linha[0])
+    return linhas
+
+
+rng = random.Random(SEMENTE)
+textos = {caso: {n: gerador(rng, n) for n in TAMANHOS} for caso, gerador in GERADORES.items()}
+reconhecedores = criar_reconhecedores()
+print(f"{sum(len(r.patterns) for r in reconhecedores)} padrões × {len(GERADORES)} casos × tamanhos {TAMANHOS}")
+print(f"Orçamento por busca: {motor_regex.ORCAMENTO_SEGUNDOS * 1000:.0f} ms | RE2: {'sim' if RE2_AVAILABLE else 'não instalado'}")
+
+linhas = medir_padroes(reconhecedores, textos)
+
+print(f"\n{'='*100}")
+print("PADRÕES MAIS LENTOS (texto maior)")
+print(f"{'='*100}")
+print(f"{'padrão':<42}{'caso':<26}{'regex (ms)':>11}{'expoente':>9}{'protegida':>11}{'iguais':>8}{'re2':>9}")
+for tempo, expoente, caso, reconhecedor, pattern in linhas[:10]:
+    flags = reconhecedor.global_regex_flags
+    texto = textos[caso][TAMANHOS[1]]
+    protegida = RegexProtegida(pattern.regex, flags, pattern.name)
+    t_protegida = cronometrar(lambda: list(protegida._finditer_com_orcamento(texto)))
+    iguais = [m.span() for m in protegida._finditer_com_orcamento(texto)] == \
+        [m.span() for m in protegida._regex.finditer(texto)]
+    t_re2 = "-"
+    if protegida.linear:
+        t_re2 = f"{cronometrar(lambda: list(protegida._re2.finditer(texto))) * 1000:.1f}"
+    nome = f"{reconhecedor.name}.{pattern.name}"
+    print(f"{nome[:41]:<42}{caso:<26}{tempo * 1000:>11.1f}{expoente:>9.2f}{t_protegida * 1000:>11.1f}{'sim' if iguais else 'NÃO':>8}{t_re2:>9}")
+
+superlineares = sorted({
+    f"{reconhecedor.name}.{pattern.name}"
+    for tempo, expoente, _, reconhecedor, pattern in linhas if expoente > 1.5 and tempo > 0.05
+})
+print(f"\nPadrões superlineares (expoente > 1,5 e > 50 ms): {', '.join(superlineares) or 'nenhum'}")
+
+if RE2_AVAILABLE:
+    # O RE2 só pode ser motor principal se o resultado não mudar
+    with open("../AMOSTRA_e-SIC.txt", encoding="utf-8") as f:
+        amostra = f.read()
+    diferentes = []
+    for reconhecedor in reconhecedores:
+        for pattern in reconhecedor.patterns:
+            protegida = RegexProtegida(pattern.regex, reconhecedor.global_regex_flags, pattern.name)
+            if not protegida.linear:
+                continue
+            esperado = [m.span() for m in protegida._regex.finditer(amostra)]
+            if [m.span() for m in protegida._re2.finditer(amostra)] != esperado:
+                diferentes.append(pattern.name)
+    print(f"RE2 × regex na amostra do e-SIC: {len(diferentes)} padrões com resultado diferente"
+          + (f" ({', '.join(diferentes)})" if diferentes else ""))
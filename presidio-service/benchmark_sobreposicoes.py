@@ -0,0 +1,76 @@
+"""
+Casos de sobreposição resolvidos antes da validação (sobreposicoes.py)
+
+- Prioridade entre tipos: o PERSON perde só a parte sobreposta ao EMAIL;
+  sai apenas quando fica inteiro dentro dele
+- Regiões do mesmo tipo: quantas validações cada região custa e se a
+  cobertura final é a mesma de validar todos os spans (o que o
+  AnonymizerEngine funde depois)
+
+Não precisa da API nem do spaCy: o "validador" aceita os trechos listados.
+"""
+from presidio_analyzer import RecognizerResult
+
+from sobreposicoes import PrioridadesTipo, escolher_na_regiao, regioes_sobrepostas
+
+# (texto, [(tipo, trecho)], trechos PERSON que devem sobrar)
+CASOS_PRIORIDADE = [
+    ("Contato Maria Silva maria.silva@gov.br",
+     [("PERSON", "Maria Silva maria.silva"), ("EMAIL_ADDRESS", "maria.silva@gov.br")], ["Maria Silva"]),
+    ("Escreva para joao@empresa.com hoje",
+     [("PERSON", "joao"), ("EMAIL_ADDRESS", "joao@empresa.com")], []),
+    ("Ana ana@x.com.br Souza respondeu",
+     [("PERSON", "Ana ana@x.com.br Souza"), ("EMAIL_ADDRESS", "ana@x.com.br")], ["Ana", "Souza"]),
+    ("Pedro Alves, sem e-mail",
+     [("PERSON", "Pedro Alves")], ["Pedro Alves"]),
+]
+
+# (texto, [trechos PERSON], trechos aceitos pelo validador)
+CASOS_REGIAO = [
+    # spaCy curto + gerador longo: um veredito
+    ("Falei com Maria Silva Zanotelli ontem", ["Maria Silva", "Maria Silva Zanotelli"], {"Maria Silva Zanotelli", "Maria Silva"}),
+    # Sequência longa rejeitada (blacklist), sub-candidato aceito
+    ("No Condomínio Municipal Hélio Silva Campos", ["Condomínio Municipal Hélio Silva Campos", "Hélio Silva Campos"], {"Hélio Silva Campos"}),
+    # Sobreposição parcial: os dois aceitos viram a união
+    ("Atendido por João Pedro Ribeiro hoje", ["João Pedro", "Pedro Ribeiro"], {"João Pedro", "Pedro Ribeiro"}),
+]
+
+
+def resultado(texto: str, tipo: str, trecho: str) -> RecognizerResult:
+    inicio = texto.index(trecho)
+    return RecognizerResult(tipo, inicio, inicio + len(trecho), 0.85)
+
+
+def cobertura(resultados) -> set:
+    return {i for r in resultados for i in range(r.start, r.end)}
+
+
+falhas = 0
+prioridades = PrioridadesTipo()
+print("Prioridade entre tipos (EMAIL_ADDRESS>PERSON)")
+for texto, especificacao, esperado in CASOS_PRIORIDADE:
+    resolvidos = prioridades.resolver([resultado(texto, *item) for item in especificacao], texto)
+    sobra = [texto[r.start:r.end] for r in resolvidos if r.entity_type == "PERSON"]
+    ok = sobra == esperado
+    falhas += not ok
+    print(f"{'✅' if ok else '❌'} {texto:<40}{sobra}")
+
+print("\nRegiões PERSON (validações / spans, cobertura igual a validar todos)")
+for texto, trechos, aceitos in CASOS_REGIAO:
+    resultados = [resultado(texto, "PERSON", trecho) for trecho in trechos]
+    validados = []
+
+    def aceitar(r):
+        validados.append(texto[r.start:r.end])
+        return texto[r.start:r.end] in aceitos
+
+    regioes = regioes_sobrepostas(resultados, {"PERSON"})
+    escolhidos = escolher_na_regiao(regioes[id(resultados[0])], aceitar)
+    todos = [r for r in resultados if texto[r.start:r.end] in aceitos]
+    ok = cobertura(escolhidos) == cobertura(todos)
+    falhas += not ok
+    print(f"{'✅' if ok else '❌'} {texto:<44}{len(validados)}/{len(trechos)} "
+          f"{[texto[r.start:r.end] for r in escolhidos]}")
+
+total = len(CASOS_PRIORIDADE) + len(CASOS_REGIAO)
+print(f"\nCasos corretos: {total - falhas}/{total}")
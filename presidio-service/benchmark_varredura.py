@@ -0,0 +1,87 @@
+"""
+Benchmark da varredura combinada (varredura.py) vs uma passada por padrão
+
+Carrega os reconhecedores duas vezes (padrões separados e varredura
+combinada), analisa a amostra do e-SIC com todos eles e compara tempo e
+resultado. Não precisa da API nem do spaCy.
+"""
+import inspect
+import time
+
+import brazilian_recognizers
+from brazilian_name_recognizer import BrazilianNameRecognizer
+from presidio_analyzer import Pattern, PatternRecognizer
+from varredura import VarreduraCombinada
+
+RODADAS = 5
+
+
+def criar_reconhecedores():
+    classes = [
+        classe for nome, classe in inspect.getmembers(brazilian_recognizers, inspect.isclass)
+        if issubclass(classe, PatternRecognizer) and classe.__module__ == brazilian_recognizers.__name__
+    ]
+    reconhecedores = [classe() for classe in classes] + [BrazilianNameRecognizer()]
+    # Alguns reconhecedores compartilham os Pattern da classe: cópias próprias
+    # para a varredura combinada não alterar também o outro conjunto
+    for reconhecedor in reconhecedores:
+        reconhecedor.patterns = [Pattern(p.name, p.regex, p.score) for p in reconhecedor.patterns]
+    return reconhecedores
+
+
+def analisar(reconhecedores, texto):
+    return [
+        (r.entity_type, r.start, r.end, r.score, r.analysis_explanation.pattern_name)
+        for reconhecedor in reconhecedores
+        for r in reconhecedor.analyze(texto, reconhecedor.supported_entities)
+    ]
+
+
+def varrer(reconhecedores, texto):
+    """Só as passadas de regex: todos os matches de todos os padrões"""
+    return [
+        list(pattern.compiled_regex.finditer(texto))
+        for reconhecedor in reconhecedores
+        for pattern in reconhecedor.patterns
+    ]
+
+
+def medir(funcao, texto):
+    """Menor tempo de cada caminho, alternando os dois a cada rodada"""
+    tempos = ([], [])
+    for i in range(RODADAS):
+        # Texto novo a cada rodada: nada reaproveitado entre rodadas
+        texto_rodada = texto + " " * (i + 1)
+        for reconhecedores, lista in zip((separados, combinados), tempos):
+            inicio = time.perf_counter()
+            funcao(reconhecedores, texto_rodada)
+            lista.append(time.perf_counter() - inicio)
+    return min(tempos[0]), min(tempos[1])
+
+
+with open("../AMOSTRA_e-SIC.txt", encoding="utf-8") as f:
+    texto = f.read()
+print(f"Texto: {len(texto)} caracteres")
+
+separados = criar_reconhecedores()
+combinados = criar_reconhecedores()
+varredura = VarreduraCombinada(combinados)
+analisar(separados, texto)  # o PatternRecognizer compila as regex no primeiro analyze
+
+varredura_separados, varredura_combinados = medir(varrer, texto)
+analise_separados, analise_combinados = medir(analisar, texto)
+
+print(f"\n{'='*60}")
+print("RESULTADO DO BENCHMARK")
+print(f"{'='*60}")
+print(f"Passadas:   {varredura.padroes} → {varredura.passadas}")
+print(f"Varredura:  {varredura_separados * 1000:.1f} ms → {varredura_combinados * 1000:.1f} ms "
+      f"({(1 - varredura_combinados / varredura_separados) * 100:.1f}% menos)")
+print(f"Análise:    {analise_separados * 1000:.1f} ms → {analise_combinados * 1000:.1f} ms "
+      f"(analyze de todos os reconhecedores, inclui validação e deduplicação)")
+
+# A varredura combinada deve produzir exatamente os mesmos resultados
+if analisar(separados, texto) == analisar(combinados, texto):
+    print("✅ Resultados idênticos nos dois caminhos")
+else:
+    print("⚠️  Resultados diferentes entre os dois caminhos")
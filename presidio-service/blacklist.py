@@ -0,0 +1,122 @@
+"""
+Blacklists Compiladas - autômato Aho-Corasick para busca de múltiplos termos
+
+As blacklists do pipeline (never_anonymize_terms, instituições de ORGANIZATION)
+e dos validadores (palavras-chave institucionais, indicadores de localização)
+testam se QUALQUER termo aparece como substring do texto candidato:
+
+    any(term in texto for term in termos)   # O(len(termos) × len(texto))
+
+O AutomatoTermos compila a lista uma vez (no import) e responde a mesma
+pergunta em uma única passada pelo texto, independente do tamanho da lista -
+as listas podem crescer para milhares de termos institucionais sem custo por
+requisição.
+
+Usa pyahocorasick (extensão C) se instalado; senão, implementação pura em
+Python com o mesmo resultado.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# Biblioteca Aho-Corasick em C (opcional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class AutomatoTermos:
+    """
+    Conjunto de termos compilado para busca por substring em tempo linear
+
+    Equivalente a `any(term in texto for term in termos)`, mas com uma única
+    passada pelo texto. Termos e texto são comparados como recebidos (a
+    normalização - lower(), acentos - fica com quem chama, como nas listas
+    originais).
+    """
+
+    def __init__(self, termos: Iterable[str]):
+        """
+        Args:
+            termos: Lista de termos (duplicatas são ignoradas)
+        """
+        self.termos = tuple(dict.fromkeys(termos))
+        if any(not termo for termo in self.termos):
+            raise ValueError("Termo vazio na blacklist (casaria com qualquer texto)")
+
+        if AHOCORASICK_AVAILABLE:
+            self._automato = ahocorasick.Automaton()
+            for termo in self.termos:
+                self._automato.add_word(termo, termo)
+            if self.termos:
+                self._automato.make_automaton()
+        else:
+            self._compilar()
+
+    def __len__(self) -> int:
+        return len(self.termos)
+
+    def contem(self, texto: str) -> bool:
+        """True se algum termo aparece como substring de `texto`"""
+        return self.encontrar(texto) is not None
+
+    def encontrar(self, texto: str) -> Optional[str]:
+        """Retorna o primeiro termo (por posição final) encontrado em `texto`, ou None"""
+        if not self.termos:
+            return None
+
+        if AHOCORASICK_AVAILABLE:
+            for _, termo in self._automato.iter(texto):
+                return termo
+            return None
+
+        transicoes = self._transicoes
+        falhas = self._falhas
+        saidas = self._saidas
+        estado = 0
+        for caractere in texto:
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            if saidas[estado] is not None:
+                return saidas[estado]
+        return None
+
+    # ------------------------------------------------------------------
+    # Implementação pura em Python (fallback)
+    # ------------------------------------------------------------------
+    def _compilar(self) -> None:
+        """Monta a trie dos termos e os links de falha (BFS)"""
+        transicoes: List[Dict[str, int]] = [{}]
+        saidas: List[Optional[str]] = [None]
+
+        for termo in self.termos:
+            estado = 0
+            for caractere in termo:
+                proximo = transicoes[estado].get(caractere)
+                if proximo is None:
+                    proximo = len(transicoes)
+                    transicoes[estado][caractere] = proximo
+                    transicoes.append({})
+                    saidas.append(None)
+                estado = proximo
+            saidas[estado] = termo
+
+        falhas = [0] * len(transicoes)
+        fila = deque(transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in transicoes[estado].items():
+                fila.append(proximo)
+                falha = falhas[estado]
+                while falha and caractere not in transicoes[falha]:
+                    falha = falhas[falha]
+                falhas[proximo] = transicoes[falha].get(caractere, 0)
+                # Termo que termina dentro de outro (sufixo) também é saída
+                if saidas[proximo] is None:
+                    saidas[proximo] = saidas[falhas[proximo]]
+
+        self._transicoes = transicoes
+        self._falhas = falhas
+        self._saidas = saidas
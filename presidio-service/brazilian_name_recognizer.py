@@ -67,20 +67,26 @@ class BrazilianNameRecognizer(PatternRecognizer):
         "galvão", "prado", "pestana", "paredes", "trindade", "bernardes", "gama"
     }
     
+    # Nomes muito comuns aceitos sozinhos (sem sobrenome)
+    COMMON_SINGLE_NAMES = [
+        "thiago", "gustavo", "rafael", "bruno", "lucas", "gabriel", "matheus", "felipe",
+        "leonardo", "rodrigo", "diego", "fernando", "ricardo", "marcelo", "daniel",
+        "eduardo", "marcos", "vinicius", "carolina", "beatriz", "larissa", "vanessa",
+        "juliana", "fernanda", "amanda", "jessica", "camila", "mariana", "gabriela"
+    ]
+    
     SUPPORTED_ENTITY = "PERSON"
     
+    CONTEXT = ["sr", "sra", "dr", "dra", "prof", "nome", "senhor", "senhora", 
+               "atenciosamente", "cordialmente", "att", "grata", "grato",
+               "chamo", "sou", "assina", "assinado", "responsavel", "responsável"]
+    
     def __init__(self):
         patterns = []
         
         # Padrão 0: Nome único comum (ex: Thiago, Gustavo, Rafael) - com contexto forte
         # Apenas nomes muito comuns em contextos claros
-        common_single_names = [
-            "thiago", "gustavo", "rafael", "bruno", "lucas", "gabriel", "matheus", "felipe",
-            "leonardo", "rodrigo", "diego", "fernando", "ricardo", "marcelo", "daniel",
-            "eduardo", "marcos", "vinicius", "carolina", "beatriz", "larissa", "vanessa",
-            "juliana", "fernanda", "amanda", "jessica", "camila", "mariana", "gabriela"
-        ]
-        single_names_pattern = "|".join([f"{name.capitalize()}" for name in common_single_names])
+        single_names_pattern = "|".join([f"{name.capitalize()}" for name in self.COMMON_SINGLE_NAMES])
         patterns.append(Pattern(
             name="common_single_name",
             regex=rf"\b({single_names_pattern})\b",
@@ -125,9 +131,7 @@ class BrazilianNameRecognizer(PatternRecognizer):
             supported_entity=self.SUPPORTED_ENTITY,
             patterns=patterns,
             supported_language="pt",
-            context=["sr", "sra", "dr", "dra", "prof", "nome", "senhor", "senhora", 
-                     "atenciosamente", "cordialmente", "att", "grata", "grato",
-                     "chamo", "sou", "assina", "assinado", "responsavel", "responsável"]
+            context=self.CONTEXT
         )
     
     def validate_result(self, pattern_text: str) -> Optional[bool]:
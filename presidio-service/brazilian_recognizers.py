@@ -11,13 +11,8 @@ try:
 except ImportError:
     EMAIL_VALIDATOR_AVAILABLE = False
 
-try:
-    from validate_docbr import CPF, CNPJ
-    CPF_VALIDATOR = CPF()
-    CNPJ_VALIDATOR = CNPJ()
-    DOCBR_AVAILABLE = True
-except ImportError:
-    DOCBR_AVAILABLE = False
+from digitos_verificadores import validar_documento
+from reconhecedor_dicionario import ReconhecedorDicionario, TermosDicionario, frases
 
 
 class BrazilCpfRecognizer(PatternRecognizer):
@@ -60,13 +55,9 @@ class BrazilCpfRecognizer(PatternRecognizer):
     
     def validate_result(self, pattern_text: str) -> Optional[bool]:
         """Valida CPF brasileiro - aceita padrões de teste"""
-        # Remover validação de checksum: CPFs de teste não têm dígitos verificadores válidos
-        # Em produção com dados reais, descomentar validação abaixo:
-        # if DOCBR_AVAILABLE:
-        #     cpf_limpo = ''.join(filter(str.isdigit, pattern_text))
-        #     if len(cpf_limpo) == 11:
-        #         return CPF_VALIDATOR.validate(cpf_limpo)
-        return None  # Aceitar (não rejeitar)
+        # CPFs de teste não têm dígitos verificadores válidos: o dígito só é
+        # conferido no modo estrito (digitos_verificadores.py); fora dele, None
+        return validar_documento("BR_CPF", pattern_text)
 
 
 class BrazilRgRecognizer(PatternRecognizer):
@@ -331,13 +322,9 @@ class BrazilCnpjRecognizer(PatternRecognizer):
 
     def validate_result(self, pattern_text: str) -> Optional[bool]:
         """Valida CNPJ brasileiro - aceita padrões de teste"""
-        # Remover validação de checksum: CNPJs de teste não têm dígitos verificadores válidos
-        # Em produção com dados reais, descomentar validação abaixo:
-        # if DOCBR_AVAILABLE:
-        #     cnpj_limpo = ''.join(filter(str.isdigit, pattern_text))
-        #     if len(cnpj_limpo) == 14:
-        #         return CNPJ_VALIDATOR.validate(cnpj_limpo)
-        return None  # Aceitar (não rejeitar)
+        # CNPJs de teste não têm dígitos verificadores válidos: o dígito só é
+        # conferido no modo estrito (digitos_verificadores.py); fora dele, None
+        return validar_documento("BR_CNPJ", pattern_text)
 
 
 # ==================== RECONHECEDORES LGPD EXPANDIDOS ====================
@@ -775,19 +762,22 @@ class BrazilIpAddressRecognizer(PatternRecognizer):
 
 # Dados sensíveis LGPD
 
-class BrazilEthnicityRecognizer(PatternRecognizer):
+class BrazilEthnicityRecognizer(ReconhecedorDicionario):
     """
     Reconhece origem racial/étnica (dado sensível LGPD)
     """
-    PATTERNS = [
-        Pattern(
+    ETHNICITIES = ["branca", "preta", "parda", "amarela", "indígena", "negra"]
+
+    TERMOS = [
+        TermosDicionario(
             name="ethnicity_pattern",
-            regex=r"\b(origem\s+[eé]tnica|etnia|ra[cç]a)\s+(branca|preta|parda|amarela|ind[ií]gena|negra)\b",
+            termos=frases(["origem étnica", "etnia", "raça"], ETHNICITIES),
             score=0.85,
         ),
-        Pattern(
+        TermosDicionario(
             name="ethnicity_simple",
-            regex=r"\b(branco|branca|preto|preta|pardo|parda|negro|negra|amarelo|amarela|ind[ií]gena)\b",
+            termos=["branco", "branca", "preto", "preta", "pardo", "parda", "negro", "negra",
+                    "amarelo", "amarela", "indígena"],
             score=0.65,
         ),
     ]
@@ -796,34 +786,40 @@ class BrazilEthnicityRecognizer(PatternRecognizer):
 
     def __init__(
         self,
-        patterns: Optional[List[Pattern]] = None,
+        termos: Optional[List[TermosDicionario]] = None,
         context: Optional[List[str]] = None,
         supported_language: str = "pt",
         supported_entity: str = "BR_ETHNICITY",
     ):
-        patterns = patterns if patterns else self.PATTERNS
+        termos = termos if termos else self.TERMOS
         context = context if context else self.CONTEXT
         super().__init__(
             supported_entity=supported_entity,
-            patterns=patterns,
+            termos=termos,
             context=context,
             supported_language=supported_language,
         )
 
 
-class BrazilReligionRecognizer(PatternRecognizer):
+class BrazilReligionRecognizer(ReconhecedorDicionario):
     """
     Reconhece convicção religiosa (dado sensível LGPD)
     """
-    PATTERNS = [
-        Pattern(
+    RELIGIONS = [
+        "católica", "evangélica", "protestante", "espírita", "umbanda", "candomblé",
+        "judaica", "muçulmana", "budista", "ateu", "agnóstico", "agnóstica",
+    ]
+
+    TERMOS = [
+        TermosDicionario(
             name="religion_pattern",
-            regex=r"\b(religi[aã]o|cren[cç]a)\s+(cat[oó]lica|evang[eé]lica|protestante|esp[ií]rita|umbanda|candombl[eé]|judaica|mu[cç]ulmana|budista|ateu|ag?n[oó]stica?)\b",
+            termos=frases(["religião", "crença"], RELIGIONS),
             score=0.85,
         ),
-        Pattern(
+        TermosDicionario(
             name="religion_simple",
-            regex=r"\b(cat[oó]lic[oa]|evang[eé]lic[oa]|protestante|esp[ií]rita|judeu|judia|mu[cç]ulmano|mu[cç]ulmana|budista|ateu|ateia)\b",
+            termos=["católico", "católica", "evangélico", "evangélica", "protestante", "espírita",
+                    "judeu", "judia", "muçulmano", "muçulmana", "budista", "ateu", "ateia"],
             score=0.60,
         ),
     ]
@@ -832,34 +828,36 @@ class BrazilReligionRecognizer(PatternRecognizer):
 
     def __init__(
         self,
-        patterns: Optional[List[Pattern]] = None,
+        termos: Optional[List[TermosDicionario]] = None,
         context: Optional[List[str]] = None,
         supported_language: str = "pt",
         supported_entity: str = "BR_RELIGION",
     ):
-        patterns = patterns if patterns else self.PATTERNS
+        termos = termos if termos else self.TERMOS
         context = context if context else self.CONTEXT
         super().__init__(
             supported_entity=supported_entity,
-            patterns=patterns,
+            termos=termos,
             context=context,
             supported_language=supported_language,
         )
 
 
-class BrazilPoliticalOpinionRecognizer(PatternRecognizer):
+class BrazilPoliticalOpinionRecognizer(ReconhecedorDicionario):
     """
     Reconhece opinião política (dado sensível LGPD)
     """
-    PATTERNS = [
-        Pattern(
+    POSITIONS = ["esquerda", "direita", "centro", "progressista", "conservador", "conservadora", "liberal"]
+
+    TERMOS = [
+        TermosDicionario(
             name="political_opinion",
-            regex=r"\b(opini[aã]o\s+pol[ií]tica|orienta[cç][aã]o\s+pol[ií]tica)\s+(de\s+)?(esquerda|direita|centro|progressista|conservador[a]?|liberal)\b",
+            termos=frases(["opinião política", "orientação política"], ["de", ""], POSITIONS),
             score=0.90,
         ),
-        Pattern(
+        TermosDicionario(
             name="political_simple",
-            regex=r"\b(pol[ií]tica|politicamente)\s+(de\s+)?(esquerda|direita|centro|progressista|conservador[a]?|liberal)\b",
+            termos=frases(["política", "politicamente"], ["de", ""], POSITIONS),
             score=0.75,
         ),
     ]
@@ -868,35 +866,40 @@ class BrazilPoliticalOpinionRecognizer(PatternRecognizer):
 
     def __init__(
         self,
-        patterns: Optional[List[Pattern]] = None,
+        termos: Optional[List[TermosDicionario]] = None,
         context: Optional[List[str]] = None,
         supported_language: str = "pt",
         supported_entity: str = "BR_POLITICAL_OPINION",
     ):
-        patterns = patterns if patterns else self.PATTERNS
+        termos = termos if termos else self.TERMOS
         context = context if context else self.CONTEXT
         super().__init__(
             supported_entity=supported_entity,
-            patterns=patterns,
+            termos=termos,
             context=context,
             supported_language=supported_language,
         )
 
 
-class BrazilUnionMembershipRecognizer(PatternRecognizer):
+class BrazilUnionMembershipRecognizer(ReconhecedorDicionario):
     """
     Reconhece filiação sindical (dado sensível LGPD)
     """
-    PATTERNS = [
-        Pattern(
+    # Nome do sindicato depois da âncora
+    UNION_NAME = r"\s+[\w\s]{5,50}\b"
+
+    TERMOS = [
+        TermosDicionario(
             name="union_membership",
-            regex=r"\b(filiado|filiada|membro|associado|associada)\s+(ao|do)\s+[Ss]indicato\s+[\w\s]{5,50}\b",
+            termos=frases(["filiado", "filiada", "membro", "associado", "associada"], ["ao", "do"], ["sindicato"]),
             score=0.90,
+            cauda=UNION_NAME,
         ),
-        Pattern(
+        TermosDicionario(
             name="union_name",
-            regex=r"\b[Ss]indicato\s+(dos|das)\s+[\w\s]{5,50}\b",
+            termos=frases(["sindicato"], ["dos", "das"]),
             score=0.80,
+            cauda=UNION_NAME,
         ),
     ]
 
@@ -904,46 +907,46 @@ class BrazilUnionMembershipRecognizer(PatternRecognizer):
 
     def __init__(
         self,
-        patterns: Optional[List[Pattern]] = None,
+        termos: Optional[List[TermosDicionario]] = None,
         context: Optional[List[str]] = None,
         supported_language: str = "pt",
         supported_entity: str = "BR_UNION_MEMBERSHIP",
     ):
-        patterns = patterns if patterns else self.PATTERNS
+        termos = termos if termos else self.TERMOS
         context = context if context else self.CONTEXT
         super().__init__(
             supported_entity=supported_entity,
-            patterns=patterns,
+            termos=termos,
             context=context,
             supported_language=supported_language,
         )
 
 
-class BrazilHealthDataRecognizer(PatternRecognizer):
+class BrazilHealthDataRecognizer(ReconhecedorDicionario):
     """
     Reconhece dados de saúde (dado sensível LGPD)
     """
     HEALTH_CONDITIONS = [
-        "hipertens[aã]o", "diabetes", "c[aâ]ncer", "hepatite", "hiv", "aids",
-        "tuberculose", "asma", "bronquite", "pneumonia", "depress[aã]o",
+        "hipertensão", "diabetes", "câncer", "hepatite", "hiv", "aids",
+        "tuberculose", "asma", "bronquite", "pneumonia", "depressão",
         "ansiedade", "esquizofrenia", "bipolar", "autismo", "alzheimer",
         "parkinson", "epilepsia", "artrite", "osteoporose", "cirrose"
     ]
-    
-    PATTERNS = [
-        Pattern(
+
+    TERMOS = [
+        TermosDicionario(
             name="health_condition",
-            regex=r"\b(hist[oó]rico|diagn[oó]stico|tratamento|doen[cç]a)\s+(de\s+)?(" + "|".join(HEALTH_CONDITIONS) + r")\b",
+            termos=frases(["histórico", "diagnóstico", "tratamento", "doença"], ["de", ""], HEALTH_CONDITIONS),
             score=0.90,
         ),
-        Pattern(
+        TermosDicionario(
             name="health_simple",
-            regex=r"\b(" + "|".join(HEALTH_CONDITIONS) + r")\b",
+            termos=HEALTH_CONDITIONS,
             score=0.65,
         ),
-        Pattern(
+        TermosDicionario(
             name="health_data_generic",
-            regex=r"\b(dados\s+de\s+sa[uú]de|hist[oó]rico\s+m[eé]dico|prontu[aá]rio)\b",
+            termos=["dados de saúde", "histórico médico", "prontuário"],
             score=0.85,
         ),
     ]
@@ -952,34 +955,34 @@ class BrazilHealthDataRecognizer(PatternRecognizer):
 
     def __init__(
         self,
-        patterns: Optional[List[Pattern]] = None,
+        termos: Optional[List[TermosDicionario]] = None,
         context: Optional[List[str]] = None,
         supported_language: str = "pt",
         supported_entity: str = "BR_HEALTH_DATA",
     ):
-        patterns = patterns if patterns else self.PATTERNS
+        termos = termos if termos else self.TERMOS
         context = context if context else self.CONTEXT
         super().__init__(
             supported_entity=supported_entity,
-            patterns=patterns,
+            termos=termos,
             context=context,
             supported_language=supported_language,
         )
 
 
-class BrazilSexualOrientationRecognizer(PatternRecognizer):
+class BrazilSexualOrientationRecognizer(ReconhecedorDicionario):
     """
     Reconhece orientação sexual (dado sensível LGPD)
     """
-    PATTERNS = [
-        Pattern(
+    TERMOS = [
+        TermosDicionario(
             name="sexual_orientation",
-            regex=r"\b(orienta[cç][aã]o\s+sexual|vida\s+sexual)\b",
+            termos=["orientação sexual", "vida sexual"],
             score=0.95,
         ),
-        Pattern(
+        TermosDicionario(
             name="orientation_simple",
-            regex=r"\b(heterossexual|homossexual|bissexual|pansexual|assexual)\b",
+            termos=["heterossexual", "homossexual", "bissexual", "pansexual", "assexual"],
             score=0.70,
         ),
     ]
@@ -988,16 +991,16 @@ class BrazilSexualOrientationRecognizer(PatternRecognizer):
 
     def __init__(
         self,
-        patterns: Optional[List[Pattern]] = None,
+        termos: Optional[List[TermosDicionario]] = None,
         context: Optional[List[str]] = None,
         supported_language: str = "pt",
         supported_entity: str = "BR_SEXUAL_ORIENTATION",
     ):
-        patterns = patterns if patterns else self.PATTERNS
+        termos = termos if termos else self.TERMOS
         context = context if context else self.CONTEXT
         super().__init__(
             supported_entity=supported_entity,
-            patterns=patterns,
+            termos=termos,
             context=context,
             supported_language=supported_language,
         )
@@ -1152,6 +1155,10 @@ class BrazilVoterIdRecognizer(PatternRecognizer):
             supported_language=supported_language,
         )
 
+    def validate_result(self, pattern_text: str) -> Optional[bool]:
+        """Dígito verificador do Título de Eleitor (só no modo estrito)"""
+        return validar_documento("BR_VOTER_ID", pattern_text)
+
 
 class BrazilWorkCardRecognizer(PatternRecognizer):
     """
@@ -1221,6 +1228,10 @@ class BrazilDriverLicenseRecognizer(PatternRecognizer):
             supported_language=supported_language,
         )
 
+    def validate_result(self, pattern_text: str) -> Optional[bool]:
+        """Dígito verificador da CNH (só no modo estrito)"""
+        return validar_documento("BR_DRIVER_LICENSE", pattern_text)
+
 
 class BrazilPisPasepRecognizer(PatternRecognizer):
     """
@@ -1253,6 +1264,10 @@ class BrazilPisPasepRecognizer(PatternRecognizer):
             supported_language=supported_language,
         )
 
+    def validate_result(self, pattern_text: str) -> Optional[bool]:
+        """Dígito verificador do PIS/PASEP (só no modo estrito)"""
+        return validar_documento("BR_PIS_PASEP", pattern_text)
+
 
 class BrazilCnsRecognizer(PatternRecognizer):
     """
@@ -1290,6 +1305,10 @@ class BrazilCnsRecognizer(PatternRecognizer):
             supported_language=supported_language,
         )
 
+    def validate_result(self, pattern_text: str) -> Optional[bool]:
+        """Dígito verificador do CNS (só no modo estrito)"""
+        return validar_documento("BR_CNS", pattern_text)
+
 
 class BrazilPassportRecognizer(PatternRecognizer):
     """
@@ -1471,6 +1490,10 @@ class BrazilRenavamRecognizer(PatternRecognizer):
             supported_language=supported_language,
         )
 
+    def validate_result(self, pattern_text: str) -> Optional[bool]:
+        """Dígito verificador do RENAVAM (só no modo estrito)"""
+        return validar_documento("BR_RENAVAM", pattern_text)
+
 
 class BrazilSchoolRegistrationRecognizer(PatternRecognizer):
     """
@@ -0,0 +1,161 @@
+"""
+Cache de Resultados - LRU limitado por memória + TTL
+
+O backend C# (TarjamentoService.TarjarDadosPessoaisAsync) reenvia a mesma
+manifestação em retentativas e re-renderizações. Sem cache, cada reenvio paga
+de novo spaCy + 37 reconhecedores + validadores.
+
+A chave é o SHA-256 de (versão do pipeline, idioma, conjunto de entidades,
+modo estrito do dígito verificador, texto): qualquer mudança de
+reconhecedores/filtros/máscaras deve incrementar pipeline.VERSAO_PIPELINE, o
+que invalida as entradas antigas.
+
+Configuração por variáveis de ambiente:
+- PRESIDIO_CACHE_MB: memória máxima estimada das entradas (padrão: 64, 0 desliga)
+- PRESIDIO_CACHE_TTL_S: validade de cada entrada em segundos (padrão: 300)
+"""
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from pipeline import VERSAO_PIPELINE
+
+# Custo estimado de cada entidade na resposta (dict com 4 chaves + valores)
+BYTES_POR_ENTIDADE = 600
+# Custo fixo de uma entrada (chave, dict do resultado, nó do OrderedDict)
+BYTES_POR_ENTRADA = 1000
+
+
+def _estimar_tamanho(resultado: Dict[str, Any]) -> int:
+    """Estimativa barata (sem percorrer objetos) da memória de um resultado"""
+    return (
+        BYTES_POR_ENTRADA
+        + sys.getsizeof(resultado["textoOriginal"])
+        + sys.getsizeof(resultado["textoTarjado"])
+        + BYTES_POR_ENTIDADE * len(resultado["entidadesEncontradas"])
+    )
+
+
+class CacheResultados:
+    """
+    Cache LRU de resultados do pipeline com TTL e limite de memória
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl_segundos: float = 300):
+        """
+        Args:
+            max_bytes: Memória máxima estimada das entradas (0 desliga o cache)
+            ttl_segundos: Validade de cada entrada
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes não pode ser negativo")
+        if ttl_segundos <= 0:
+            raise ValueError("ttl_segundos deve ser positivo")
+
+        self.max_bytes = max_bytes
+        self.ttl_segundos = ttl_segundos
+        # chave → (expira_em, tamanho, resultado); ordem = recência de uso
+        self._entradas: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.expiracoes = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def chave(texto: str, language: str, entities: Optional[List[str]], estrito: bool = False) -> str:
+        """SHA-256 de (versão do pipeline, idioma, entidades, modo estrito, texto)"""
+        # Ordem das entidades não altera o resultado; None = lista padrão
+        entidades = "\x1f".join(sorted(set(entities))) if entities else "*"
+        h = hashlib.sha256()
+        for parte in (VERSAO_PIPELINE, language, entidades, "estrito" if estrito else ""):
+            h.update(parte.encode("utf-8"))
+            h.update(b"\x00")
+        h.update(texto.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def obter(self, chave: str) -> Optional[Dict[str, Any]]:
+        """Retorna o resultado em cache (e o marca como recente) ou None"""
+        if not self.ativo:
+            return None
+
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return None
+
+            expira_em, tamanho, resultado = entrada
+            if expira_em <= time.monotonic():
+                del self._entradas[chave]
+                self._bytes -= tamanho
+                self.expiracoes += 1
+                self.falhas += 1
+                return None
+
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return resultado
+
+    def guardar(self, chave: str, resultado: Dict[str, Any]) -> None:
+        """Armazena um resultado, removendo os menos recentes se passar do limite"""
+        if not self.ativo:
+            return
+
+        tamanho = _estimar_tamanho(resultado)
+        if tamanho > self.max_bytes:
+            # Resultado maior que o cache inteiro: não vale esvaziar tudo por ele
+            return
+
+        with self._lock:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+
+            self._entradas[chave] = (time.monotonic() + self.ttl_segundos, tamanho, resultado)
+            self._bytes += tamanho
+
+            while self._bytes > self.max_bytes:
+                _, (_, tamanho_removido, _) = self._entradas.popitem(last=False)
+                self._bytes -= tamanho_removido
+                self.remocoes += 1
+
+    def limpar(self) -> None:
+        """Remove todas as entradas (contadores são mantidos)"""
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def status(self) -> Dict[str, Any]:
+        """Estado atual do cache (usado pelo /api/health)"""
+        consultas = self.acertos + self.falhas
+        return {
+            "ativo": self.ativo,
+            "entradas": len(self._entradas),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_segundos": self.ttl_segundos,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "remocoes": self.remocoes,
+            "expiracoes": self.expiracoes,
+            "taxa_acerto": round(self.acertos / consultas, 4) if consultas else 0.0,
+        }
+
+
+def criar_cache_do_ambiente() -> CacheResultados:
+    """Cria o cache a partir de PRESIDIO_CACHE_MB / PRESIDIO_CACHE_TTL_S"""
+    return CacheResultados(
+        max_bytes=int(float(os.getenv("PRESIDIO_CACHE_MB", "64")) * 1024 * 1024),
+        ttl_segundos=float(os.getenv("PRESIDIO_CACHE_TTL_S", "300")),
+    )
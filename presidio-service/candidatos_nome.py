@@ -0,0 +1,320 @@
+"""
+Gerador de Candidatos a Nome (PERSON) por Sequências de Tokens
+
+Os candidatos PERSON vinham de três fontes sobrepostas: o spaCy, a regex de
+dicionário do BrazilNameRecognizer e as cinco regex de palavras capitalizadas
+do BrazilianNameRecognizer. Como o PatternRecognizer aplica IGNORECASE, as
+regex "capitalizadas" casavam quaisquer palavras, e cada trecho gerava vários
+spans sobrepostos (Nome Sobrenome, Nome Sobrenome Outro, ...), validados um a
+um palavra por palavra. Na amostra do e-SIC eram ~2800 candidatos.
+
+O GeradorCandidatosNome percorre as palavras do texto uma vez
+(palavras_do_texto, compartilhada com os reconhecedores de dicionário):
+
+1. Palavras ligadas por hífen ou apóstrofo são um token só ("Ana-Maria",
+   "O'Brien", "D'Ávila")
+2. Sequências máximas de tokens capitalizados ("Maria", "SILVA") e
+   conectores (da/das/de/do/dos/e) entre eles, separados só por espaços na
+   mesma linha
+3. Uma sequência vira UM candidato com a sequência inteira (sem os
+   conectores das pontas): sobrenomes raros fora do léxico também são
+   mascarados ("Maria Silva Zanotelli"). A troca entre maiúsculas e
+   capitalizadas separa sequências ("EDUCAÇÃO Jorge Luiz")
+4. O LexicoNomes (hash palavra normalizada → bits PRIMEIRO_NOME /
+   SOBRENOME, com as listas dos dois reconhecedores de nomes) só define o
+   score, nunca corta o candidato. Quando palavras desconhecidas vêm antes
+   do primeiro nome conhecido ("Condomínio Municipal Hélio Silva Campos"),
+   sai também um segundo candidato a partir dele (ou da palavra antes de um
+   sobrenome: "Hélio" antes de "Silva"), até o fim da sequência
+
+Score do candidato (as regex equivalentes tinham 0,50-0,85):
+- primeiro nome seguido de sobrenome conhecido: 0,85
+- outra sequência com nome conhecido: 0,70
+- sequência de 2-6 tokens sem nome conhecido (ou com palavras
+  desconhecidas antes do primeiro nome conhecido): 0,55
+- token sozinho: 0,50, só para os nomes muito comuns (COMMON_SINGLE_NAMES)
+
+Sequências sem nome conhecido ("Programa de Integridade") continuam saindo,
+como no BrazilianNameRecognizer (validate_result devolvia None para elas e
+deixava a decisão para depois): quem rejeita é o NameValidator do filtro do
+pipeline, que conhece as palavras institucionais e o NameDataset inteiro -
+o léxico daqui tem só algumas centenas de nomes e barraria sobrenomes raros.
+
+Configuração por variável de ambiente:
+- PRESIDIO_CANDIDATOS_NOME: 1 usa o gerador (padrão), 0 volta aos dois
+  reconhecedores de regex
+"""
+import logging
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+from presidio_analyzer.analysis_explanation import AnalysisExplanation
+
+from brazilian_name_recognizer import BrazilianNameRecognizer
+from brazilian_recognizers import BrazilNameRecognizer
+from custo_reconhecedores import TOTAL_RECONHECEDOR, contar_matches
+from reconhecedor_dicionario import normalizar, palavras_do_texto
+
+logger = logging.getLogger(__name__)
+
+CANDIDATOS_NOME_ATIVO = os.getenv("PRESIDIO_CANDIDATOS_NOME", "1") == "1"
+
+PRIMEIRO_NOME = 1
+SOBRENOME = 2
+
+CONECTORES = frozenset({"da", "das", "de", "do", "dos", "e"})
+
+# Sequências mais longas não são nomes (NameValidator rejeita > 6 palavras)
+MAX_PALAVRAS = 6
+
+SCORE_NOME_COMPLETO = 0.85
+SCORE_NOME_CONHECIDO = 0.70
+SCORE_SEQUENCIA = 0.55
+SCORE_NOME_UNICO = 0.50
+
+# Categoria do candidato (pattern_name na explicação e linha em /api/metrics/reconhecedores)
+CATEGORIAS = {
+    SCORE_NOME_COMPLETO: "nome_completo",
+    SCORE_NOME_CONHECIDO: "nome_conhecido",
+    SCORE_SEQUENCIA: "sequencia",
+    SCORE_NOME_UNICO: "nome_unico",
+}
+
+
+# ============================================================================
+# LÉXICO
+# ============================================================================
+class LexicoNomes:
+    """Palavra normalizada → bits PRIMEIRO_NOME | SOBRENOME"""
+
+    def __init__(self, primeiros: Iterable[str], sobrenomes: Iterable[str], unicos: Iterable[str] = ()):
+        self._bits: Dict[str, int] = {}
+        for nome in primeiros:
+            chave = normalizar(nome)
+            self._bits[chave] = self._bits.get(chave, 0) | PRIMEIRO_NOME
+        for nome in sobrenomes:
+            chave = normalizar(nome)
+            self._bits[chave] = self._bits.get(chave, 0) | SOBRENOME
+        self.unicos = frozenset(normalizar(nome) for nome in unicos)
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def bits(self, palavra: str) -> int:
+        """Bits da palavra já normalizada (0 se desconhecida)"""
+        return self._bits.get(palavra, 0)
+
+
+def lexico_padrao() -> LexicoNomes:
+    """Nomes e sobrenomes dos dois reconhecedores de nomes"""
+    return LexicoNomes(
+        primeiros=list(BrazilianNameRecognizer.FIRST_NAMES) + BrazilNameRecognizer.FIRST_NAMES,
+        sobrenomes=list(BrazilianNameRecognizer.LAST_NAMES) + BrazilNameRecognizer.LAST_NAMES,
+        unicos=BrazilianNameRecognizer.COMMON_SINGLE_NAMES,
+    )
+
+
+# ============================================================================
+# TOKENS
+# ============================================================================
+# Ligações dentro de um token de nome ("Ana-Maria", "O'Brien", "D’Ávila")
+LIGACOES = frozenset({"-", "'", "’"})
+
+
+class Token(NamedTuple):
+    inicio: int
+    fim: int
+    chave: str                  # Token normalizado ("d'avila")
+    partes: Tuple[str, ...]     # Palavras normalizadas ("d", "avila")
+    capitalizado: bool
+
+
+def tokens_do_texto(texto: str) -> List[Token]:
+    """Palavras do texto, juntando as ligadas por hífen/apóstrofo em um token"""
+    inicios, fins, palavras = palavras_do_texto(texto)
+    tokens: List[Token] = []
+    i = 0
+    while i < len(palavras):
+        j = i
+        while j + 1 < len(palavras) and texto[fins[j]:inicios[j + 1]] in LIGACOES:
+            j += 1
+        partes = tuple(palavras[i:j + 1])
+        capitalizado = all(p.isalpha() for p in partes) and any(
+            texto[inicios[k]].isupper() for k in range(i, j + 1)
+        )
+        tokens.append(Token(
+            inicio=inicios[i],
+            fim=fins[j],
+            chave=normalizar(texto[inicios[i]:fins[j]]),
+            partes=partes,
+            capitalizado=capitalizado,
+        ))
+        i = j + 1
+    return tokens
+
+
+# ============================================================================
+# GERADOR
+# ============================================================================
+class GeradorCandidatosNome(EntityRecognizer):
+    """
+    Um candidato PERSON por sequência de palavras capitalizadas
+    """
+
+    CONTEXT = list(dict.fromkeys(BrazilianNameRecognizer.CONTEXT + BrazilNameRecognizer.CONTEXT))
+
+    def __init__(
+        self,
+        lexico: Optional[LexicoNomes] = None,
+        context: Optional[List[str]] = None,
+        supported_language: str = "pt",
+        supported_entity: str = "PERSON",
+    ):
+        self.lexico = lexico if lexico is not None else lexico_padrao()
+        super().__init__(
+            supported_entities=[supported_entity],
+            supported_language=supported_language,
+            context=context if context else self.CONTEXT,
+        )
+
+    def load(self) -> None:
+        pass
+
+    def _bits(self, token: Token) -> int:
+        """Bits do token inteiro ou de alguma das partes ("Ana-Maria" → ana, maria)"""
+        bits = self.lexico.bits(token.chave)
+        for parte in token.partes:
+            bits |= self.lexico.bits(parte)
+        return bits
+
+    def analyze(
+        self, text: str, entities: List[str], nlp_artifacts: Optional[NlpArtifacts] = None
+    ) -> List[RecognizerResult]:
+        results = []
+        sequencia: List[Token] = []
+        sequencias = 0
+
+        for token in tokens_do_texto(text):
+            separador = text[sequencia[-1].fim:token.inicio] if sequencia else ""
+            # Só espaços na mesma linha: um nome não continua na linha seguinte
+            if sequencia and (not separador.isspace() or "\n" in separador):
+                results.extend(self._candidatos(text, sequencia))
+                sequencias += 1
+                sequencia = []
+
+            if token.chave in CONECTORES:
+                # Conector só dentro de uma sequência
+                if sequencia:
+                    sequencia.append(token)
+            elif token.capitalizado:
+                sequencia.append(token)
+            elif sequencia:
+                results.extend(self._candidatos(text, sequencia))
+                sequencias += 1
+                sequencia = []
+
+        if sequencia:
+            results.extend(self._candidatos(text, sequencia))
+            sequencias += 1
+
+        # Sequências como matches brutos; candidatos por categoria (custo_reconhecedores.py)
+        contar_matches(self.name, TOTAL_RECONHECEDOR, sequencias)
+        por_categoria: Dict[str, int] = {}
+        for r in results:
+            categoria = r.analysis_explanation.pattern_name
+            por_categoria[categoria] = por_categoria.get(categoria, 0) + 1
+        for categoria, quantidade in por_categoria.items():
+            contar_matches(self.name, categoria, quantidade)
+        return results
+
+    def _candidatos(self, texto: str, sequencia: List[Token]) -> List[RecognizerResult]:
+        """Divide a sequência onde muda a caixa (MAIÚSCULAS × Capitalizada)"""
+        resultados = []
+        parte: List[Token] = []
+        caixa_parte = None
+        for token in sequencia:
+            if token.chave in CONECTORES:
+                parte.append(token)
+                continue
+            trecho = texto[token.inicio:token.fim]
+            caixa = len(trecho) > 1 and trecho.isupper()
+            if parte and caixa != caixa_parte:
+                resultados.extend(self._candidato(parte))
+                parte = []
+            caixa_parte = caixa
+            parte.append(token)
+        resultados.extend(self._candidato(parte))
+        return resultados
+
+    def _candidato(self, parte: List[Token]) -> List[RecognizerResult]:
+        # Conectores nas pontas não fazem parte do nome
+        while parte and parte[0].chave in CONECTORES:
+            parte = parte[1:]
+        while parte and parte[-1].chave in CONECTORES:
+            parte = parte[:-1]
+        if not parte:
+            return []
+
+        nomes = [token for token in parte if token.chave not in CONECTORES]
+        bits = [self._bits(token) for token in nomes]
+
+        # Se a sequência começa com palavras desconhecidas, também sai o trecho
+        # a partir do primeiro nome conhecido ("Condomínio Municipal Hélio
+        # Silva Campos" → "Hélio Silva Campos"): a sequência inteira pode cair
+        # na blacklist ou no NameValidator como institucional, o nome não
+        primeiro = 0
+        conhecidos = [k for k, b in enumerate(bits) if b]
+        if conhecidos:
+            primeiro = conhecidos[0]
+            # Uma palavra desconhecida antes de um sobrenome é provavelmente o primeiro nome
+            if (primeiro > 0 and not bits[primeiro] & PRIMEIRO_NOME
+                    and len(nomes[primeiro - 1].chave) >= 3):
+                primeiro -= 1
+
+        # O léxico só pontua: o candidato é sempre a sequência inteira. Com
+        # palavras desconhecidas na frente ela fica com o score de sequência
+        # sem nome, abaixo do trecho - senão o remove_duplicates do analyzer
+        # descartaria o trecho, contido nela com o mesmo score
+        resultados = []
+        score = SCORE_SEQUENCIA if primeiro > 0 else self._score(nomes, bits)
+        if score is not None and len(nomes) <= MAX_PALAVRAS:
+            resultados.append(self._resultado(nomes, bits, score))
+        if primeiro > 0:
+            score = self._score(nomes[primeiro:], bits[primeiro:])
+            if score is not None:
+                resultados.append(self._resultado(nomes[primeiro:], bits[primeiro:], score))
+        return resultados
+
+    def _score(self, nomes: List[Token], bits: List[int]) -> Optional[float]:
+        """Score da sequência de tokens (None = não é candidato)"""
+        if len(nomes) > MAX_PALAVRAS:
+            return None
+        if len(nomes) == 1:
+            return SCORE_NOME_UNICO if nomes[0].chave in self.lexico.unicos else None
+        if bits[0] & PRIMEIRO_NOME and any(b & SOBRENOME for b in bits[1:]):
+            return SCORE_NOME_COMPLETO
+        if any(bits):
+            return SCORE_NOME_CONHECIDO
+        return SCORE_SEQUENCIA
+
+    def _resultado(self, nomes: List[Token], bits: List[int], score: float) -> RecognizerResult:
+        explicacao = AnalysisExplanation(
+            recognizer=self.name,
+            original_score=score,
+            pattern_name=CATEGORIAS[score],
+            textual_explanation=f"Sequência de {len(nomes)} tokens capitalizados "
+                                f"({sum(1 for b in bits if b)} no léxico de nomes)",
+        )
+        return RecognizerResult(
+            entity_type=self.supported_entities[0],
+            start=nomes[0].inicio,
+            end=nomes[-1].fim,
+            score=score,
+            analysis_explanation=explicacao,
+            recognition_metadata={
+                RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
+            },
+        )
@@ -0,0 +1,56 @@
+"""
+Exporta o NameDataset para o léxico compacto (lexico_compacto.py)
+
+Executado uma vez, offline (no build da imagem ou ao atualizar o
+names-dataset); o serviço só mapeia o arquivo gerado. Todos os nomes são
+exportados, de todos os países - o NameValidator aceita nomes de qualquer
+país, e restringir ao Brasil mudaria os vereditos -, com a posição no ranking
+brasileiro como popularidade.
+
+Uso:
+    python construir_lexico_nomes.py [saida]   (padrão: dados/lexico_nomes.bin)
+"""
+import sys
+import time
+
+from names_dataset import NameDataset
+
+from lexico_compacto import CAMINHO_LEXICO, PRIMEIRO_NOME, SOBRENOME, LexicoCompacto, gravar_lexico
+
+PAIS = "BR"
+
+
+def nomes_do_dataset(dataset):
+    for tabela, flag in ((dataset.first_names, PRIMEIRO_NOME), (dataset.last_names, SOBRENOME)):
+        for nome, info in tabela.items():
+            rank = (info or {}).get("rank", {}).get(PAIS) or 0
+            yield nome, flag, int(rank)
+
+
+caminho = sys.argv[1] if len(sys.argv) > 1 else CAMINHO_LEXICO
+
+inicio = time.perf_counter()
+dataset = NameDataset()
+t_dataset = time.perf_counter() - inicio
+
+quantidade = gravar_lexico(caminho, nomes_do_dataset(dataset))
+
+inicio = time.perf_counter()
+lexico = LexicoCompacto(caminho)
+t_lexico = time.perf_counter() - inicio
+
+# Confere uma amostra: o léxico deve responder como o NameDataset
+divergentes = [
+    nome for tabela in (dataset.first_names, dataset.last_names)
+    for nome in list(tabela)[::1000]
+    if bool(lexico.search(nome)["first_name"]) != bool(dataset.search(nome)["first_name"])
+    or bool(lexico.search(nome)["last_name"]) != bool(dataset.search(nome)["last_name"])
+]
+
+print(f"\n{'='*60}")
+print("LÉXICO DE NOMES")
+print(f"{'='*60}")
+print(f"Arquivo:          {caminho}")
+print(f"Nomes:            {quantidade}")
+print(f"Carga:            NameDataset {t_dataset:.2f} s → léxico {t_lexico * 1000:.2f} ms")
+print(f"Amostra igual:    {'✅' if not divergentes else f'⚠️ {divergentes[:5]}'}")
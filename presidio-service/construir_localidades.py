@@ -0,0 +1,87 @@
+"""
+Gera dados/municipios.tsv (localidades.py)
+
+Executado uma vez, offline em relação ao serviço: o serviço só lê o TSV gerado.
+Duas fontes:
+
+- JSON da API de localidades do IBGE (os 5.570 municípios, com código IBGE),
+  baixado à parte (no build da imagem, por exemplo)
+- --phonenumbers: as localidades "Cidade - UF" da geodata do phonenumbers
+  (dependência do serviço), sem rede. Cobre quase todos os municípios e
+  alguns distritos, sem código IBGE. É a fonte do arquivo versionado no repositório
+
+Uso:
+    curl -o municipios.json https://servicodados.ibge.gov.br/api/v1/localidades/municipios
+    python construir_localidades.py municipios.json [saida]   (padrão: dados/municipios.tsv)
+    python construir_localidades.py --phonenumbers [saida]
+"""
+import json
+import os
+import re
+import sys
+
+from localidades import CAMINHO_MUNICIPIOS, Localidades
+
+
+def uf_do_municipio(municipio):
+    """Sigla da UF (municípios recentes vêm sem microrregião, só com região imediata)"""
+    microrregiao = municipio.get("microrregiao")
+    if microrregiao:
+        return microrregiao["mesorregiao"]["UF"]["sigla"]
+    imediata = municipio.get("regiao-imediata")
+    if imediata:
+        return imediata["regiao-intermediaria"]["UF"]["sigla"]
+    return ""
+
+
+def linhas_ibge(caminho):
+    """(nome, UF, código IBGE) do JSON da API de localidades, por código"""
+    with open(caminho, encoding="utf-8") as f:
+        municipios = json.load(f)
+    for municipio in sorted(municipios, key=lambda m: m["id"]):
+        yield municipio["nome"], uf_do_municipio(municipio), str(municipio["id"])
+
+
+def linhas_phonenumbers():
+    """(nome, UF, "") das localidades brasileiras da geodata do phonenumbers, por UF e nome"""
+    from phonenumbers.geodata import GEOCODE_DATA
+
+    cidade_uf = re.compile(r"^(.+) - ([A-Z]{2})$")
+    pares = set()
+    for prefixo, descricoes in GEOCODE_DATA.items():
+        if not prefixo.startswith("55"):
+            continue
+        m = cidade_uf.match(descricoes.get("pt", ""))
+        if m:
+            pares.add((m.group(1).strip(), m.group(2)))
+    for nome, uf in sorted(pares, key=lambda par: (par[1], par[0])):
+        yield nome, uf, ""
+
+
+if len(sys.argv) < 2:
+    sys.exit(__doc__)
+
+if sys.argv[1] == "--phonenumbers":
+    fonte = "geodata do phonenumbers (municípios e distritos, sem código IBGE)"
+    linhas = list(linhas_phonenumbers())
+else:
+    fonte = "API de localidades do IBGE"
+    linhas = list(linhas_ibge(sys.argv[1]))
+saida = sys.argv[2] if len(sys.argv) > 2 else CAMINHO_MUNICIPIOS
+
+os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+with open(saida, "w", encoding="utf-8") as f:
+    f.write(f"# fonte: {fonte} - gerado por construir_localidades.py\n")
+    f.write("# nome\tuf\tcodigo_ibge\n")
+    for nome, uf, codigo in linhas:
+        f.write(f"{nome}\t{uf}\t{codigo}\n")
+
+localidades = Localidades(saida)
+
+print(f"\n{'='*60}")
+print("LOCALIDADES")
+print(f"{'='*60}")
+print(f"Arquivo:          {saida}")
+print(f"Fonte:            {fonte}")
+print(f"Municípios:       {len(linhas)}")
+print(f"Nomes distintos:  {len(localidades)} (com RAs e bairros do DF)")
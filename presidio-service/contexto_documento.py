@@ -0,0 +1,230 @@
+"""
+Índice de Contexto por Documento
+
+Duas etapas procuram palavras de contexto em volta de cada resultado:
+
+- Realce por contexto do Presidio (LemmaContextAwareEnhancer): para cada
+  resultado, procura o token da entidade percorrendo o Doc do spaCy desde o
+  início (_find_index_of_match_token) e coleta as palavras-chave em volta
+  testando `lema in lista_de_palavras_chave` - custo resultados × tokens,
+  ~15 s na amostra do e-SIC
+- NameValidator.analyze_context: para cada PERSON, corta e passa para
+  minúsculas janelas de 100 caracteres e procura cada lista (assinatura,
+  documento, arte, institucional, técnico) por substring
+
+Aqui o documento é indexado uma vez:
+
+- IndiceTokens: fim de cada token e posições (ordenadas) dos tokens que são
+  palavra-chave; para cada palavra de CONTEXT dos reconhecedores, as
+  posições das palavras-chave que a contêm. "Há palavra X nas N
+  palavras-chave antes da entidade" vira busca binária (bisect)
+- IndiceTermos: para cada classe de termos, as ocorrências (início, fim) na
+  visão canônica do texto (minúsculas, sem acento - texto_canonico.py).
+  "Há termo da classe nos N caracteres antes do span" vira busca binária
+
+O custo do contexto passa a crescer com o tamanho do documento, não com
+candidatos × palavras-chave. O resultado é idêntico ao do Presidio e ao da
+análise por janelas de caracteres.
+"""
+import copy
+import logging
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+from presidio_analyzer.context_aware_enhancers import (
+    ContextAwareEnhancer,
+    LemmaContextAwareEnhancer,
+)
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+from texto_canonico import dobrar, texto_canonico
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# TOKENS (REALCE POR CONTEXTO DO PRESIDIO)
+# ============================================================================
+class IndiceTokens:
+    """Tokens e palavras-chave de um NlpArtifacts, indexados uma vez"""
+
+    def __init__(self, nlp_artifacts: NlpArtifacts):
+        self._inicios = list(nlp_artifacts.tokens_indices)
+        self._fins = [inicio + len(token) for inicio, token in zip(self._inicios, nlp_artifacts.tokens)]
+
+        # Tokens cujo lema (em minúsculas) está entre as palavras-chave
+        chaves = set(nlp_artifacts.keywords)
+        self._posicoes: List[int] = []
+        # lema → ordinais (índices em _posicoes) das suas ocorrências
+        self._ordinais_lema: Dict[str, List[int]] = {}
+        for i, lema in enumerate(nlp_artifacts.lemmas):
+            lema = lema.lower()
+            if lema in chaves:
+                self._ordinais_lema.setdefault(lema, []).append(len(self._posicoes))
+                self._posicoes.append(i)
+
+        # palavra de contexto → ordinais das palavras-chave que a contêm (sob demanda)
+        self._ocorrencias: Dict[str, List[int]] = {}
+
+    def indice_token(self, inicio: int) -> Optional[int]:
+        """
+        Primeiro token que começa em `inicio` ou o cobre (mesma regra de
+        _find_index_of_match_token), ou None
+        """
+        i = bisect_right(self._fins, inicio)
+        k = bisect_left(self._inicios, inicio)
+        # Token vazio começando exatamente em `inicio` vem antes
+        if k < i and self._inicios[k] == inicio:
+            i = k
+        return i if i < len(self._inicios) else None
+
+    def ocorrencias(self, palavra: str) -> List[int]:
+        """Ordinais (ordenados) das palavras-chave que contêm `palavra`"""
+        ordinais = self._ocorrencias.get(palavra)
+        if ordinais is None:
+            ordinais = sorted(
+                ordinal
+                for lema, lista in self._ordinais_lema.items() if palavra in lema
+                for ordinal in lista
+            )
+            self._ocorrencias[palavra] = ordinais
+        return ordinais
+
+    def janela(self, indice: int, antes: int, depois: int) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+        Faixas de ordinais das palavras-chave coletadas pelo Presidio: as
+        `antes + 1` até o token (inclusive) e as `depois + 1` a partir dele
+        """
+        fim_antes = bisect_right(self._posicoes, indice)
+        inicio_depois = bisect_left(self._posicoes, indice)
+        return (
+            (max(0, fim_antes - (antes + 1)), fim_antes),
+            (inicio_depois, inicio_depois + depois + 1),
+        )
+
+    def palavra_de_apoio(self, contexto_reconhecedor: Iterable[str],
+                         faixas: Tuple[Tuple[int, int], ...], extras: List[str]) -> str:
+        """Primeira palavra de CONTEXT do reconhecedor presente na janela"""
+        for palavra in contexto_reconhecedor:
+            ordinais = self.ocorrencias(palavra)
+            for inicio, fim in faixas:
+                i = bisect_left(ordinais, inicio)
+                if i < len(ordinais) and ordinais[i] < fim:
+                    return palavra
+            if any(palavra in extra for extra in extras):
+                return palavra
+        return ""
+
+
+class RealceContextoIndexado(LemmaContextAwareEnhancer):
+    """
+    LemmaContextAwareEnhancer com o documento indexado uma vez por chamada
+    (mesmos parâmetros, mesmo resultado)
+    """
+
+    def enhance_using_context(
+        self,
+        text: str,
+        raw_results: List[RecognizerResult],
+        nlp_artifacts: NlpArtifacts,
+        recognizers: List[EntityRecognizer],
+        context: Optional[List[str]] = None,
+    ) -> List[RecognizerResult]:
+        if nlp_artifacts is None or not nlp_artifacts.tokens or not raw_results:
+            return super().enhance_using_context(text, raw_results, nlp_artifacts, recognizers, context)
+
+        results = copy.deepcopy(raw_results)
+        recognizers_dict = {recognizer.id: recognizer for recognizer in recognizers}
+        extras = [palavra.lower() for palavra in context] if context else []
+        indice = IndiceTokens(nlp_artifacts)
+
+        for result in results:
+            metadados = result.recognition_metadata
+            if not metadados or RecognizerResult.RECOGNIZER_IDENTIFIER_KEY not in metadados:
+                continue
+            recognizer = recognizers_dict.get(metadados[RecognizerResult.RECOGNIZER_IDENTIFIER_KEY])
+            if not recognizer or not recognizer.context:
+                continue
+            if metadados.get(RecognizerResult.IS_SCORE_ENHANCED_BY_CONTEXT_KEY):
+                continue
+
+            token = indice.indice_token(result.start)
+            if token is None:
+                raise ValueError(
+                    "Did not find word '" + text[result.start:result.end] + "' "
+                    "in the list of tokens although it is expected to be found"
+                )
+            faixas = indice.janela(token, self.context_prefix_count, self.context_suffix_count)
+            palavra = indice.palavra_de_apoio(recognizer.context, faixas, extras)
+            if palavra:
+                result.score += self.context_similarity_factor
+                result.score = max(result.score, self.min_score_with_context_similarity)
+                result.score = min(result.score, ContextAwareEnhancer.MAX_SCORE)
+                result.analysis_explanation.set_supportive_context_word(palavra)
+                result.analysis_explanation.set_improved_score(result.score)
+
+        return results
+
+
+# ============================================================================
+# TERMOS NO TEXTO (CONTEXTO DOS VALIDADORES)
+# ============================================================================
+class IndiceTermos:
+    """
+    Ocorrências, no texto sem acento e em minúsculas, dos termos de cada classe
+
+    Termos com e sem acento ("análise"/"analise") viram um só. Para cada
+    posição guarda só o termo mais curto da classe que começa ali: se algum
+    termo cabe em uma janela, o mais curto também cabe. As posições são as
+    do texto dobrado; as janelas são convertidas pelo mapa de posições.
+    """
+
+    def __init__(self, texto: str, classes: Dict[str, Iterable[str]]):
+        self.texto = texto
+        self._classes = {classe: tuple(termos) for classe, termos in classes.items()}
+        self._canonico = texto_canonico(texto)
+        self._inicios: Dict[str, List[int]] = {}
+        self._fins: Dict[str, List[int]] = {}
+
+        for classe, termos in self._classes.items():
+            # Alternância em ordem crescente de tamanho dentro de um lookahead:
+            # todas as posições (inclusive sobrepostas), com o termo mais curto
+            dobrados = {dobrar(t) for t in termos}
+            alternancia = "|".join(re.escape(t) for t in sorted(dobrados, key=len))
+            inicios, fins = [], []
+            for m in re.finditer(f"(?=({alternancia}))", self._canonico.dobrado):
+                inicios.append(m.start())
+                fins.append(m.end(1))
+            self._inicios[classe] = inicios
+            self._fins[classe] = fins
+
+    def existe(self, classe: str, inicio: int, fim: int) -> bool:
+        """True se algum termo da classe aparece inteiro em texto[inicio:fim]"""
+        inicio = self._canonico.posicao(max(0, inicio))
+        fim = self._canonico.posicao(min(len(self.texto), fim))
+
+        inicios = self._inicios[classe]
+        fins = self._fins[classe]
+        for i in range(bisect_left(inicios, inicio), len(inicios)):
+            if inicios[i] >= fim:
+                break
+            if fins[i] <= fim:
+                return True
+        return False
+
+
+_local = threading.local()
+
+
+def indice_termos(texto: str, classes: Dict[str, Iterable[str]]) -> IndiceTermos:
+    """
+    Índice de `texto` para as classes dadas, construído uma vez por documento
+    (por thread): os PERSON seguintes do mesmo texto reaproveitam
+    """
+    indice = getattr(_local, "indice", None)
+    if indice is None or indice.texto is not texto or indice._classes.keys() != classes.keys():
+        indice = _local.indice = IndiceTermos(texto, classes)
+    return indice
@@ -0,0 +1,233 @@
+"""
+Custo e Rendimento por Reconhecedor e por Padrão
+
+Cada uma das 37 classes de brazilian_recognizers.py (e o
+BrazilianNameRecognizer) acrescenta passadas de regex sobre o texto inteiro.
+Este módulo mede, por reconhecedor e por Pattern:
+
+- tempo: tempo de parede (reconhecedor: analyze() inteiro, com validação;
+  padrão: só a busca da regex)
+- matches: ocorrências brutas da regex (antes de validate_result)
+- validados: resultados devolvidos pelo reconhecedor (score > 0 após validação)
+- sobreviventes: resultados que passaram pelos filtros do pipeline
+
+Com isso fica visível quais reconhecedores custam mais e quais quase nunca
+contribuem com uma entidade anonimizada.
+
+Reconhecedores sem Pattern informam o próprio detalhamento com contar_matches
+e o pattern_name da explicação dos resultados:
+- ReconhecedorDicionario: uma linha por conjunto de termos (TermosDicionario),
+  com os termos encontrados como matches. A trie percorre todos os conjuntos
+  de uma vez, então o tempo fica só na linha "*"
+- GeradorCandidatosNome: matches "*" = sequências de palavras capitalizadas;
+  uma linha por categoria de candidato (nome_completo, nome_conhecido,
+  sequencia, nome_unico)
+
+Os contadores de cada requisição são acumulados no Cronometro da thread do
+worker (metricas.py) e voltam com o resultado; a API os soma em uma
+ContabilidadeReconhecedores (GET /api/metrics e /api/metrics/reconhecedores).
+A linha de padrão "*" de cada reconhecedor traz o total do reconhecedor.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import regex
+from presidio_analyzer import EntityRecognizer, PatternRecognizer, RecognizerResult
+
+from metricas import cronometro_atual
+
+# Rótulo da linha com o total do reconhecedor (em vez de um padrão específico)
+TOTAL_RECONHECEDOR = "*"
+
+# Nome do padrão guardado em recognition_metadata (sobrevive ao AnalyzerEngine)
+CHAVE_PADRAO = "custo_padrao"
+
+# Liga/desliga a instrumentação (o custo é um perf_counter por match)
+CONTABILIDADE_ATIVA = os.getenv("PRESIDIO_CUSTO_RECONHECEDORES", "1") == "1"
+
+
+# ============================================================================
+# INSTRUMENTAÇÃO (lado do worker)
+# ============================================================================
+class _RegexMedida:
+    """
+    Envolve a regex compilada de um Pattern: mede a busca e conta os matches
+    sem incluir o tempo de validação de cada match
+    """
+
+    def __init__(self, compilada, reconhecedor: str, padrao: str):
+        self._regex = compilada
+        self._reconhecedor = reconhecedor
+        self._padrao = padrao
+
+    def __getattr__(self, nome):
+        return getattr(self._regex, nome)
+
+    def finditer(self, *args, **kwargs):
+        cronometro = cronometro_atual()
+        iterador = self._regex.finditer(*args, **kwargs)
+        tempo = 0.0
+        matches = 0
+        try:
+            while True:
+                inicio = time.perf_counter()
+                try:
+                    match = next(iterador)
+                except StopIteration:
+                    tempo += time.perf_counter() - inicio
+                    return
+                tempo += time.perf_counter() - inicio
+                matches += 1
+                yield match
+        finally:
+            cronometro.contar(self._reconhecedor, self._padrao, tempo=tempo, matches=matches)
+            # O tempo do reconhecedor já é medido em analyze(); só os matches sobem
+            cronometro.contar(self._reconhecedor, TOTAL_RECONHECEDOR, matches=matches)
+
+
+def instrumentar_reconhecedor(reconhecedor: EntityRecognizer) -> None:
+    """
+    Passa a medir analyze() do reconhecedor e, se for PatternRecognizer, a
+    busca de cada um dos seus padrões
+    """
+    if not CONTABILIDADE_ATIVA or getattr(reconhecedor, "_custo_instrumentado", False):
+        return
+
+    nome = reconhecedor.name
+
+    if isinstance(reconhecedor, PatternRecognizer):
+        # Compila agora com as flags que o analyze() usará (global_regex_flags),
+        # para a regex medida não ser substituída na primeira chamada
+        flags = reconhecedor.global_regex_flags
+        for pattern in reconhecedor.patterns:
+            if not pattern.compiled_regex or pattern.compiled_with_flags != flags:
+                pattern.compiled_with_flags = flags
+                # Mesmo módulo `regex` que o PatternRecognizer usa
+                pattern.compiled_regex = regex.compile(pattern.regex, flags=flags)
+            # Pattern compartilhado entre instâncias (motores de outra thread): já medido
+            if not isinstance(pattern.compiled_regex, _RegexMedida):
+                pattern.compiled_regex = _RegexMedida(pattern.compiled_regex, nome, pattern.name)
+
+    analyze_original = reconhecedor.analyze
+
+    def analyze_medido(*args, **kwargs):
+        cronometro = cronometro_atual()
+        inicio = time.perf_counter()
+        resultados = analyze_original(*args, **kwargs)
+        cronometro.contar(
+            nome, TOTAL_RECONHECEDOR,
+            tempo=time.perf_counter() - inicio,
+            validados=len(resultados) if resultados else 0
+        )
+        for r in resultados or []:
+            padrao = _nome_padrao(r)
+            if padrao:
+                cronometro.contar(nome, padrao, validados=1)
+                # O AnalyzerEngine descarta analysis_explanation (return_decision_process=False);
+                # os metadados chegam até o filtro e contar_sobreviventes
+                if r.recognition_metadata is None:
+                    r.recognition_metadata = {}
+                r.recognition_metadata[CHAVE_PADRAO] = padrao
+        return resultados
+
+    reconhecedor.analyze = analyze_medido
+    reconhecedor._custo_instrumentado = True
+
+
+def contar_matches(reconhecedor: str, padrao: str, matches: int) -> None:
+    """Matches brutos de um reconhecedor sem Pattern (dicionário, gerador de nomes)"""
+    if not CONTABILIDADE_ATIVA or not matches:
+        return
+    cronometro = cronometro_atual()
+    cronometro.contar(reconhecedor, padrao, matches=matches)
+    cronometro.contar(reconhecedor, TOTAL_RECONHECEDOR, matches=matches)
+
+
+def _nome_padrao(resultado: RecognizerResult) -> str:
+    padrao = (resultado.recognition_metadata or {}).get(CHAVE_PADRAO)
+    if padrao:
+        return padrao
+    explicacao = resultado.analysis_explanation
+    return getattr(explicacao, "pattern_name", None) or ""
+
+
+def contar_sobreviventes(resultados: List[RecognizerResult]) -> None:
+    """Conta, por reconhecedor/padrão, os resultados que passaram pelos filtros"""
+    cronometro = cronometro_atual()
+    for r in resultados:
+        metadados = r.recognition_metadata or {}
+        nome = metadados.get(RecognizerResult.RECOGNIZER_NAME_KEY)
+        if not nome:
+            continue
+        cronometro.contar(nome, TOTAL_RECONHECEDOR, sobreviventes=1)
+        padrao = _nome_padrao(r)
+        if padrao:
+            cronometro.contar(nome, padrao, sobreviventes=1)
+
+
+# ============================================================================
+# AGREGAÇÃO (lado da API)
+# ============================================================================
+class ContabilidadeReconhecedores:
+    """Soma os custos devolvidos por cada requisição"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._custos: Dict[Tuple[str, str], List[float]] = {}
+        self.requisicoes = 0
+
+    def acumular(self, custos: Dict[Tuple[str, str], List[float]]) -> None:
+        if not custos:
+            return
+        with self._lock:
+            self.requisicoes += 1
+            for chave, valores in custos.items():
+                total = self._custos.get(chave)
+                if total is None:
+                    total = self._custos[chave] = [0.0, 0, 0, 0]
+                for i, valor in enumerate(valores):
+                    total[i] += valor
+
+    def relatorio(self) -> List[Dict[str, Any]]:
+        """Linhas por reconhecedor/padrão, das mais caras para as mais baratas"""
+        with self._lock:
+            itens = list(self._custos.items())
+
+        linhas = []
+        for (reconhecedor, padrao), (tempo, matches, validados, sobreviventes) in itens:
+            linhas.append({
+                "reconhecedor": reconhecedor,
+                "padrao": padrao,
+                "tempoMs": round(tempo * 1000, 3),
+                "matches": int(matches),
+                "validados": int(validados),
+                "sobreviventes": int(sobreviventes),
+                # Fração dos resultados validados que chega à resposta
+                "taxaSobrevivencia": round(sobreviventes / validados, 4) if validados else None,
+                # Custo por entidade efetivamente anonimizada
+                "msPorSobrevivente": round(tempo * 1000 / sobreviventes, 3) if sobreviventes else None,
+            })
+        linhas.sort(key=lambda linha: (linha["padrao"] != TOTAL_RECONHECEDOR, -linha["tempoMs"]))
+        return linhas
+
+    def exposicao(self) -> str:
+        """Contadores no formato de exposição do Prometheus"""
+        with self._lock:
+            itens = sorted(self._custos.items())
+
+        metricas = (
+            ("presidio_reconhecedor_segundos_total", "Tempo gasto pelo reconhecedor/padrão", 0),
+            ("presidio_reconhecedor_matches_total", "Matches brutos da regex", 1),
+            ("presidio_reconhecedor_validados_total", "Resultados devolvidos após validação", 2),
+            ("presidio_reconhecedor_sobreviventes_total", "Resultados que passaram pelos filtros", 3),
+        )
+        linhas = []
+        for nome, ajuda, indice in metricas:
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} counter")
+            for (reconhecedor, padrao), valores in itens:
+                valor = f"{valores[indice]:.6f}" if indice == 0 else f"{int(valores[indice])}"
+                linhas.append(f'{nome}{{reconhecedor="{reconhecedor}",padrao="{padrao}"}} {valor}')
+        return "\n".join(linhas) + "\n"
@@ -0,0 +1,352 @@
+"""
+Dígitos Verificadores dos Documentos Brasileiros
+
+CPF, CNPJ, PIS/PASEP, CNS, Título de Eleitor, RENAVAM e CNH, em duas formas:
+
+- Chamada única (`cpf_valido("52998224725")`): aritmética direta sobre os
+  códigos dos caracteres, sem listas nem int() por dígito - é o caminho do
+  validate_result de cada reconhecedor
+- Lote (`validar_lote("BR_CPF", numeros)`): os números viram uma matriz
+  NumPy (n × dígitos) e cada dígito verificador é um produto matricial pelos
+  pesos - usado no processamento em lote. Sem NumPy, cai na chamada única
+
+Modo estrito: os documentos de teste da ouvidoria não têm dígitos
+verificadores válidos, então por padrão o dígito verificador não rejeita
+nada (os reconhecedores devolvem None). Com o modo estrito ligado - por
+configuração ou por requisição (`validarDigitos`) - um número com dígito
+inválido é rejeitado dentro do analyze(), antes do realce por contexto e
+dos filtros.
+
+O modo vale para o contexto de execução atual (contextvars): o pipeline o
+ativa no worker, em volta da requisição (`verificacao_estrita`).
+
+Configuração por variável de ambiente:
+- PRESIDIO_DIGITO_VERIFICADOR_ESTRITO: 1 liga o modo estrito por padrão, 0 desliga (padrão)
+"""
+import os
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+ESTRITO_PADRAO = os.getenv("PRESIDIO_DIGITO_VERIFICADOR_ESTRITO", "0") == "1"
+
+_ZERO = 48  # ord("0")
+
+# Pesos do módulo 11
+PESOS_CPF_1 = (10, 9, 8, 7, 6, 5, 4, 3, 2)
+PESOS_CPF_2 = (11, 10, 9, 8, 7, 6, 5, 4, 3, 2)
+PESOS_CNPJ_1 = (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+PESOS_CNPJ_2 = (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+PESOS_PIS = (3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+PESOS_RENAVAM = (3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+PESOS_TITULO = (2, 3, 4, 5, 6, 7, 8, 9)
+PESOS_CNH_1 = (9, 8, 7, 6, 5, 4, 3, 2, 1)
+PESOS_CNH_2 = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+PESOS_CNS = tuple(range(15, 0, -1))
+
+
+# ============================================================================
+# CHAMADA ÚNICA
+# ============================================================================
+def _soma(digitos: str, pesos: Tuple[int, ...], inicio: int = 0) -> int:
+    soma = 0
+    for i in range(len(pesos)):
+        soma += (ord(digitos[inicio + i]) - _ZERO) * pesos[i]
+    return soma
+
+
+def _dv_modulo_11(soma: int) -> int:
+    resto = soma % 11
+    return 0 if resto < 2 else 11 - resto
+
+
+def _digito(digitos: str, posicao: int) -> int:
+    return ord(digitos[posicao]) - _ZERO
+
+
+def _repetido(digitos: str) -> bool:
+    return digitos.count(digitos[0]) == len(digitos)
+
+
+def _so_digitos(digitos: str, tamanho: int) -> bool:
+    return len(digitos) == tamanho and digitos.isascii() and digitos.isdigit()
+
+
+def cpf_valido(digitos: str) -> bool:
+    if not _so_digitos(digitos, 11) or _repetido(digitos):
+        return False
+    return (_digito(digitos, 9) == _dv_modulo_11(_soma(digitos, PESOS_CPF_1))
+            and _digito(digitos, 10) == _dv_modulo_11(_soma(digitos, PESOS_CPF_2)))
+
+
+def cnpj_valido(digitos: str) -> bool:
+    if not _so_digitos(digitos, 14) or _repetido(digitos):
+        return False
+    return (_digito(digitos, 12) == _dv_modulo_11(_soma(digitos, PESOS_CNPJ_1))
+            and _digito(digitos, 13) == _dv_modulo_11(_soma(digitos, PESOS_CNPJ_2)))
+
+
+def pis_valido(digitos: str) -> bool:
+    if not _so_digitos(digitos, 11) or _repetido(digitos):
+        return False
+    return _digito(digitos, 10) == _dv_modulo_11(_soma(digitos, PESOS_PIS))
+
+
+def cns_valido(digitos: str) -> bool:
+    if not _so_digitos(digitos, 15) or digitos[0] not in "12789":
+        return False
+    if digitos[0] in "12":
+        # Cartão definitivo: PIS (11 dígitos) + "000"/"001" + dígito verificador
+        soma = _soma(digitos, PESOS_CNS[:11])
+        dv = 11 - soma % 11
+        if dv == 11:
+            dv = 0
+        sufixo = "000"
+        if dv == 10:
+            dv = 11 - (soma + 2) % 11
+            sufixo = "001"
+        return digitos.startswith(sufixo, 11) and _digito(digitos, 14) == dv
+    return _soma(digitos, PESOS_CNS) % 11 == 0
+
+
+def titulo_valido(digitos: str) -> bool:
+    if not _so_digitos(digitos, 12):
+        return False
+    uf = _digito(digitos, 8) * 10 + _digito(digitos, 9)
+    if not 1 <= uf <= 28:
+        return False
+    dv1 = _soma(digitos, PESOS_TITULO) % 11 % 10  # resto 10 vira 0
+    dv2 = (_digito(digitos, 8) * 7 + _digito(digitos, 9) * 8 + dv1 * 9) % 11 % 10
+    return _digito(digitos, 10) == dv1 and _digito(digitos, 11) == dv2
+
+
+def renavam_valido(digitos: str) -> bool:
+    if not _so_digitos(digitos, 11):
+        return False
+    return _digito(digitos, 10) == _soma(digitos, PESOS_RENAVAM) * 10 % 11 % 10
+
+
+def cnh_valido(digitos: str) -> bool:
+    if not _so_digitos(digitos, 11) or _repetido(digitos):
+        return False
+    dv1 = _soma(digitos, PESOS_CNH_1) % 11
+    desconto = 0
+    if dv1 >= 10:
+        dv1, desconto = 0, 2
+    dv2 = (_soma(digitos, PESOS_CNH_2) % 11 - desconto) % 11
+    if dv2 >= 10:
+        dv2 = 0
+    return _digito(digitos, 9) == dv1 and _digito(digitos, 10) == dv2
+
+
+# Entidade → (validador, número de dígitos)
+VALIDADORES: Dict[str, Tuple[Callable[[str], bool], int]] = {
+    "BR_CPF": (cpf_valido, 11),
+    "BR_CNPJ": (cnpj_valido, 14),
+    "BR_PIS_PASEP": (pis_valido, 11),
+    "BR_CNS": (cns_valido, 15),
+    "BR_VOTER_ID": (titulo_valido, 12),
+    "BR_RENAVAM": (renavam_valido, 11),
+    "BR_DRIVER_LICENSE": (cnh_valido, 11),
+}
+
+
+# ============================================================================
+# LOTE (NUMPY)
+# ============================================================================
+def _matriz(numeros: Sequence[str], tamanho: int):
+    """Números de mesmo tamanho → matriz int (n × tamanho) de dígitos"""
+    bruto = "".join(numeros).encode("ascii")
+    return np.frombuffer(bruto, dtype=np.uint8).reshape(len(numeros), tamanho).astype(np.int64) - _ZERO
+
+
+def _dv_modulo_11_np(soma):
+    resto = soma % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def _nao_repetido_np(d):
+    return (d != d[:, :1]).any(axis=1)
+
+
+def _pesos(pesos: Tuple[int, ...]):
+    return np.asarray(pesos, dtype=np.int64)
+
+
+def _cpf_np(d):
+    dv1 = _dv_modulo_11_np(d[:, :9] @ _pesos(PESOS_CPF_1))
+    dv2 = _dv_modulo_11_np(d[:, :10] @ _pesos(PESOS_CPF_2))
+    return _nao_repetido_np(d) & (d[:, 9] == dv1) & (d[:, 10] == dv2)
+
+
+def _cnpj_np(d):
+    dv1 = _dv_modulo_11_np(d[:, :12] @ _pesos(PESOS_CNPJ_1))
+    dv2 = _dv_modulo_11_np(d[:, :13] @ _pesos(PESOS_CNPJ_2))
+    return _nao_repetido_np(d) & (d[:, 12] == dv1) & (d[:, 13] == dv2)
+
+
+def _pis_np(d):
+    return _nao_repetido_np(d) & (d[:, 10] == _dv_modulo_11_np(d[:, :10] @ _pesos(PESOS_PIS)))
+
+
+def _cns_np(d):
+    primeiro = d[:, 0]
+    # Provisório (7, 8, 9): soma ponderada múltipla de 11
+    provisorio = np.isin(primeiro, (7, 8, 9)) & ((d @ _pesos(PESOS_CNS)) % 11 == 0)
+    # Definitivo (1, 2): PIS + "000"/"001" + dígito verificador
+    soma = d[:, :11] @ _pesos(PESOS_CNS[:11])
+    dv = 11 - soma % 11
+    dv = np.where(dv == 11, 0, dv)
+    ajuste = dv == 10
+    dv = np.where(ajuste, 11 - (soma + 2) % 11, dv)
+    meio = (d[:, 11] == 0) & (d[:, 12] == 0) & (d[:, 13] == ajuste.astype(np.int64))
+    definitivo = np.isin(primeiro, (1, 2)) & meio & (d[:, 14] == dv)
+    return provisorio | definitivo
+
+
+def _titulo_np(d):
+    uf = d[:, 8] * 10 + d[:, 9]
+    dv1 = (d[:, :8] @ _pesos(PESOS_TITULO)) % 11 % 10
+    dv2 = (d[:, 8] * 7 + d[:, 9] * 8 + dv1 * 9) % 11 % 10
+    return (uf >= 1) & (uf <= 28) & (d[:, 10] == dv1) & (d[:, 11] == dv2)
+
+
+def _renavam_np(d):
+    return d[:, 10] == (d[:, :10] @ _pesos(PESOS_RENAVAM)) * 10 % 11 % 10
+
+
+def _cnh_np(d):
+    dv1 = (d[:, :9] @ _pesos(PESOS_CNH_1)) % 11
+    desconto = np.where(dv1 >= 10, 2, 0)
+    dv1 = np.where(dv1 >= 10, 0, dv1)
+    dv2 = ((d[:, :9] @ _pesos(PESOS_CNH_2)) % 11 - desconto) % 11
+    dv2 = np.where(dv2 >= 10, 0, dv2)
+    return _nao_repetido_np(d) & (d[:, 9] == dv1) & (d[:, 10] == dv2)
+
+
+_VALIDADORES_NP = {
+    "BR_CPF": _cpf_np,
+    "BR_CNPJ": _cnpj_np,
+    "BR_PIS_PASEP": _pis_np,
+    "BR_CNS": _cns_np,
+    "BR_VOTER_ID": _titulo_np,
+    "BR_RENAVAM": _renavam_np,
+    "BR_DRIVER_LICENSE": _cnh_np,
+}
+
+
+def validar_lote(entidade: str, numeros: Sequence[str]) -> List[bool]:
+    """
+    Valida vários números (só dígitos) de uma vez
+
+    Números com tamanho errado ou caracteres que não são dígitos ASCII são
+    inválidos. Sem NumPy, valida um a um.
+    """
+    validador, tamanho = VALIDADORES[entidade]
+    if not NUMPY_AVAILABLE:
+        return [validador(n) for n in numeros]
+
+    veredictos = [False] * len(numeros)
+    posicoes = [i for i, n in enumerate(numeros) if _so_digitos(n, tamanho)]
+    if posicoes:
+        matriz = _matriz([numeros[i] for i in posicoes], tamanho)
+        for i, valido in zip(posicoes, _VALIDADORES_NP[entidade](matriz).tolist()):
+            veredictos[i] = valido
+    return veredictos
+
+
+# ============================================================================
+# MODO ESTRITO
+# ============================================================================
+# Sequências de dígitos com separadores de máscara (. - /) - candidatas a documento
+_SEQUENCIA = re.compile(r"(?<![0-9])[0-9](?:[./-]?[0-9])*")
+_NAO_DIGITO = re.compile(r"[^0-9]")
+
+# Tamanho → entidades validadas com esse número de dígitos
+_ENTIDADES_POR_TAMANHO: Dict[int, List[str]] = {}
+for _entidade, (_, _tamanho) in VALIDADORES.items():
+    _ENTIDADES_POR_TAMANHO.setdefault(_tamanho, []).append(_entidade)
+
+_estrito: ContextVar[Optional[bool]] = ContextVar("digito_verificador_estrito", default=None)
+# (entidade, dígitos) → veredicto, calculados em lote antes da análise
+_veredictos: ContextVar[Optional[Dict[Tuple[str, str], bool]]] = ContextVar(
+    "digito_verificador_veredictos", default=None
+)
+
+
+def estrito_efetivo(estrito: Optional[bool] = None) -> bool:
+    """Valor da requisição ou, se não informado, o padrão da configuração"""
+    return ESTRITO_PADRAO if estrito is None else estrito
+
+
+def estrito_ativo() -> bool:
+    return estrito_efetivo(_estrito.get())
+
+
+def pre_validar(textos: Sequence[str]) -> Dict[Tuple[str, str], bool]:
+    """
+    Veredictos de todas as sequências de dígitos dos textos, validadas em lote
+    (uma chamada vetorizada por entidade)
+    """
+    por_entidade: Dict[str, set] = {}
+    for texto in textos:
+        for m in _SEQUENCIA.finditer(texto):
+            digitos = _NAO_DIGITO.sub("", m.group())
+            for entidade in _ENTIDADES_POR_TAMANHO.get(len(digitos), ()):
+                por_entidade.setdefault(entidade, set()).add(digitos)
+
+    veredictos = {}
+    for entidade, numeros in por_entidade.items():
+        numeros = list(numeros)
+        for numero, valido in zip(numeros, validar_lote(entidade, numeros)):
+            veredictos[(entidade, numero)] = valido
+    return veredictos
+
+
+@contextmanager
+def verificacao_estrita(estrito: Optional[bool] = None,
+                        textos: Optional[Sequence[str]] = None) -> Iterator[None]:
+    """
+    Ativa (ou não) o modo estrito enquanto o bloco executa
+
+    Args:
+        estrito: True/False da requisição; None usa PRESIDIO_DIGITO_VERIFICADOR_ESTRITO
+        textos: Textos do lote - com o modo estrito ativo, os números são
+            validados de uma vez antes da análise
+    """
+    ativo = estrito_efetivo(estrito)
+    veredictos = pre_validar(textos) if ativo and textos else None
+    token_estrito = _estrito.set(ativo)
+    token_veredictos = _veredictos.set(veredictos)
+    try:
+        yield
+    finally:
+        _veredictos.reset(token_veredictos)
+        _estrito.reset(token_estrito)
+
+
+def validar_documento(entidade: str, texto: str) -> Optional[bool]:
+    """
+    Resposta para o validate_result do reconhecedor: None fora do modo
+    estrito (aceitar sem alterar o score), senão o veredicto do dígito verificador
+
+    Args:
+        entidade: BR_CPF, BR_CNPJ...
+        texto: Texto casado pelo padrão (com máscara ou palavra-chave: "CNH: 123...")
+    """
+    if not estrito_ativo():
+        return None
+    digitos = _NAO_DIGITO.sub("", texto)
+    veredictos = _veredictos.get()
+    if veredictos is not None:
+        valido = veredictos.get((entidade, digitos))
+        if valido is not None:
+            return valido
+    return VALIDADORES[entidade][0](digitos)
@@ -0,0 +1,133 @@
+"""
+Executor do Pipeline de Análise - tira o trabalho CPU-bound do event loop
+
+spaCy, os 37 reconhecedores, o PersonLocationFilter e o anonimizador são
+síncronos. Chamados direto de um endpoint `async def`, um texto de 50 KB
+congela o event loop do uvicorn e até /api/health para de responder.
+
+O ExecutorAnalise roda o pipeline (pipeline.py) em um pool:
+- "thread": ThreadPoolExecutor - cada thread carrega seus próprios motores
+- "process": ProcessPoolExecutor (spawn) - escala entre núcleos, um conjunto
+  de motores por processo
+
+A fila é limitada: com `workers + fila_maxima` tarefas pendentes, novas
+requisições são recusadas (FilaCheiaError → HTTP 503) em vez de acumular
+latência sem limite.
+
+Configuração por variáveis de ambiente:
+- PRESIDIO_EXECUTOR: "thread" (padrão) ou "process"
+- PRESIDIO_WORKERS: número de workers (padrão: 1)
+- PRESIDIO_FILA_MAXIMA: tarefas aguardando além das em execução (padrão: 32)
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from pipeline import inicializar_worker
+
+logger = logging.getLogger(__name__)
+
+MODOS_EXECUTOR = ("thread", "process")
+
+
+class FilaCheiaError(Exception):
+    """Executor sem capacidade para aceitar novas tarefas"""
+
+
+class ExecutorAnalise:
+    """
+    Pool limitado de workers para o pipeline de anonimização
+    """
+
+    def __init__(self, modo: str = "thread", workers: int = 1, fila_maxima: int = 32):
+        """
+        Args:
+            modo: "thread" ou "process"
+            workers: Número de threads/processos (cada um com seus motores)
+            fila_maxima: Tarefas aguardando além das que estão em execução
+        """
+        if modo not in MODOS_EXECUTOR:
+            raise ValueError(f"Modo de executor inválido: '{modo}' (use {MODOS_EXECUTOR})")
+        if workers < 1:
+            raise ValueError("O executor precisa de pelo menos 1 worker")
+        if fila_maxima < 0:
+            raise ValueError("fila_maxima não pode ser negativa")
+
+        self.modo = modo
+        self.workers = workers
+        self.fila_maxima = fila_maxima
+        self._pendentes = 0
+        self._pool = self._criar_pool()
+        logger.info(f"Executor de análise: {workers} worker(s) '{modo}', fila máxima {fila_maxima}")
+
+    def _criar_pool(self) -> Executor:
+        if self.modo == "process":
+            # spawn: não herda threads do uvicorn nem estado do event loop
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=inicializar_worker,
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="presidio-worker",
+            initializer=inicializar_worker,
+        )
+
+    @property
+    def capacidade(self) -> int:
+        """Máximo de tarefas simultâneas (em execução + aguardando)"""
+        return self.workers + self.fila_maxima
+
+    async def executar(self, funcao: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa funcao(*args) em um worker sem bloquear o event loop
+
+        Raises:
+            FilaCheiaError: se já há `capacidade` tarefas pendentes
+        """
+        # Contador só é alterado no event loop (single-thread) - não precisa de lock
+        if self._pendentes >= self.capacidade:
+            raise FilaCheiaError(
+                f"Executor ocupado: {self._pendentes} tarefas pendentes (capacidade {self.capacidade})"
+            )
+
+        self._pendentes += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, funcao, *args)
+        finally:
+            self._pendentes -= 1
+
+    async def aquecer(self) -> None:
+        """Carrega os motores em todos os workers antes de aceitar requisições"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self._pool, inicializar_worker)
+            for _ in range(self.workers)
+        ])
+
+    def status(self) -> Dict[str, Any]:
+        """Estado atual do executor (usado pelo /api/health)"""
+        return {
+            "modo": self.modo,
+            "workers": self.workers,
+            "pendentes": self._pendentes,
+            "capacidade": self.capacidade,
+        }
+
+    def encerrar(self) -> None:
+        """Encerra o pool, cancelando tarefas que ainda não começaram"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def criar_executor_do_ambiente() -> ExecutorAnalise:
+    """Cria o executor a partir de PRESIDIO_EXECUTOR / PRESIDIO_WORKERS / PRESIDIO_FILA_MAXIMA"""
+    return ExecutorAnalise(
+        modo=os.getenv("PRESIDIO_EXECUTOR", "thread").lower(),
+        workers=int(os.getenv("PRESIDIO_WORKERS", "1")),
+        fila_maxima=int(os.getenv("PRESIDIO_FILA_MAXIMA", "32")),
+    )
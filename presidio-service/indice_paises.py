@@ -0,0 +1,157 @@
+"""
+Índice de Países e Subdivisões (PyCountry) para o LocationValidator
+
+O LocationValidator aceitava um candidato LOCATION quando
+pycountry.countries.search_fuzzy(texto) encontrava algo ou quando o texto
+aparecia no nome de alguma subdivisão. O search_fuzzy percorre os ~250
+países e as ~5000 subdivisões (todos os campos, com remoção de acentos a
+cada comparação) e monta um ranking que o validador descarta: ~20 ms por
+candidato. Depois, outra varredura linear das subdivisões.
+
+O validador só precisa do sim/não. O IndicePaises pré-computa, uma vez, as
+mesmas comparações que o search_fuzzy faz:
+
+- Exatas (um conjunto cada): qualquer campo de país em minúsculas
+  (countries.lookup), qualquer campo de subdivisão sem acento separado por
+  ";" (Subdivisions.match) e as iniciais dos nomes dos países ("EUA")
+- Parciais (consulta contida em um nome): nomes/nome oficial/comentário dos
+  países e nomes das subdivisões, sem acento; e os nomes das subdivisões só
+  em minúsculas (a varredura linear do validador)
+
+Cada grupo de nomes parciais tem um índice de trigramas: a consulta só é
+comparada com os nomes que contêm todos os trigramas dela. Consultas com
+menos de 3 caracteres vão direto ao texto concatenado dos nomes.
+
+O resultado é idêntico ao do search_fuzzy + varredura, em microssegundos.
+"""
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set
+
+try:
+    import pycountry
+    from pycountry import remove_accents
+    PYCOUNTRY_AVAILABLE = True
+except ImportError:
+    PYCOUNTRY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+N = 3
+
+# Não aparece em nomes de lugar: separa os nomes no texto concatenado
+SEPARADOR = "\x00"
+
+
+# ============================================================================
+# BUSCA PARCIAL
+# ============================================================================
+class IndiceTrigramas:
+    """
+    Responde "a consulta está contida em algum dos nomes?"
+    """
+
+    def __init__(self, nomes: Iterable[str]):
+        self._nomes: List[str] = sorted(set(nomes))
+        self._juntos = SEPARADOR.join(self._nomes)
+        self._postings: Dict[str, Set[int]] = {}
+        for indice, nome in enumerate(self._nomes):
+            for i in range(len(nome) - N + 1):
+                self._postings.setdefault(nome[i:i + N], set()).add(indice)
+
+    def __len__(self) -> int:
+        return len(self._nomes)
+
+    def contem(self, consulta: str) -> bool:
+        """True se `consulta` é substring de algum nome"""
+        if SEPARADOR in consulta:
+            return False
+        if len(consulta) < N:
+            # "" está contida em qualquer nome
+            return consulta in self._juntos if self._nomes else False
+
+        # Menores listas primeiro: a interseção encolhe rápido
+        postings = []
+        for i in range(len(consulta) - N + 1):
+            lista = self._postings.get(consulta[i:i + N])
+            if not lista:
+                return False
+            postings.append(lista)
+        postings.sort(key=len)
+
+        candidatos = postings[0]
+        for lista in postings[1:]:
+            candidatos = candidatos & lista
+            if not candidatos:
+                return False
+        return any(consulta in self._nomes[indice] for indice in candidatos)
+
+
+# ============================================================================
+# ÍNDICE
+# ============================================================================
+def _sem_acento(valor: str) -> str:
+    return remove_accents(valor.lower())
+
+
+class IndicePaises:
+    """
+    Mesma decisão do search_fuzzy de países + varredura das subdivisões
+    """
+
+    def __init__(self):
+        campos_paises = ("name", "official_name", "comment")
+
+        # countries.lookup: qualquer campo em minúsculas
+        self._exatos_paises = {
+            valor.lower()
+            for pais in pycountry.countries
+            for valor in pais._fields.values() if isinstance(valor, str)
+        }
+        # Subdivisions.match: qualquer campo sem acento, alternativas separadas por ";"
+        self._exatos_subdivisoes = {
+            alternativa
+            for subdivisao in pycountry.subdivisions
+            for valor in subdivisao._fields.values() if valor is not None
+            for alternativa in _sem_acento(valor).split(";")
+        }
+        # Iniciais dos nomes dos países ("Estados Unidos da América" → "eua")
+        self._iniciais = {
+            _sem_acento("".join(c for c in valor if c.isupper()))
+            for pais in pycountry.countries
+            for valor in (pais._fields.get(campo) for campo in campos_paises) if valor is not None
+        }
+        self._parciais_sem_acento = IndiceTrigramas(
+            [
+                _sem_acento(valor)
+                for pais in pycountry.countries
+                for valor in (pais._fields.get(campo) for campo in campos_paises) if valor is not None
+            ]
+            + [_sem_acento(subdivisao.name) for subdivisao in pycountry.subdivisions]
+        )
+        # Varredura do validador: nomes das subdivisões só em minúsculas
+        self._parciais_subdivisoes = IndiceTrigramas(
+            subdivisao.name.lower() for subdivisao in pycountry.subdivisions
+        )
+
+        logger.info(
+            f"🌍 Índice PyCountry: {len(self._exatos_paises) + len(self._exatos_subdivisoes)} "
+            f"nomes exatos, {len(self._parciais_sem_acento) + len(self._parciais_subdivisoes)} "
+            f"nomes parciais"
+        )
+
+    def contem(self, texto: str) -> bool:
+        """True se `texto` é país ou subdivisão (mesma decisão do LocationValidator)"""
+        consulta = remove_accents(texto.strip().lower())
+        if (consulta.lower() in self._exatos_paises
+                or consulta in self._exatos_subdivisoes
+                or consulta in self._iniciais
+                or self._parciais_sem_acento.contem(consulta)):
+            return True
+        return self._parciais_subdivisoes.contem(texto.lower().strip())
+
+
+@lru_cache(maxsize=None)
+def indice_paises() -> IndicePaises:
+    """Índice único do processo (construído no primeiro uso, antes do fork no server.py)"""
+    return IndicePaises()
@@ -0,0 +1,153 @@
+"""
+Análise em Janelas - textos longos divididos em trechos sobrepostos
+
+Anexos colados em uma manifestação passam do `max_length` do spaCy e, antes
+disso, deixam a latência superlinear (regex amplas de nomes sobre o documento
+inteiro, NER sobre um único Doc gigante).
+
+Textos acima de PRESIDIO_JANELA_CARACTERES são divididos em janelas:
+
+    |<-- sobreposição -->|<======== região própria ========>|<-- sobreposição -->|
+
+- As regiões próprias são disjuntas, cobrem o texto inteiro e terminam em
+  limites de parágrafo ou frase (no meio de uma palavra só se não houver
+  espaço na segunda metade da janela - texto sem espaços, como base64)
+- A borda externa de cada janela procura um espaço a até FOLGA_BORDA
+  caracteres; sem espaço, o corte é seco e a janela nunca passa de
+  tamanho + 2 × (sobreposição + FOLGA_BORDA)
+- Cada janela é analisada com a sobreposição dos dois lados, que dá às
+  regex e ao realce por contexto (palavras antes da entidade) o mesmo
+  entorno da análise em passada única
+- Uma entidade pertence à janela em cuja região própria ela COMEÇA; as
+  detecções nas bordas de outras janelas (possivelmente truncadas) são
+  descartadas e spans repetidos/contidos são mesclados como no AnalyzerEngine
+
+Com sobreposição maior que a maior entidade, o resultado é o mesmo da
+passada única, com custo linear no tamanho do documento.
+
+Configuração por variáveis de ambiente:
+- PRESIDIO_JANELA_CARACTERES: tamanho da região própria (padrão: 20000, 0 desliga)
+- PRESIDIO_JANELA_SOBREPOSICAO: caracteres de contexto de cada lado (padrão: 500)
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import List
+
+from sobreposicoes import remover_duplicatas
+
+TAMANHO_JANELA = int(os.getenv("PRESIDIO_JANELA_CARACTERES", "20000"))
+SOBREPOSICAO_JANELA = int(os.getenv("PRESIDIO_JANELA_SOBREPOSICAO", "500"))
+# Máximo que a borda externa anda procurando um espaço; além disso o corte é seco
+# (texto sem espaços: anexo em base64, URL longa)
+FOLGA_BORDA = 200
+
+# Limites preferidos para cortar regiões próprias, do melhor para o pior
+LIMITES_CORTE = (
+    re.compile(r"\n\s*\n"),        # parágrafo
+    re.compile(r"\n"),             # quebra de linha
+    re.compile(r"[.!?;]\s+"),      # fim de frase
+    re.compile(r"\s+"),            # espaço entre palavras
+)
+
+
+@dataclass
+class Janela:
+    """Trecho do texto analisado isoladamente"""
+    inicio: int          # Início do trecho analisado (com sobreposição)
+    fim: int             # Fim do trecho analisado (com sobreposição)
+    proprio_inicio: int  # Início da região própria (entidades que começam aqui pertencem a esta janela)
+    proprio_fim: int     # Fim da região própria
+
+
+def _ponto_de_corte(texto: str, minimo: int, alvo: int) -> int:
+    """Último limite de parágrafo/frase/palavra em texto[minimo:alvo] (ou alvo)"""
+    for limite in LIMITES_CORTE:
+        ultimo = None
+        for m in limite.finditer(texto, minimo, alvo):
+            ultimo = m
+        if ultimo is not None:
+            return ultimo.end()
+    return alvo
+
+
+def _ajustar_borda(texto: str, posicao: int, para_tras: bool) -> int:
+    """
+    Move a borda externa da janela até um espaço, para não cortar palavras
+
+    Anda no máximo FOLGA_BORDA caracteres: sem espaço nesse intervalo, a borda
+    fica na posição original (senão um texto sem espaços faria cada janela
+    crescer até o texto inteiro)
+    """
+    if para_tras:
+        limite = max(0, posicao - FOLGA_BORDA)
+        ajustada = posicao
+        while ajustada > limite and not texto[ajustada - 1].isspace():
+            ajustada -= 1
+        return ajustada if ajustada == 0 or texto[ajustada - 1].isspace() else posicao
+    limite = min(len(texto), posicao + FOLGA_BORDA)
+    ajustada = posicao
+    while ajustada < limite and not texto[ajustada].isspace():
+        ajustada += 1
+    return ajustada if ajustada == len(texto) or texto[ajustada].isspace() else posicao
+
+
+def dividir_em_janelas(
+    texto: str,
+    tamanho: int = TAMANHO_JANELA,
+    sobreposicao: int = SOBREPOSICAO_JANELA
+) -> List[Janela]:
+    """
+    Divide o texto em janelas sobrepostas
+
+    Returns:
+        Uma única janela cobrindo o texto se ele cabe em `tamanho` (ou tamanho <= 0)
+    """
+    n = len(texto)
+    if tamanho <= 0 or n <= tamanho:
+        return [Janela(0, n, 0, n)]
+
+    janelas = []
+    proprio_inicio = 0
+    while proprio_inicio < n:
+        alvo = proprio_inicio + tamanho
+        if alvo >= n:
+            proprio_fim = n
+        else:
+            # Corte na segunda metade da janela, para as regiões não ficarem minúsculas
+            proprio_fim = _ponto_de_corte(texto, proprio_inicio + tamanho // 2, alvo)
+
+        inicio = _ajustar_borda(texto, max(0, proprio_inicio - sobreposicao), para_tras=True)
+        fim = _ajustar_borda(texto, min(n, proprio_fim + sobreposicao), para_tras=False)
+        janelas.append(Janela(inicio, fim, proprio_inicio, proprio_fim))
+        proprio_inicio = proprio_fim
+
+    return janelas
+
+
+def mesclar_resultados(janelas: List[Janela], resultados_por_janela: List[list]) -> list:
+    """
+    Junta os RecognizerResult das janelas em coordenadas do texto completo
+
+    Args:
+        janelas: Janelas retornadas por dividir_em_janelas
+        resultados_por_janela: Resultados do analyzer para cada janela (offsets locais)
+
+    Returns:
+        Lista de RecognizerResult com offsets globais, sem duplicatas e na
+        mesma ordem da saída do AnalyzerEngine
+    """
+    resultados = []
+    for janela, resultados_janela in zip(janelas, resultados_por_janela):
+        for r in resultados_janela:
+            inicio = r.start + janela.inicio
+            # Detecções que começam na sobreposição pertencem à janela vizinha
+            if not janela.proprio_inicio <= inicio < janela.proprio_fim:
+                continue
+            r.start = inicio
+            r.end = r.end + janela.inicio
+            resultados.append(r)
+
+    # Mesma deduplicação do AnalyzerEngine (span idêntico ou contido, mesmo tipo),
+    # por varredura em vez de todos contra todos (sobreposicoes.py)
+    return remover_duplicatas(resultados)
@@ -0,0 +1,169 @@
+"""
+Léxico Compacto de Nomes (NameDataset exportado e mapeado em memória)
+
+O NameDataset() carrega ~730 mil primeiros nomes e ~980 mil sobrenomes de
+105 países em dicionários Python no import de validators.py: segundos de
+inicialização e centenas de MB por worker. O NameValidator só precisa saber
+se uma palavra é primeiro nome e/ou sobrenome (e, no máximo, a popularidade
+dela no Brasil).
+
+construir_lexico_nomes.py exporta esse subconjunto uma vez, offline, para um
+arquivo binário; aqui ele é aberto com mmap:
+
+    cabeçalho  "LXN1", quantidade de nomes (uint32)
+    offsets    uint32[n + 1] - início de cada nome no bloco de texto
+    flags      uint8[n]      - PRIMEIRO_NOME | SOBRENOME
+    ranks      uint32[n]     - posição no ranking do Brasil (0 = fora do ranking)
+    texto      nomes em UTF-8, ordenados por bytes, concatenados
+
+A busca é binária sobre os offsets (~21 comparações de bytes), sem montar
+nenhuma estrutura Python: abrir o arquivo custa milissegundos e as páginas
+ficam no page cache, compartilhadas por todos os workers (server.py).
+
+LexicoCompacto.search() devolve o mesmo formato do NameDataset.search(), e o
+NameValidator usa um ou outro sem mudar nenhum veredito.
+
+Configuração por variável de ambiente:
+- PRESIDIO_LEXICO_NOMES: caminho do arquivo (padrão: dados/lexico_nomes.bin);
+  sem o arquivo, validators.py volta a carregar o NameDataset
+"""
+import logging
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "lexico_nomes.bin")
+CAMINHO_LEXICO = os.getenv("PRESIDIO_LEXICO_NOMES", CAMINHO_PADRAO)
+
+MAGICO = b"LXN1"
+CABECALHO = struct.Struct("<4sI")
+
+PRIMEIRO_NOME = 1
+SOBRENOME = 2
+
+# Nome do país nas chaves de 'rank', como no NameDataset.search()
+PAIS = "Brazil"
+
+
+# ============================================================================
+# ESCRITA (usada por construir_lexico_nomes.py)
+# ============================================================================
+def gravar_lexico(caminho: str, nomes: Iterable[Tuple[str, int, int]]) -> int:
+    """
+    Grava o arquivo do léxico
+
+    Args:
+        caminho: Arquivo de saída
+        nomes: (nome, flags, rank) - nomes repetidos têm as flags combinadas
+               e o menor rank não nulo
+
+    Returns:
+        Quantidade de nomes gravados
+    """
+    combinados: Dict[bytes, Tuple[int, int]] = {}
+    for nome, flags, rank in nomes:
+        chave = nome.encode("utf-8")
+        flags_atuais, rank_atual = combinados.get(chave, (0, 0))
+        if rank and (not rank_atual or rank < rank_atual):
+            rank_atual = rank
+        combinados[chave] = (flags_atuais | flags, rank_atual)
+
+    chaves = sorted(combinados)
+    offsets = [0]
+    for chave in chaves:
+        offsets.append(offsets[-1] + len(chave))
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as f:
+        f.write(CABECALHO.pack(MAGICO, len(chaves)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(bytes(combinados[chave][0] for chave in chaves))
+        f.write(struct.pack(f"<{len(chaves)}I", *(combinados[chave][1] for chave in chaves)))
+        for chave in chaves:
+            f.write(chave)
+    # Troca atômica: workers que já mapearam o arquivo antigo não são afetados
+    os.replace(temporario, caminho)
+    return len(chaves)
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+class LexicoCompacto:
+    """
+    Primeiros nomes e sobrenomes do NameDataset, em um arquivo mapeado em memória
+    """
+
+    def __init__(self, caminho: str = CAMINHO_LEXICO):
+        with open(caminho, "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magico, self._n = CABECALHO.unpack_from(self._mapa, 0)
+        if magico != MAGICO:
+            raise ValueError(f"{caminho} não é um léxico de nomes ({magico!r})")
+
+        visao = memoryview(self._mapa)
+        inicio = CABECALHO.size
+        fim = inicio + 4 * (self._n + 1)
+        self._offsets = visao[inicio:fim].cast("I")
+        self._flags = visao[fim:fim + self._n]
+        inicio, fim = fim + self._n, fim + self._n + 4 * self._n
+        self._ranks = visao[inicio:fim].cast("I")
+        self._texto = fim
+
+        if len(self._mapa) != self._texto + self._offsets[self._n]:
+            raise ValueError(f"{caminho} truncado ou corrompido")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _indice(self, nome: str) -> Optional[int]:
+        chave = nome.encode("utf-8")
+        mapa, offsets, base = self._mapa, self._offsets, self._texto
+        baixo, alto = 0, self._n
+        while baixo < alto:
+            meio = (baixo + alto) // 2
+            atual = mapa[base + offsets[meio]:base + offsets[meio + 1]]
+            if atual < chave:
+                baixo = meio + 1
+            elif atual > chave:
+                alto = meio
+            else:
+                return meio
+        return None
+
+    def flags(self, nome: str) -> int:
+        """PRIMEIRO_NOME | SOBRENOME do nome (chave como no NameDataset: Title Case)"""
+        indice = self._indice(nome.strip().title())
+        return 0 if indice is None else self._flags[indice]
+
+    def search(self, nome: str) -> dict:
+        """Mesmo formato do NameDataset.search(): {'first_name': ..., 'last_name': ...}"""
+        indice = self._indice(nome.strip().title())
+        if indice is None:
+            return {"first_name": None, "last_name": None}
+
+        rank = self._ranks[indice]
+        info = {"country": {}, "gender": {}, "rank": {PAIS: rank} if rank else {}}
+        flags = self._flags[indice]
+        return {
+            "first_name": info if flags & PRIMEIRO_NOME else None,
+            "last_name": info if flags & SOBRENOME else None,
+        }
+
+
+def carregar_lexico(caminho: str = CAMINHO_LEXICO) -> Optional[LexicoCompacto]:
+    """Abre o léxico se o arquivo existir (None caso contrário)"""
+    if not os.path.exists(caminho):
+        return None
+    try:
+        lexico = LexicoCompacto(caminho)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Erro ao abrir o léxico de nomes {caminho}: {e}")
+        return None
+    logger.info(f"📚 Léxico de nomes mapeado: {len(lexico)} nomes ({caminho})")
+    return lexico
@@ -0,0 +1,133 @@
+"""
+Localidades Brasileiras Offline (municípios IBGE + Regiões Administrativas do DF)
+
+O LocationValidator criava um geocodificador Nominatim, mas a consulta ficou
+desligada (latência de rede por candidato); sem ela, só ~65 cidades e os
+estados eram reconhecidos. As manifestações da Ouvidoria do DF citam
+sobretudo as Regiões Administrativas (Ceilândia, Taguatinga, Sobradinho II)
+e bairros/setores (Asa Norte, Noroeste), que nenhuma das listas tinha.
+
+As Localidades juntam, em um único conjunto de nomes normalizados
+(minúsculas, sem acento, espaços simples - a mesma normalização dos
+dicionários), com consulta em tempo constante:
+
+- As 35 Regiões Administrativas do DF e nomes alternativos delas
+- Bairros e setores conhecidos do DF
+- Os municípios, de dados/municipios.tsv (versionado; gerado offline por
+  construir_localidades.py). O arquivo do repositório vem da geodata do
+  phonenumbers (~5.580 municípios e distritos, sem código IBGE); o JSON da
+  API de localidades do IBGE gera a lista oficial de 5.570 municípios. Sem o
+  arquivo, o serviço avisa no startup e fica só com as listas do DF
+
+O armazenamento é um dict de nomes normalizados (~5.300 chaves, poucas
+centenas de KB): consulta O(1) por hash. Uma trie compacta ou hash perfeito
+só economizaria memória, que nesse tamanho não pesa.
+
+Configuração por variável de ambiente:
+- PRESIDIO_MUNICIPIOS: caminho do arquivo de municípios (padrão: dados/municipios.tsv)
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from reconhecedor_dicionario import normalizar
+
+logger = logging.getLogger(__name__)
+
+CAMINHO_MUNICIPIOS = os.getenv(
+    "PRESIDIO_MUNICIPIOS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "municipios.tsv"),
+)
+
+# Tipos de localidade
+MUNICIPIO = "municipio"
+REGIAO_ADMINISTRATIVA = "regiao_administrativa"
+BAIRRO = "bairro"
+
+# As 35 Regiões Administrativas do DF (Arapoanga e Água Quente criadas em 2022) e nomes alternativos
+REGIOES_ADMINISTRATIVAS_DF = [
+    "Plano Piloto", "Gama", "Taguatinga", "Brazlândia", "Sobradinho", "Planaltina",
+    "Paranoá", "Núcleo Bandeirante", "Ceilândia", "Guará", "Cruzeiro", "Samambaia",
+    "Santa Maria", "São Sebastião", "Recanto das Emas", "Lago Sul", "Riacho Fundo",
+    "Lago Norte", "Candangolândia", "Águas Claras", "Riacho Fundo II",
+    "Sudoeste/Octogonal", "Sudoeste", "Octogonal", "Varjão", "Park Way",
+    "SCIA/Estrutural", "Vila Estrutural", "Sobradinho II", "Jardim Botânico",
+    "Itapoã", "SIA", "Vicente Pires", "Fercal", "Sol Nascente/Pôr do Sol",
+    "Sol Nascente", "Pôr do Sol", "Arniqueira", "Arapoanga", "Água Quente",
+]
+
+# Bairros e setores do DF frequentes nas manifestações
+BAIRROS_DF = [
+    "Asa Norte", "Asa Sul", "Noroeste", "Vila Planalto", "Granja do Torto",
+    "Setor Militar Urbano", "Esplanada dos Ministérios", "Vila Telebrasília",
+    "Taguatinga Norte", "Taguatinga Sul", "Taguatinga Centro", "Ceilândia Norte",
+    "Ceilândia Sul", "Ceilândia Centro", "Setor O", "Guará I", "Guará II",
+    "Cruzeiro Velho", "Cruzeiro Novo", "Lago Oeste", "Jardins Mangueiral",
+    "Setor de Mansões Park Way", "Setor Habitacional Vicente Pires",
+    "Setor Habitacional Arniqueira", "Setor Habitacional Tororó", "Taquari",
+    "Altiplano Leste", "Grande Colorado", "Vila São José", "Vila Buritis",
+    "Estância Mestre D'Armas", "Vale do Amanhecer", "Areal",
+    "Colônia Agrícola Samambaia", "Setor Leste", "Setor Oeste", "Setor Sul",
+    "Setor Norte", "Setor Central", "Riacho Fundo I",
+    "Setor Comercial Sul", "Setor Comercial Norte", "Setor Bancário Sul",
+    "Setor Bancário Norte", "Setor Hoteleiro Sul", "Setor Hoteleiro Norte",
+    "Setor de Autarquias Sul", "Setor de Autarquias Norte",
+]
+
+
+def chave(nome: str) -> str:
+    """Nome normalizado: minúsculas, sem acento, espaços simples"""
+    return " ".join(normalizar(nome).split())
+
+
+class Localidades:
+    """
+    Nome normalizado → tipo de localidade (município, RA do DF, bairro)
+    """
+
+    def __init__(self, caminho_municipios: Optional[str] = CAMINHO_MUNICIPIOS):
+        self._tipos: Dict[str, str] = {}
+        self.municipios = 0
+        if caminho_municipios and os.path.exists(caminho_municipios):
+            self.municipios = self._adicionar(ler_municipios(caminho_municipios), MUNICIPIO)
+        else:
+            logger.warning(f"⚠️ Arquivo de municípios ausente ({caminho_municipios}) - "
+                           f"só RAs e bairros do DF; gere com construir_localidades.py")
+        # Depois dos municípios: "Gama" e "Santa Maria" são RAs no DF
+        self._adicionar(BAIRROS_DF, BAIRRO)
+        self._adicionar(REGIOES_ADMINISTRATIVAS_DF, REGIAO_ADMINISTRATIVA)
+
+        logger.info(f"📍 Localidades: {len(self._tipos)} nomes ({self.municipios} municípios IBGE)")
+
+    def _adicionar(self, nomes: Iterable[str], tipo: str) -> int:
+        quantidade = 0
+        for nome in nomes:
+            self._tipos[chave(nome)] = tipo
+            quantidade += 1
+        return quantidade
+
+    def __len__(self) -> int:
+        return len(self._tipos)
+
+    def tipo(self, texto: str) -> Optional[str]:
+        """Tipo da localidade de `texto` (None se desconhecida)"""
+        return self._tipos.get(chave(texto))
+
+    def contem(self, texto: str) -> bool:
+        return chave(texto) in self._tipos
+
+
+def ler_municipios(caminho: str) -> Iterable[str]:
+    """Nomes do arquivo de municípios (TSV: nome, UF, código IBGE)"""
+    with open(caminho, encoding="utf-8") as f:
+        for linha in f:
+            nome = linha.split("\t", 1)[0].strip()
+            if nome and not nome.startswith("#"):
+                yield nome
+
+
+@lru_cache(maxsize=None)
+def localidades() -> Localidades:
+    """Localidades únicas do processo (carregadas no primeiro uso, antes do fork no server.py)"""
+    return Localidades()
@@ -0,0 +1,262 @@
+"""
+Malha Numérica - colisões entre identificadores numéricos resolvidas de uma vez
+
+Os reconhecedores de CPF, CNPJ, RG, CEP, telefone, CNS, PIS, Título de
+Eleitor e RENAVAM varrem as mesmas sequências de dígitos, cada um com a sua
+regex: um número de 8 dígitos vira CEP e RG, um de 11 dígitos vira CPF e
+telefone. Até aqui só a colisão CPF × telefone era resolvida no filtro; as
+demais chegavam à resposta em dobro (a anonimização mascarava só uma).
+
+A malha:
+1. Tokeniza o texto uma vez em grupos de dígitos ligados por separadores
+   curtos (. - / espaço parênteses), guardando o offset de cada grupo
+2. Classifica cada sequência contígua de grupos por tamanho, formato
+   (máscara ###.###.###-##) e dígito verificador em tipos candidatos:
+   - NIVEL_FORTE: máscara exclusiva do tipo ou dígito verificador válido
+   - NIVEL_PLAUSIVEL: estrutura compatível (DDD válido, 9 do celular)
+   - NIVEL_TAMANHO: só o número de dígitos é compatível
+3. Resolve de uma vez as colisões entre TODOS os resultados numéricos que
+   se sobrepõem: fica o span mais longo (o contido é descartado); no mesmo
+   span, o maior score - a escolha da anonimização, então o texto tarjado
+   não muda - e só no empate de score o melhor nível da malha e por fim
+   PRIORIDADE_TIPOS
+
+A malha não conduz a detecção: roda depois dos filtros, sobre os resultados
+que os reconhecedores numéricos já produziram, e não economiza as varreduras
+deles. Alimentar os reconhecedores com os candidatos da malha antes do
+analyze() exigiria reproduzir aqui o que cada PatternRecognizer faz com o
+match (palavras de contexto e realce de score, validate_result, modo
+estrito), e o score mudaria. O custo das varreduras é tratado onde elas
+acontecem: varredura.py faz uma passada por regex repetida entre padrões
+(cpf_without_dots e phone_only_digits_11) e prefiltro.py pula os
+reconhecedores numéricos em textos sem dígitos.
+
+Aqui o dígito verificador (digitos_verificadores.py) só desempata os
+candidatos - não rejeita resultados (os documentos de teste não têm dígitos
+verificadores válidos); a rejeição é o modo estrito dos reconhecedores.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from brazilian_recognizers import BrazilPhoneRecognizer
+from digitos_verificadores import (
+    cnh_valido, cnpj_valido, cns_valido, cpf_valido, pis_valido, renavam_valido, titulo_valido,
+)
+
+ENTIDADES_NUMERICAS = frozenset({
+    "BR_CPF", "BR_CNPJ", "BR_RG", "BR_CEP", "BR_PHONE", "BR_CNS",
+    "BR_PIS_PASEP", "BR_VOTER_ID", "BR_RENAVAM", "BR_DRIVER_LICENSE",
+})
+
+# Desempate final (mesmo span, mesmo score, mesmo nível): CPF > PHONE, CEP > RG...
+PRIORIDADE_TIPOS = {
+    tipo: i for i, tipo in enumerate((
+        "BR_CPF", "BR_CNPJ", "BR_CNS", "BR_PIS_PASEP", "BR_VOTER_ID",
+        "BR_RENAVAM", "BR_DRIVER_LICENSE", "BR_PHONE", "BR_CEP", "BR_RG",
+    ))
+}
+
+NIVEL_FORTE = 0
+NIVEL_PLAUSIVEL = 1
+NIVEL_TAMANHO = 2
+NIVEL_DESCONHECIDO = 3  # Span/tipo que a malha não conhece (ex.: "telefone 45 3578-6249")
+
+# Limites da enumeração de sequências dentro de um token
+MAX_GRUPOS = 5
+MAX_DIGITOS = 15
+
+GRUPO_DIGITOS = re.compile(r"\d+")
+# Separador que liga dois grupos do mesmo número: "." "-" "/" " " ") " " - "
+SEPARADOR = re.compile(r"[.\-/]|\)?\s?|\s-\s")
+
+_PARA_MASCARA = str.maketrans("0123456789", "##########")
+
+# Máscaras exclusivas de um tipo (dígitos → #)
+MASCARAS = {
+    "###.###.###-##": "BR_CPF",
+    "##.###.###/####-##": "BR_CNPJ",
+    "#####-###": "BR_CEP",
+    "##.###.###-#": "BR_RG",
+    "###.#####.##-#": "BR_PIS_PASEP",
+    "(##) ####-####": "BR_PHONE",
+    "(##) #####-####": "BR_PHONE",
+    "(##)####-####": "BR_PHONE",
+    "(##)#####-####": "BR_PHONE",
+    "(##) ########": "BR_PHONE",
+    "(##) #########": "BR_PHONE",
+    "(##)#########": "BR_PHONE",
+    "## ####-####": "BR_PHONE",
+    "## #####-####": "BR_PHONE",
+    "##-####-####": "BR_PHONE",
+}
+
+VALID_DDDS = BrazilPhoneRecognizer.VALID_DDDS
+
+
+# ============================================================================
+# CLASSIFICAÇÃO
+# ============================================================================
+def classificar(digitos: str, mascara: str) -> List[Tuple[str, int]]:
+    """
+    Tipos candidatos de uma sequência de dígitos, do mais provável ao menos
+
+    Args:
+        digitos: Só os dígitos ("10100080073")
+        mascara: Texto com dígitos trocados por # ("###.###.###-##")
+
+    Returns:
+        [(tipo, nível)] ordenados por nível e PRIORIDADE_TIPOS
+    """
+    candidatos = []
+    tipo = MASCARAS.get(mascara)
+    if tipo:
+        candidatos.append((tipo, NIVEL_FORTE))
+    elif set(mascara) == {"#"}:
+        n = len(digitos)
+        if n in (7, 9):
+            candidatos.append(("BR_RG", NIVEL_TAMANHO))
+        elif n == 8:
+            candidatos += [("BR_CEP", NIVEL_TAMANHO), ("BR_RG", NIVEL_TAMANHO)]
+        elif n == 10:
+            candidatos.append(("BR_PHONE", NIVEL_PLAUSIVEL if digitos[:2] in VALID_DDDS else NIVEL_TAMANHO))
+        elif n == 11:
+            candidatos.append(("BR_CPF", NIVEL_FORTE if cpf_valido(digitos) else NIVEL_TAMANHO))
+            celular = digitos[:2] in VALID_DDDS and digitos[2] == "9"
+            candidatos.append(("BR_PHONE", NIVEL_PLAUSIVEL if celular else NIVEL_TAMANHO))
+            if pis_valido(digitos):
+                candidatos.append(("BR_PIS_PASEP", NIVEL_FORTE))
+            if renavam_valido(digitos):
+                candidatos.append(("BR_RENAVAM", NIVEL_FORTE))
+            if cnh_valido(digitos):
+                candidatos.append(("BR_DRIVER_LICENSE", NIVEL_FORTE))
+        elif n == 12:
+            candidatos.append(("BR_VOTER_ID", NIVEL_FORTE if titulo_valido(digitos) else NIVEL_TAMANHO))
+        elif n == 14:
+            candidatos.append(("BR_CNPJ", NIVEL_FORTE if cnpj_valido(digitos) else NIVEL_TAMANHO))
+        elif n == 15:
+            candidatos.append(("BR_CNS", NIVEL_FORTE if cns_valido(digitos) else NIVEL_TAMANHO))
+
+    candidatos.sort(key=lambda c: (c[1], PRIORIDADE_TIPOS[c[0]]))
+    return candidatos
+
+
+@dataclass
+class TokenNumerico:
+    """Grupos de dígitos ligados por separadores curtos"""
+    inicio: int
+    fim: int
+    grupos: List[Tuple[int, int]] = field(default_factory=list)  # (início, fim) de cada grupo
+
+
+class MalhaNumerica:
+    """
+    Tokens numéricos de um texto e os tipos candidatos de cada sequência
+    contígua de grupos, indexados pelo span (início, fim) no texto
+    """
+
+    def __init__(self, texto: str):
+        self.texto = texto
+        self.tokens: List[TokenNumerico] = []
+        self.candidatos: Dict[Tuple[int, int], List[Tuple[str, int]]] = {}
+
+        anterior = None
+        for m in GRUPO_DIGITOS.finditer(texto):
+            if anterior is not None and SEPARADOR.fullmatch(texto, anterior.grupos[-1][1], m.start()):
+                anterior.grupos.append(m.span())
+                anterior.fim = m.end()
+            else:
+                anterior = TokenNumerico(m.start(), m.end(), [m.span()])
+                self.tokens.append(anterior)
+
+        for token in self.tokens:
+            self._classificar_token(token)
+
+    def _classificar_token(self, token: TokenNumerico) -> None:
+        texto = self.texto
+        grupos = token.grupos
+        for i, (inicio, _) in enumerate(grupos):
+            # "(61) 3333-4444": o span do telefone começa no parêntese
+            if inicio > 0 and texto[inicio - 1] == "(":
+                inicio -= 1
+            digitos = ""
+            for j in range(i, min(len(grupos), i + MAX_GRUPOS)):
+                digitos += texto[grupos[j][0]:grupos[j][1]]
+                if len(digitos) > MAX_DIGITOS:
+                    break
+                fim = grupos[j][1]
+                candidatos = classificar(digitos, texto[inicio:fim].translate(_PARA_MASCARA))
+                if candidatos:
+                    self.candidatos[(inicio, fim)] = candidatos
+
+    def nivel(self, tipo: str, inicio: int, fim: int) -> int:
+        """Nível do tipo para o span (recortado até os dígitos) ou NIVEL_DESCONHECIDO"""
+        texto = self.texto
+        # Resultados com palavra-chave no span ("telefone 45 3578-6249", "CNH: ...")
+        while inicio < fim and not texto[inicio].isdigit() and not (
+            texto[inicio] == "(" and inicio + 1 < fim and texto[inicio + 1].isdigit()
+        ):
+            inicio += 1
+        while fim > inicio and not texto[fim - 1].isdigit():
+            fim -= 1
+
+        for candidato, nivel in self.candidatos.get((inicio, fim), ()):
+            if candidato == tipo:
+                return nivel
+        return NIVEL_DESCONHECIDO
+
+
+# ============================================================================
+# RESOLUÇÃO DE COLISÕES
+# ============================================================================
+def resolver_colisoes(texto: str, results: list) -> list:
+    """
+    Mantém um único resultado numérico por região do texto
+
+    Resultados numéricos que se sobrepõem formam um grupo; dentro dele são
+    percorridos por (span mais longo, maior score, nível na malha,
+    PRIORIDADE_TIPOS) e cada um é descartado se estiver contido em um já
+    escolhido - a mesma regra da anonimização (contido sai; no mesmo span
+    fica o maior score), então o texto tarjado não muda. A malha só decide
+    o empate de score, que a anonimização resolveria pela ordem da lista.
+    Sobreposições parciais ficam. Resultados não numéricos passam intactos.
+    """
+    numericos = [r for r in results if r.entity_type in ENTIDADES_NUMERICAS]
+    if len(numericos) < 2:
+        return results
+
+    malha = MalhaNumerica(texto)
+
+    def prioridade(r):
+        return (
+            -(r.end - r.start),
+            -r.score,
+            malha.nivel(r.entity_type, r.start, r.end),
+            PRIORIDADE_TIPOS.get(r.entity_type, len(PRIORIDADE_TIPOS)),
+        )
+
+    descartados = set()
+
+    def resolver_grupo(grupo):
+        escolhidos = []
+        for r in sorted(grupo, key=prioridade):
+            if any(e.start <= r.start and r.end <= e.end for e in escolhidos):
+                descartados.add(id(r))
+            else:
+                escolhidos.append(r)
+
+    # Varredura por início: um grupo termina quando o próximo resultado
+    # começa depois do fim de todos os resultados do grupo
+    grupo = []
+    fim_grupo = -1
+    for r in sorted(numericos, key=lambda r: (r.start, -r.end)):
+        if r.start >= fim_grupo:
+            if len(grupo) > 1:
+                resolver_grupo(grupo)
+            grupo = []
+        grupo.append(r)
+        fim_grupo = max(fim_grupo, r.end)
+    if len(grupo) > 1:
+        resolver_grupo(grupo)
+
+    return [r for r in results if id(r) not in descartados]
@@ -0,0 +1,201 @@
+"""
+Métricas do Pipeline - tempo por etapa, histogramas Prometheus e Server-Timing
+
+Etapas medidas em cada requisição:
+- nlp: pipeline spaCy (ou só o tokenizador no caminho só-regex)
+- reconhecedores: PatternRecognizers + deduplicação do Presidio
+- contexto: realce de score por palavras de contexto
+- filtros: blacklist global + PersonLocationFilter + ORGANIZATION + colisões numéricas
+- anonimizacao: anonymizer.anonymize + montagem das entidades
+- serializacao: modelo de resposta + JSON (medida na API)
+
+O pipeline roda no executor (thread ou processo): as etapas são acumuladas em
+um Cronometro ativo na thread do worker e devolvidas junto com o resultado.
+A API registra os tempos nos histogramas (GET /api/metrics, formato texto do
+Prometheus) e no header Server-Timing da resposta.
+
+Os tempos são exclusivos: uma etapa aninhada (contexto dentro de
+reconhecedores) é descontada da etapa externa, então a soma das etapas não
+conta nada duas vezes.
+
+No modo pre-fork (server.py) cada worker tem seus próprios contadores - o
+Prometheus vê o worker que atendeu o scrape.
+"""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Limites dos buckets dos histogramas (segundos)
+BUCKETS_SEGUNDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Faixas de tamanho do texto (caracteres) usadas como label dos histogramas
+FAIXAS_TAMANHO = (
+    (1_000, "ate_1k"),
+    (10_000, "1k_10k"),
+    (50_000, "10k_50k"),
+    (200_000, "50k_200k"),
+)
+FAIXA_MAIOR = "acima_200k"
+
+
+# ============================================================================
+# CRONÔMETRO POR REQUISIÇÃO
+# ============================================================================
+class Cronometro:
+    """Acumula o tempo exclusivo de cada etapa de uma requisição"""
+
+    def __init__(self):
+        self.tempos: Dict[str, float] = {}
+        # (reconhecedor, padrão) → [tempo, matches, validados, sobreviventes] - ver custo_reconhecedores.py
+        self.custos: Dict[Tuple[str, str], List[float]] = {}
+        # Tempo já gasto em etapas filhas de cada etapa aberta
+        self._pilha: List[float] = []
+
+    def contar(self, reconhecedor: str, padrao: str, tempo: float = 0.0,
+               matches: int = 0, validados: int = 0, sobreviventes: int = 0) -> None:
+        """Acumula custo/rendimento de um reconhecedor (ou de um padrão dele)"""
+        custo = self.custos.get((reconhecedor, padrao))
+        if custo is None:
+            custo = self.custos[(reconhecedor, padrao)] = [0.0, 0, 0, 0]
+        custo[0] += tempo
+        custo[1] += matches
+        custo[2] += validados
+        custo[3] += sobreviventes
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        inicio = time.perf_counter()
+        self._pilha.append(0.0)
+        try:
+            yield
+        finally:
+            filhas = self._pilha.pop()
+            duracao = time.perf_counter() - inicio
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + duracao - filhas
+            if self._pilha:
+                self._pilha[-1] += duracao
+
+
+class _CronometroNulo:
+    """Usado fora de uma medição (scripts, chamadas diretas do pipeline)"""
+    tempos: Dict[str, float] = {}
+    custos: Dict[Tuple[str, str], List[float]] = {}
+
+    def etapa(self, nome: str):
+        return nullcontext()
+
+    def contar(self, *args, **kwargs) -> None:
+        pass
+
+
+_CRONOMETRO_NULO = _CronometroNulo()
+_local = threading.local()
+
+
+def cronometro_atual():
+    """Cronômetro da requisição em andamento nesta thread (ou um nulo)"""
+    return getattr(_local, "cronometro", None) or _CRONOMETRO_NULO
+
+
+@contextmanager
+def medir() -> Iterator[Cronometro]:
+    """Ativa um Cronometro nesta thread enquanto o bloco executa"""
+    anterior = getattr(_local, "cronometro", None)
+    cronometro = Cronometro()
+    _local.cronometro = cronometro
+    try:
+        yield cronometro
+    finally:
+        _local.cronometro = anterior
+
+
+def header_server_timing(tempos: Dict[str, float]) -> str:
+    """Formata tempos (segundos) para o header Server-Timing (duração em ms)"""
+    return ", ".join(f"{etapa};dur={segundos * 1000:.2f}" for etapa, segundos in tempos.items())
+
+
+# ============================================================================
+# HISTOGRAMAS (EXPOSIÇÃO PROMETHEUS)
+# ============================================================================
+def faixa_tamanho(caracteres: int) -> str:
+    for limite, nome in FAIXAS_TAMANHO:
+        if caracteres <= limite:
+            return nome
+    return FAIXA_MAIOR
+
+
+class _Histograma:
+    __slots__ = ("contagens", "soma", "total")
+
+    def __init__(self):
+        self.contagens = [0] * len(BUCKETS_SEGUNDOS)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        for i, limite in enumerate(BUCKETS_SEGUNDOS):
+            if valor <= limite:
+                self.contagens[i] += 1
+                break
+        self.soma += valor
+        self.total += 1
+
+
+class RegistroMetricas:
+    """
+    Histogramas de latência por (endpoint, etapa, faixa de tamanho) e
+    contador de requisições por (endpoint, cache)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histogramas: Dict[Tuple[str, str, str], _Histograma] = {}
+        self._requisicoes: Dict[Tuple[str, str], int] = {}
+
+    def observar(self, endpoint: str, caracteres: int, tempos: Dict[str, float],
+                 cache: str = "miss") -> None:
+        """Registra os tempos (segundos) das etapas de uma requisição"""
+        faixa = faixa_tamanho(caracteres)
+        with self._lock:
+            chave_req = (endpoint, cache)
+            self._requisicoes[chave_req] = self._requisicoes.get(chave_req, 0) + 1
+            for etapa, segundos in tempos.items():
+                chave = (endpoint, etapa, faixa)
+                histograma = self._histogramas.get(chave)
+                if histograma is None:
+                    histograma = self._histogramas[chave] = _Histograma()
+                histograma.observar(segundos)
+
+    def exposicao(self, extras: Optional[Dict[str, float]] = None) -> str:
+        """
+        Texto no formato de exposição do Prometheus (text/plain; version=0.0.4)
+
+        Args:
+            extras: Gauges adicionais {nome_metrica: valor} (cache, executor...)
+        """
+        linhas = [
+            "# HELP presidio_etapa_segundos Tempo de cada etapa do pipeline por faixa de tamanho do texto",
+            "# TYPE presidio_etapa_segundos histogram",
+        ]
+        with self._lock:
+            for (endpoint, etapa, faixa), h in sorted(self._histogramas.items()):
+                labels = f'endpoint="{endpoint}",etapa="{etapa}",tamanho="{faixa}"'
+                acumulado = 0
+                for limite, contagem in zip(BUCKETS_SEGUNDOS, h.contagens):
+                    acumulado += contagem
+                    linhas.append(f'presidio_etapa_segundos_bucket{{{labels},le="{limite}"}} {acumulado}')
+                linhas.append(f'presidio_etapa_segundos_bucket{{{labels},le="+Inf"}} {h.total}')
+                linhas.append(f"presidio_etapa_segundos_sum{{{labels}}} {h.soma:.6f}")
+                linhas.append(f"presidio_etapa_segundos_count{{{labels}}} {h.total}")
+
+            linhas.append("# HELP presidio_requisicoes_total Requisições processadas")
+            linhas.append("# TYPE presidio_requisicoes_total counter")
+            for (endpoint, cache), total in sorted(self._requisicoes.items()):
+                linhas.append(f'presidio_requisicoes_total{{endpoint="{endpoint}",cache="{cache}"}} {total}')
+
+        for nome, valor in (extras or {}).items():
+            linhas.append(f"# TYPE {nome} gauge")
+            linhas.append(f"{nome} {valor}")
+
+        return "\n".join(linhas) + "\n"
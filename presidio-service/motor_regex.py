@@ -0,0 +1,230 @@
+"""
+Motor de Regex dos Reconhecedores - orçamento de tempo e RE2 opcional
+
+Os padrões de nomes têm repetições aninhadas que, em certos textos, custam
+muito mais que uma passada linear. O pior caso medido
+(benchmark_regex_adversarial.py) é o `brazilian_name_full` do
+BrazilNameRecognizer: com `(?i)` o trecho `(?:[A-Z][a-z]+\\s+)*` aceita
+qualquer palavra, e cada primeiro nome sem sobrenome depois percorre o resto
+do texto. Isso é quadrático: 5 mil caracteres custam ~0,26 s e 20 mil ~4 s.
+
+Cada padrão é compilado em uma RegexProtegida:
+
+- Orçamento por busca: o `timeout` do módulo `regex` é um prazo único para
+  todo o finditer, contando também o tempo do consumidor entre os matches
+  (a validação de cada match no PatternRecognizer). Para valer por busca, um
+  estouro depois de algum match reinicia o finditer do último match com
+  prazo novo; só o estouro sem nenhum match desde o (re)início conta
+- Nesse caso, o padrão e o tamanho do texto são registrados no log (sem o
+  conteúdo) e a varredura continua no `regex` em trechos de
+  PRESIDIO_REGEX_TRECHO caracteres (mais uma folga para o match que cruza o
+  fim do trecho): o retrocesso fica limitado ao trecho, e o PII depois do
+  ponto de estouro continua sendo encontrado. A retomada nunca usa o RE2,
+  mesmo instalado: com `\b`/`\w` só ASCII ele muda o resultado justamente nos
+  padrões de nomes acentuados, que são os que estouram
+- Um trecho que ainda assim estoura o orçamento é pulado e a análise é
+  marcada como incompleta (registrar_incompletos): a resposta sai com
+  `analiseIncompleta: true` e os padrões afetados, e não vai para o cache -
+  quem chama não deve tratá-la como totalmente anonimizada
+- RE2 (google-re2, opcional): motor de tempo linear. Não aceita lookarounds
+  nem backreferences; esses padrões ficam sempre no `regex`. Atenção: no
+  RE2, `\\b`, `\\w`, `\\d` e `\\s` são só ASCII. "\\bJo\\b" casa dentro de
+  "João", então o resultado pode diferir do `regex` em palavras acentuadas.
+  Por isso o RE2 só é o motor principal se configurado
+
+Configuração por variáveis de ambiente:
+- PRESIDIO_MOTOR_REGEX: regex (padrão) ou re2 (RE2 em todos os padrões compatíveis)
+- PRESIDIO_REGEX_ORCAMENTO_MS: tempo máximo de cada busca de um padrão (padrão: 500, 0 desliga)
+- PRESIDIO_REGEX_TRECHO: caracteres por trecho na retomada após estouro (padrão: 2000)
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import regex
+from presidio_analyzer import PatternRecognizer
+
+try:
+    import re2
+    # Padrão não aceito (lookbehind...) é esperado: sem log do RE2 no stderr
+    _OPCOES_RE2 = re2.Options()
+    _OPCOES_RE2.log_errors = False
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MOTOR_REGEX = os.getenv("PRESIDIO_MOTOR_REGEX", "regex")
+ORCAMENTO_SEGUNDOS = float(os.getenv("PRESIDIO_REGEX_ORCAMENTO_MS", "500")) / 1000
+TRECHO_RETOMADA = int(os.getenv("PRESIDIO_REGEX_TRECHO", "2000"))
+# Além do trecho, para o match que começa nele e termina depois (nomes, documentos)
+FOLGA_RETOMADA = 300
+
+# Flags do `regex` que o RE2 aceita como flag inline
+_FLAGS_INLINE = ((regex.IGNORECASE, "i"), (regex.MULTILINE, "m"), (regex.DOTALL, "s"))
+
+
+# ============================================================================
+# VARREDURAS INCOMPLETAS
+# ============================================================================
+_local = threading.local()
+
+
+class VarreduraIncompleta:
+    """Trecho de um texto que um padrão não conseguiu varrer no orçamento"""
+
+    def __init__(self, padrao: str, texto: str, inicio: int, fim: int):
+        self.padrao = padrao
+        self.texto = texto
+        self.inicio = inicio
+        self.fim = fim
+
+
+@contextmanager
+def registrar_incompletos() -> Iterator[List[VarreduraIncompleta]]:
+    """Coleta, nesta thread, os trechos pulados por estouro de orçamento enquanto o bloco executa"""
+    anterior = getattr(_local, "incompletos", None)
+    incompletos: List[VarreduraIncompleta] = []
+    _local.incompletos = incompletos
+    try:
+        yield incompletos
+    finally:
+        _local.incompletos = anterior
+
+
+def _marcar_incompleto(padrao: str, texto: str, inicio: int, fim: int) -> None:
+    incompletos = getattr(_local, "incompletos", None)
+    if incompletos is not None:
+        incompletos.append(VarreduraIncompleta(padrao, texto, inicio, fim))
+
+
+def padroes_incompletos(incompletos: List[VarreduraIncompleta], texto: str) -> List[str]:
+    """Padrões com trechos pulados em `texto` (ou em uma janela dele)"""
+    return sorted({i.padrao for i in incompletos if i.texto is texto or i.texto in texto})
+
+
+# ============================================================================
+# REGEX PROTEGIDA
+# ============================================================================
+def compilar_re2(expressao: str, flags: int):
+    """Compila no RE2 (ou None se o RE2 não estiver instalado ou não aceitar o padrão)"""
+    if not RE2_AVAILABLE:
+        return None
+    inline = "".join(letra for flag, letra in _FLAGS_INLINE if flags & flag)
+    try:
+        return re2.compile(f"(?{inline}){expressao}" if inline else expressao, _OPCOES_RE2)
+    except re2.error:
+        return None
+
+
+class RegexProtegida:
+    """
+    Ocupa o lugar da regex compilada de um Pattern: finditer com orçamento
+    de tempo (ou no RE2); o resto é delegado à regex compilada
+    """
+
+    def __init__(self, expressao: str, flags: int, nome: str = ""):
+        self.nome = nome
+        self._regex = regex.compile(expressao, flags=flags)
+        self._re2 = compilar_re2(expressao, flags)
+
+    def __getattr__(self, nome):
+        return getattr(self._regex, nome)
+
+    @property
+    def linear(self) -> bool:
+        """True se o padrão também roda no RE2"""
+        return self._re2 is not None
+
+    def finditer(self, texto, *args, **kwargs):
+        if args or kwargs:
+            return self._regex.finditer(texto, *args, **kwargs)
+        if MOTOR_REGEX == "re2" and self._re2 is not None:
+            return self._re2.finditer(texto)
+        if ORCAMENTO_SEGUNDOS <= 0:
+            return self._regex.finditer(texto)
+        return self._finditer_com_orcamento(texto)
+
+    def _finditer_com_orcamento(self, texto: str) -> Iterator:
+        posicao = [0]
+        try:
+            yield from self._finditer_por_busca(texto, 0, len(texto), posicao)
+            return
+        except TimeoutError:
+            pass
+
+        logger.warning(
+            f"⏱️ Padrão '{self.nome}' estourou {ORCAMENTO_SEGUNDOS * 1000:.0f} ms "
+            f"(texto de {len(texto)} caracteres, posição {posicao[0]}) - continuando em trechos"
+        )
+        yield from self._finditer_em_trechos(texto, posicao[0])
+
+    def _finditer_por_busca(self, texto: str, inicio: int, fim: int, posicao: List[int]) -> Iterator:
+        """
+        finditer em texto[inicio:fim] com o orçamento valendo por busca
+
+        O prazo do `regex` corre desde a criação do finditer: um estouro depois
+        de algum match reinicia a busca do fim do último match, com prazo novo.
+        TimeoutError só sai quando uma busca inteira estoura sem match.
+        `posicao[0]` guarda o fim do último match entregue.
+        """
+        ultimo = None
+        while True:
+            progrediu = False
+            try:
+                for match in self._regex.finditer(texto, posicao[0] if ultimo else inicio, fim,
+                                                  timeout=ORCAMENTO_SEGUNDOS):
+                    # Match vazio repetido no ponto de reinício
+                    if match.span() == ultimo:
+                        continue
+                    ultimo = match.span()
+                    posicao[0] = match.end()
+                    progrediu = True
+                    yield match
+                return
+            except TimeoutError:
+                if not progrediu:
+                    raise
+
+    def _finditer_em_trechos(self, texto: str, posicao: int) -> Iterator:
+        """
+        Continua a varredura em trechos: só valem os matches que começam no
+        trecho, e a busca vai até a folga depois dele
+        """
+        inicio = posicao
+        while inicio < len(texto):
+            limite = min(inicio + TRECHO_RETOMADA, len(texto))
+            proximo = limite
+            try:
+                for match in self._finditer_por_busca(
+                    texto, inicio, min(limite + FOLGA_RETOMADA, len(texto)), [inicio]
+                ):
+                    if match.start() >= limite:
+                        break
+                    proximo = max(proximo, match.end())
+                    yield match
+            except TimeoutError:
+                logger.warning(
+                    f"⏱️ Padrão '{self.nome}' estourou o orçamento também no trecho "
+                    f"{inicio}-{limite} (texto de {len(texto)} caracteres) - trecho pulado, "
+                    f"análise incompleta"
+                )
+                _marcar_incompleto(self.nome, texto, inicio, limite)
+            inicio = proximo
+
+
+def proteger_padroes(reconhecedores) -> None:
+    """
+    Compila os padrões dos PatternRecognizers em RegexProtegida (com as
+    flags que o analyze() usará, para a regex não ser recompilada)
+    """
+    for reconhecedor in reconhecedores:
+        if not isinstance(reconhecedor, PatternRecognizer):
+            continue
+        flags = reconhecedor.global_regex_flags
+        for pattern in reconhecedor.patterns:
+            pattern.compiled_with_flags = flags
+            pattern.compiled_regex = RegexProtegida(pattern.regex, flags, pattern.name)
@@ -0,0 +1,858 @@
+"""
+Pipeline de Anonimização - Motores Presidio + Filtros + Máscaras
+
+Concentra a inicialização dos motores (spaCy + 37 reconhecedores brasileiros +
+validadores) e as etapas de processamento usadas pela API:
+
+1. Análise com Presidio (texto único ou lote via nlp.pipe)
+2. Filtragem com validadores (blacklist global, PERSON, LOCATION, ORGANIZATION)
+3. Anonimização com máscaras ([NOME], [CPF], etc.)
+
+As funções processar_texto/processar_lote são síncronas e CPU-bound: a API as
+executa no ExecutorAnalise (executor.py), fora do event loop do uvicorn.
+Cada thread/processo do executor carrega suas próprias instâncias dos motores
+(ver obter_motores), exceto no modo pre-fork (server.py), em que os workers
+herdam os motores carregados uma única vez pelo processo master.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+from presidio_analyzer import AnalyzerEngine, BatchAnalyzerEngine
+from presidio_analyzer.nlp_engine import NlpArtifacts, NlpEngineProvider
+from presidio_analyzer.predefined_recognizers import SpacyRecognizer
+from presidio_anonymizer import AnonymizerEngine
+from presidio_anonymizer.entities import OperatorConfig
+
+# Importar validadores robustos (NameDataset + Geopy)
+from validators import PersonLocationFilter
+from blacklist import AutomatoTermos
+from texto_canonico import dobrar, texto_canonico
+from registro_indexado import RegistroIndexado
+from janelas import Janela, dividir_em_janelas, mesclar_resultados
+from analisador import AnalisadorInstrumentado
+from metricas import cronometro_atual, medir
+from custo_reconhecedores import contar_sobreviventes, instrumentar_reconhecedor
+from varredura import VARREDURA_ATIVA, VarreduraCombinada
+from motor_regex import padroes_incompletos, proteger_padroes, registrar_incompletos
+from malha_numerica import resolver_colisoes
+from sobreposicoes import criar_prioridades_do_ambiente, escolher_na_regiao, regioes_sobrepostas
+from digitos_verificadores import VALIDADORES, estrito_ativo, verificacao_estrita
+from candidatos_nome import CANDIDATOS_NOME_ATIVO, GeradorCandidatosNome
+
+# ============================================================================
+# IMPORTAÇÕES DE RECONHECEDORES BRASILEIROS (37 tipos)
+# ============================================================================
+# Reconhecedores customizados para padrões brasileiros específicos
+from brazilian_recognizers import (
+    BrazilCpfRecognizer,
+    BrazilRgRecognizer,
+    BrazilCepRecognizer,
+    BrazilPhoneRecognizer,
+    BrazilCnpjRecognizer,
+    BrazilEmailRecognizer,
+    # Dados pessoais básicos
+    BrazilDateOfBirthRecognizer,
+    BrazilAgeRecognizer,
+    BrazilProfessionRecognizer,
+    BrazilMaritalStatusRecognizer,
+    BrazilNationalityRecognizer,
+    # Dados financeiros
+    BrazilBankAccountRecognizer,
+    BrazilContractNumberRecognizer,
+    # Dados de localização
+    BrazilVehiclePlateRecognizer,
+    BrazilGeolocationRecognizer,
+    BrazilUsernameRecognizer,
+    BrazilIpAddressRecognizer,
+    # Dados sensíveis LGPD
+    BrazilEthnicityRecognizer,
+    BrazilReligionRecognizer,
+    BrazilPoliticalOpinionRecognizer,
+    BrazilUnionMembershipRecognizer,
+    BrazilHealthDataRecognizer,
+    BrazilSexualOrientationRecognizer,
+    # Reconhecedores auxiliares
+    BrazilGenericPhoneRecognizer,
+    BrazilNameRecognizer,
+    # Documentos adicionais
+    BrazilVoterIdRecognizer,
+    BrazilWorkCardRecognizer,
+    BrazilDriverLicenseRecognizer,
+    BrazilPisPasepRecognizer,
+    BrazilCnsRecognizer,
+    BrazilPassportRecognizer,
+    BrazilReservistaRecognizer,
+    BrazilProfessionalRegistryRecognizer,
+    BrazilPixKeyRecognizer,
+    BrazilRenavamRecognizer,
+    BrazilSchoolRegistrationRecognizer,
+    BrazilBenefitNumberRecognizer,
+)
+
+logger = logging.getLogger(__name__)
+
+# Versão da configuração do pipeline (reconhecedores, filtros, blacklists, máscaras).
+# Faz parte da chave do cache de resultados (cache.py): incrementar a cada mudança
+# que altere a saída, para não servir resultados calculados com a configuração antiga.
+VERSAO_PIPELINE = "9"
+
+# Tipos de NER: mesmo quando vêm de reconhecedores por padrão (nomes brasileiros),
+# dependem dos lemas do spaCy completo no realce por contexto e nos validadores
+ENTIDADES_NER = frozenset({"PERSON", "LOCATION", "ORGANIZATION", "NRP"})
+
+
+@dataclass
+class MotoresPresidio:
+    """Instâncias dos motores usadas por uma thread/processo do pipeline"""
+    analyzer: AnalyzerEngine
+    anonymizer: AnonymizerEngine
+    batch_analyzer: BatchAnalyzerEngine
+    person_location_filter: PersonLocationFilter
+    # Entidades detectadas por reconhecedores baseados no spaCy (NER) - exigem o pipeline NLP completo
+    entidades_nlp: frozenset = frozenset()
+
+    def requer_nlp(self, entidades: List[str]) -> bool:
+        """True se alguma entidade pedida depende do NER do spaCy"""
+        return not self.entidades_nlp.isdisjoint(entidades)
+
+
+def criar_motores() -> MotoresPresidio:
+    """
+    Carrega spaCy português (pt_core_news_lg, com fallback para sm/inglês),
+    registra os reconhecedores brasileiros e inicializa anonimizador e validadores
+    """
+    # ========================================================================
+    # CONFIGURAÇÃO DO PRESIDIO ANALYZER
+    # ========================================================================
+    configuration = {
+        "nlp_engine_name": "spacy",
+        "models": [{"lang_code": "pt", "model_name": "pt_core_news_lg"}],
+    }
+
+    # Inicializar Presidio com spaCy português e reconhecedores customizados
+    try:
+        provider = NlpEngineProvider(nlp_configuration=configuration)
+        nlp_engine = provider.create_engine()
+
+        # Criar registro de reconhecedores (indexado por entidade - ver registro_indexado.py)
+        registry = RegistroIndexado()
+
+        # IMPORTANTE: Recognizers predefinidos do spaCy DESABILITADOS propositalmente
+        # Motivo: Geram muitos falsos positivos em português
+        # Solução: Usar apenas reconhecedores customizados para padrões brasileiros
+        # registry.load_predefined_recognizers(nlp_engine=nlp_engine)  # DESABILITADO
+
+        # ========================================================================
+        # ADICIONAR 37 RECONHECEDORES BRASILEIROS CUSTOMIZADOS
+        # ========================================================================
+        # Cada reconhecedor detecta um tipo específico de PII brasileiro
+        registry.add_recognizer(BrazilCpfRecognizer())
+        registry.add_recognizer(BrazilRgRecognizer())
+        registry.add_recognizer(BrazilCepRecognizer())
+        registry.add_recognizer(BrazilPhoneRecognizer())
+        registry.add_recognizer(BrazilGenericPhoneRecognizer())  # Telefones genéricos
+        registry.add_recognizer(BrazilCnpjRecognizer())
+        registry.add_recognizer(BrazilEmailRecognizer())
+        # Dados pessoais básicos
+        registry.add_recognizer(BrazilDateOfBirthRecognizer())
+        registry.add_recognizer(BrazilAgeRecognizer())
+        registry.add_recognizer(BrazilProfessionRecognizer())
+        registry.add_recognizer(BrazilMaritalStatusRecognizer())
+        registry.add_recognizer(BrazilNationalityRecognizer())
+        # Dados financeiros
+        registry.add_recognizer(BrazilBankAccountRecognizer())
+        registry.add_recognizer(BrazilContractNumberRecognizer())
+        # Dados de localização
+        registry.add_recognizer(BrazilVehiclePlateRecognizer())
+        registry.add_recognizer(BrazilGeolocationRecognizer())
+        registry.add_recognizer(BrazilUsernameRecognizer())
+        registry.add_recognizer(BrazilIpAddressRecognizer())
+        # Dados sensíveis LGPD
+        registry.add_recognizer(BrazilEthnicityRecognizer())
+        registry.add_recognizer(BrazilReligionRecognizer())
+        registry.add_recognizer(BrazilPoliticalOpinionRecognizer())
+        registry.add_recognizer(BrazilUnionMembershipRecognizer())
+        registry.add_recognizer(BrazilHealthDataRecognizer())
+        registry.add_recognizer(BrazilSexualOrientationRecognizer())
+        if CANDIDATOS_NOME_ATIVO:
+            # Um candidato PERSON por sequência de palavras capitalizadas (candidatos_nome.py)
+            registry.add_recognizer(GeradorCandidatosNome())
+            logger.info("Gerador de candidatos a nome (sequências de tokens + léxico) adicionado")
+        else:
+            registry.add_recognizer(BrazilNameRecognizer())  # Nomes brasileiros
+
+            # Adicionar reconhecedor personalizado de nomes brasileiros por padrão
+            from brazilian_name_recognizer import BrazilianNameRecognizer
+            registry.add_recognizer(BrazilianNameRecognizer())
+            logger.info("Reconhecedor customizado de nomes brasileiros (pattern-based) adicionado")
+
+        registry.add_recognizer(BrazilVoterIdRecognizer())  # Título de Eleitor
+        registry.add_recognizer(BrazilWorkCardRecognizer())  # CTPS
+        registry.add_recognizer(BrazilDriverLicenseRecognizer())  # CNH
+        registry.add_recognizer(BrazilPisPasepRecognizer())  # PIS/PASEP
+        registry.add_recognizer(BrazilCnsRecognizer())  # CNS (Cartão Nacional de Saúde)
+        registry.add_recognizer(BrazilPassportRecognizer())  # Passaporte
+        registry.add_recognizer(BrazilReservistaRecognizer())  # Certificado de Reservista
+        registry.add_recognizer(BrazilProfessionalRegistryRecognizer())  # Registros profissionais
+        registry.add_recognizer(BrazilPixKeyRecognizer())  # Chave PIX
+        registry.add_recognizer(BrazilRenavamRecognizer())  # RENAVAM
+        registry.add_recognizer(BrazilSchoolRegistrationRecognizer())  # Matrícula escolar
+        registry.add_recognizer(BrazilBenefitNumberRecognizer())  # Número de benefício
+        logger.info("Reconhecedores brasileiros adicionados: 37 tipos (CPF, RG, CEP, Telefone, CNPJ, Email + 31 incluindo Título Eleitor, CTPS, CNH, PIS, CNS, Passaporte, Reservista, Registros Profissionais, PIX, RENAVAM, Matrícula Escolar, Número Benefício)")
+
+        # Inicializar engines do Presidio
+        analyzer = AnalisadorInstrumentado(nlp_engine=nlp_engine, registry=registry)
+        anonymizer = AnonymizerEngine()
+
+        # Inicializar filtro robusto de PERSON/LOCATION
+        person_location_filter = PersonLocationFilter()
+        logger.info("Filtro robusto Person/Location inicializado com NameDataset + Geopy")
+
+        # Pré-processador desabilitado temporariamente
+        # text_preprocessor = TextPreprocessor()
+        # logger.info("Pré-processador de texto inicializado - normalização de quebras e contexto")
+
+        logger.info("Presidio inicializado com spaCy portugues (lg) + Reconhecedores BR")
+    except Exception as e:
+        logger.warning(f"Falha ao carregar modelo portugues pt_core_news_lg: {e}")
+        logger.info("Tentando fallback para pt_core_news_sm")
+        try:
+            configuration["models"] = [{"lang_code": "pt", "model_name": "pt_core_news_sm"}]
+            provider = NlpEngineProvider(nlp_configuration=configuration)
+            nlp_engine = provider.create_engine()
+            registry = RegistroIndexado()
+            registry.load_predefined_recognizers(nlp_engine=nlp_engine)
+            registry.add_recognizer(BrazilCpfRecognizer())
+            registry.add_recognizer(BrazilRgRecognizer())
+            registry.add_recognizer(BrazilCepRecognizer())
+            registry.add_recognizer(BrazilPhoneRecognizer())
+            registry.add_recognizer(BrazilCnpjRecognizer())
+            registry.add_recognizer(BrazilEmailRecognizer())
+            analyzer = AnalisadorInstrumentado(nlp_engine=nlp_engine, registry=registry)
+            anonymizer = AnonymizerEngine()
+            person_location_filter = PersonLocationFilter()
+            logger.info("Presidio inicializado com spaCy portugues (sm) + Reconhecedores BR + Validadores Robustos")
+        except Exception as e2:
+            logger.warning(f"Falha ao carregar modelo portugues sm: {e2}")
+            logger.info("Inicializando com modelo ingles como fallback")
+            analyzer = AnalisadorInstrumentado()
+            anonymizer = AnonymizerEngine()
+            person_location_filter = PersonLocationFilter()
+            logger.info("Filtro robusto inicializado mesmo no fallback")
+
+    # Entidades de NER (PERSON, LOCATION, ORGANIZATION...) + as que algum
+    # reconhecedor spaCy entrega: sem nenhuma delas na requisição, a análise
+    # usa o caminho rápido só-regex
+    entidades_nlp = ENTIDADES_NER | frozenset(
+        entidade
+        for reconhecedor in analyzer.registry.recognizers
+        if isinstance(reconhecedor, SpacyRecognizer)
+        for entidade in reconhecedor.supported_entities
+    )
+
+    # Padrões repetidos e de palavras-chave compartilham passadas (varredura.py);
+    # as buscas têm orçamento de tempo, com RE2 opcional (motor_regex.py)
+    if VARREDURA_ATIVA:
+        VarreduraCombinada(analyzer.registry.recognizers)
+    else:
+        proteger_padroes(analyzer.registry.recognizers)
+
+    # Custo e rendimento por reconhecedor/padrão (custo_reconhecedores.py)
+    for reconhecedor in analyzer.registry.recognizers:
+        instrumentar_reconhecedor(reconhecedor)
+
+    # Análise em lote: reaproveita o mesmo AnalyzerEngine, mas roda o spaCy com nlp.pipe
+    return MotoresPresidio(
+        analyzer=analyzer,
+        anonymizer=anonymizer,
+        batch_analyzer=BatchAnalyzerEngine(analyzer_engine=analyzer),
+        person_location_filter=person_location_filter,
+        entidades_nlp=entidades_nlp,
+    )
+
+
+# Motores da thread atual (cada worker do executor tem os seus)
+_motores_locais = threading.local()
+
+# Motores carregados pelo master do modo pre-fork (server.py) antes do fork:
+# os workers herdam as páginas copy-on-write em vez de recarregar os modelos
+_motores_compartilhados = None
+
+
+def compartilhar_motores(motores: MotoresPresidio) -> None:
+    """Define os motores usados por todo o processo (e pelos processos filhos após fork)"""
+    global _motores_compartilhados
+    _motores_compartilhados = motores
+
+
+def obter_motores() -> MotoresPresidio:
+    """Retorna os motores da thread atual, carregando-os na primeira chamada"""
+    if _motores_compartilhados is not None:
+        return _motores_compartilhados
+    motores = getattr(_motores_locais, "motores", None)
+    if motores is None:
+        motores = criar_motores()
+        _motores_locais.motores = motores
+    return motores
+
+
+def inicializar_worker() -> None:
+    """Initializer do executor: carrega os motores antes da primeira requisição"""
+    obter_motores()
+
+
+# Entidades analisadas quando a requisição não informa `entities`
+ENTIDADES_PADRAO = [
+    # Entidades básicas Presidio
+    "PERSON",           # Nomes de pessoas
+    "EMAIL_ADDRESS",    # E-mails
+    "PHONE_NUMBER",     # Telefones
+    "LOCATION",         # Localizações
+    "CREDIT_CARD",      # Cartões de crédito
+    "IBAN_CODE",        # Códigos bancários
+    "IP_ADDRESS",       # Endereços IP
+    "NRP",              # CPF (Portugal/Brasil)
+    "US_SSN",           # Similar a CPF
+    # Reconhecedores brasileiros básicos
+    "BR_CPF",           # CPF brasileiro
+    "BR_RG",            # RG brasileiro
+    "BR_CEP",           # CEP brasileiro
+    "BR_CNPJ",          # CNPJ brasileiro
+    "BR_PHONE",         # Telefone brasileiro
+    # Dados pessoais básicos
+    "BR_DATE_OF_BIRTH", # Data de nascimento
+    "BR_AGE",           # Idade
+    "BR_PROFESSION",    # Profissão
+    "BR_MARITAL_STATUS",# Estado civil
+    "BR_NATIONALITY",   # Nacionalidade
+    # Dados financeiros
+    "BR_BANK_ACCOUNT",  # Dados bancários
+    "BR_CONTRACT_NUMBER", # Número de contrato/protocolo
+    # Dados de localização
+    "BR_VEHICLE_PLATE", # Placa de veículo
+    "BR_GEOLOCATION",   # Coordenadas GPS
+    "BR_USERNAME",      # Nome de usuário
+    "BR_IP_EXPLICIT",   # IP explicitamente mencionado
+    # Dados sensíveis LGPD
+    "BR_ETHNICITY",     # Origem étnica
+    "BR_RELIGION",      # Religião
+    "BR_POLITICAL_OPINION", # Opinião política
+    "BR_UNION_MEMBERSHIP",  # Filiação sindical
+    "BR_HEALTH_DATA",   # Dados de saúde
+    "BR_SEXUAL_ORIENTATION", # Orientação sexual
+    # Documentos adicionais
+    "BR_VOTER_ID",      # Título de Eleitor
+    "BR_WORK_CARD",     # CTPS (Carteira de Trabalho)
+    "BR_DRIVER_LICENSE", # CNH
+    "BR_PIS_PASEP",     # PIS/PASEP
+    "BR_CNS",           # CNS (Cartão Nacional de Saúde)
+    "BR_PASSPORT",      # Passaporte
+    "BR_RESERVISTA",    # Certificado de Reservista
+    "BR_PROFESSIONAL_REGISTRY", # Registros profissionais (OAB, CRM, CREA, etc)
+    "BR_PIX_KEY",       # Chave PIX
+    "BR_RENAVAM",       # RENAVAM
+    "BR_SCHOOL_REGISTRATION", # Matrícula escolar
+    "BR_BENEFIT_NUMBER", # Número de benefício (INSS, etc)
+]
+
+
+def entidades_solicitadas(entities: List[str] = None) -> List[str]:
+    """Retorna as entidades pedidas na requisição ou a lista padrão (incluindo brasileiras)"""
+    return entities or ENTIDADES_PADRAO
+
+
+# ============================================================================
+# BLACKLIST GLOBAL - TERMOS QUE NUNCA SÃO PII
+# ============================================================================
+# Lista de palavras que NUNCA devem ser anonimizadas (substring do texto da entidade)
+# Categorias: instituições, termos administrativos, técnicos, saudações,
+# químicos, estados, documentos, artistas/figuras históricas
+NEVER_ANONYMIZE_TERMS = [
+    # Instituições
+    "escola", "universidade", "faculdade", "instituto", "colegio",
+    "ministerio", "secretaria", "prefeitura", "tribunal", "governo",
+    "politicas publicas", "mestrado", "doutorado", "graduacao",
+    # Termos administrativos
+    "contrato", "convenio", "acordo", "termo", "aditivo",
+    "emenda", "empenho", "inciso", "validador", "edital", "concurso",
+    "protocolo", "processo", "anexo", "ref", "disposto",
+    # Termos técnicos que são mal interpretados
+    "gestao", "governanca", "administracao", "infraestrutura",
+    "banco de dados", "tic", "aplicativo", "mensagem", "whatsapp",
+    "programa", "integridade", "monitoramento", "interesse",
+    "carteira de trabalho", "ouvidoria", "canal", "contoladoria",
+    "assunto", "esbulho", "registrado", "delegacias", "registros",
+    "vida empreendimentos", "cooperativas financeiras",
+    # Saudações e palavras soltas que não são nomes
+    "ola", "oi", "prezados", "prezadas", "tarde", "bom", "boa",
+    "dia", "noite",
+    # Palavras soltas mal interpretadas
+    "id", "texto", "superior", "juvenil", "civil", "box", "advogados",
+    "sou", "inquilina", "sic", "referente", "administrativa",
+    "gama", "oab", "icms", "st", "legal", "orientado", "fui",
+    "novo", "pedido", "ajuda", "geral", "exista", "ou", "nude",
+    "fato", "da", "do", "de", "em", "no", "na", "dos", "das",
+    "serra", "sp", "cep", "ltda", "s/a", "sa", "an",
+    # Siglas de estados
+    "er", "es", "rj", "mg", "ba", "pr", "sc", "rs", "go", "df",
+    # Sufixos de documentos
+    "cpf", "rg", "cnh", "cnpj",
+    # Artistas e figuras históricas
+    "athos bulsao",
+    # Químicos/técnicos ambientais
+    "coliformes", "termotolerantes", "fosforo", "nitrogenio", "amoniacal",
+    "oxigenio", "dissolvido", "solidos", "totais", "total"
+]
+
+# Instituições de ensino e órgãos governamentais (FILTRO 4: ORGANIZATION)
+ORGANIZATION_BLACKLIST_TERMS = [
+    "escola", "universidade", "faculdade", "colegio", "instituto",
+    "centro universitario", "usp", "unicamp", "ufmg", "ufrj",
+    "ministerio", "secretaria", "prefeitura", "tribunal",
+    "governo", "camara", "senado", "assembleia"
+]
+
+# Compiladas uma vez no import: cada verificação é uma passada pelo texto,
+# independente do tamanho das listas (ver blacklist.py)
+# Termos e entidades comparados sem acento (texto_canonico.py): "ministerio"
+# casa "Ministério", e cada termo é listado uma vez só
+BLACKLIST_GLOBAL = AutomatoTermos(dobrar(termo) for termo in NEVER_ANONYMIZE_TERMS)
+BLACKLIST_ORGANIZATION = AutomatoTermos(dobrar(termo) for termo in ORGANIZATION_BLACKLIST_TERMS)
+
+# Prioridade entre tipos sobrepostos (EMAIL > PERSON...), PRESIDIO_PRIORIDADES
+PRIORIDADES_TIPO = criar_prioridades_do_ambiente()
+
+# Tipos com validador próprio: sobreposições do mesmo tipo são validadas por região
+TIPOS_VALIDADOS = frozenset({"PERSON", "LOCATION"})
+
+
+def filtrar_resultados(texto: str, results: list, motores: "MotoresPresidio") -> list:
+    """
+    Aplica blacklist global e validadores PERSON/LOCATION aos resultados do Presidio
+    """
+    # ====================================================================
+    # FILTRAR RESULTADOS COM VALIDADORES ROBUSTOS
+    # ====================================================================
+    # PersonLocationFilter elimina falsos positivos usando:
+    # 1. NameDataset (190k+ nomes reais)
+    # 2. Geopy (localização geográfica)
+    # 3. Análise de contexto (100 chars antes/depois)
+    filtered_results = []
+    # Entidades sem acento e em minúsculas, lidas da visão calculada uma vez
+    canonico = texto_canonico(texto)
+    
+    # ====================================================================
+    # RESOLVER SOBREPOSIÇÕES ANTES DA VALIDAÇÃO
+    # ====================================================================
+    # Resultados sobrepostos a um tipo prioritário perdem a parte sobreposta
+    # antes de passar pelos validadores (sobreposicoes.py). Exemplo:
+    # "joao@empresa.com" pode ser EMAIL + PERSON "joao": o PERSON, inteiro
+    # dentro do e-mail, sai; "Maria Silva maria.silva" vira "Maria Silva"
+    results = PRIORIDADES_TIPO.resolver(results, texto)
+    
+    # PERSON/LOCATION parcialmente sobrepostos (spaCy + reconhecedores de nome)
+    # formam uma região, validada do span mais longo para o mais curto
+    regioes = regioes_sobrepostas(results, TIPOS_VALIDADOS)
+    
+    def aceitar(r) -> bool:
+        """Blacklist + validador do tipo: True se o resultado deve ser anonimizado"""
+        texto_entidade = canonico.trecho(r.start, r.end)
+        
+        # ------------------------------------------------------------------
+        # FILTRO 1: BLACKLIST GLOBAL
+        # ------------------------------------------------------------------
+        # Rejeita termos institucionais/técnicos (nunca são PII)
+        # No modo estrito, documentos com dígito verificador conferido não
+        # passam pela blacklist ("CNH: 02650306461" contém "cnh")
+        if BLACKLIST_GLOBAL.contem(texto_entidade) and not (
+            r.entity_type in VALIDADORES and estrito_ativo()
+        ):
+            logger.info(f"🚫 Blacklist global: '{texto[r.start:r.end]}' ({r.entity_type})")
+            return False
+        
+        # ------------------------------------------------------------------
+        # FILTRO 2: VALIDAÇÃO DE PERSON
+        # ------------------------------------------------------------------
+        # Usa NameDataset (190k nomes) + análise de contexto
+        if r.entity_type == "PERSON":
+            texto_original = texto[r.start:r.end]
+            logger.debug(f"🔍 Validando PERSON: '{texto_original}' (score: {r.score:.2f})")
+            
+            # Extrair contexto (50 chars antes e depois)
+            context_window = 50
+            start_ctx = max(0, r.start - context_window)
+            end_ctx = min(len(texto), r.end + context_window)
+            context = texto[start_ctx:end_ctx]
+            
+            # Validar com NameDataset + contexto (artístico, institucional, técnico)
+            is_valid = motores.person_location_filter.should_keep_as_person(
+                texto_original, 
+                context, 
+                r.score,
+                start=r.start,
+                end=r.end,
+                full_text=texto
+            )
+            
+            logger.debug(f"{'✅' if is_valid else '❌'} PERSON '{texto_original}' → {is_valid}")
+            
+            if not is_valid:
+                logger.debug(f"❌ PERSON '{texto_original}' rejeitado pelo validador")
+            return is_valid
+                
+        # ------------------------------------------------------------------
+        # FILTRO 3: VALIDAÇÃO DE LOCATION
+        # ------------------------------------------------------------------
+        # Usa Geopy + PyCountry para validar localizações reais
+        elif r.entity_type == "LOCATION":
+            texto_original = texto[r.start:r.end]
+            logger.debug(f"🔍 Validando LOCATION: '{texto_original}' (score: {r.score:.2f})")
+            
+            # Extrair contexto (50 chars antes e depois)
+            context_window = 50
+            start_ctx = max(0, r.start - context_window)
+            end_ctx = min(len(texto), r.end + context_window)
+            context = texto[start_ctx:end_ctx]
+            
+            # Validar com Geopy + PyCountry
+            is_valid = motores.person_location_filter.should_keep_as_location(
+                texto_original, context, r.score
+            )
+            
+            logger.debug(f"{'✅' if is_valid else '❌'} LOCATION '{texto_original}' → {is_valid}")
+            
+            if not is_valid:
+                logger.debug(f"❌ LOCATION '{texto_original}' rejeitado pelo validador")
+            return is_valid
+                
+        # ------------------------------------------------------------------
+        # FILTRO 4: ORGANIZATION (sem validador - apenas blacklist)
+        # ------------------------------------------------------------------
+        # Nunca anonimizar instituições de ensino e órgãos governamentais
+        elif r.entity_type == "ORGANIZATION":
+            texto_original = texto[r.start:r.end]
+            
+            # Blacklist de instituições que não devem ser anonimizadas
+            if BLACKLIST_ORGANIZATION.contem(texto_entidade):
+                logger.debug(f"🚫 ORGANIZATION institucional: '{texto_original}' (não anonimizar)")
+                return False
+            return True
+                
+        # ------------------------------------------------------------------
+        # FILTRO 5: OUTRAS ENTIDADES (sem validação adicional)
+        # ------------------------------------------------------------------
+        # Todas as outras entidades passam direto (já validadas pelos recognizers)
+        else:
+            return True
+    
+    # ====================================================================
+    # LOOP PRINCIPAL DE VALIDAÇÃO
+    # ====================================================================
+    regioes_validadas = set()
+    for r in results:
+        regiao = regioes.get(id(r))
+        if regiao is None:
+            if aceitar(r):
+                filtered_results.append(r)
+        elif id(regiao) not in regioes_validadas:
+            # A região inteira entra na posição do primeiro membro
+            regioes_validadas.add(id(regiao))
+            filtered_results.extend(escolher_na_regiao(regiao, aceitar))
+    
+    # ====================================================================
+    # COLISÕES ENTRE IDENTIFICADORES NUMÉRICOS
+    # ====================================================================
+    # CPF × telefone, CEP × RG, CNS × CPF...: um resultado por sequência de
+    # dígitos, escolhido pela malha numérica (tamanho, máscara, dígito verificador)
+    filtered_results = resolver_colisoes(texto, filtered_results)
+    
+    logger.info(f"✅ Filtro concluído: {len(filtered_results)} entidades válidas detectadas")
+    return filtered_results
+
+
+def anonimizar(texto: str, results: list, motores: "MotoresPresidio") -> Dict[str, Any]:
+    """
+    Aplica as máscaras de anonimização e monta o resultado no formato da API
+    """
+    # ====================================================================
+    # CONFIGURAR MÁSCARAS DE ANONIMIZAÇÃO
+    # ====================================================================
+    # Define como cada tipo de PII será substituído no texto
+    operators = {
+        # Entidades básicas
+        "PERSON": OperatorConfig("replace", {"new_value": "[NOME]"}),
+        "EMAIL_ADDRESS": OperatorConfig("replace", {"new_value": "[EMAIL]"}),
+        "PHONE_NUMBER": OperatorConfig("replace", {"new_value": "(XX) XXXXX-XXXX"}),
+        "LOCATION": OperatorConfig("replace", {"new_value": "[LOCAL]"}),
+        "CREDIT_CARD": OperatorConfig("mask", {"masking_char": "X", "chars_to_mask": 12, "from_end": False}),
+        "IBAN_CODE": OperatorConfig("mask", {"masking_char": "X", "chars_to_mask": 10, "from_end": False}),
+        "IP_ADDRESS": OperatorConfig("replace", {"new_value": "XXX.XXX.XXX.XXX"}),
+        "NRP": OperatorConfig("replace", {"new_value": "XXX.XXX.XXX-XX"}),
+        "US_SSN": OperatorConfig("replace", {"new_value": "XXX.XXX.XXX-XX"}),
+        # Reconhecedores brasileiros básicos
+        "BR_CPF": OperatorConfig("replace", {"new_value": "XXX.XXX.XXX-XX"}),
+        "BR_RG": OperatorConfig("replace", {"new_value": "XX.XXX.XXX-X"}),
+        "BR_CEP": OperatorConfig("replace", {"new_value": "XXXXX-XXX"}),
+        "BR_PHONE": OperatorConfig("replace", {"new_value": "(XX) XXXXX-XXXX"}),
+        "BR_CNPJ": OperatorConfig("replace", {"new_value": "XX.XXX.XXX/XXXX-XX"}),
+        # Dados pessoais básicos
+        "BR_DATE_OF_BIRTH": OperatorConfig("replace", {"new_value": "DD/MM/AAAA"}),
+        "BR_AGE": OperatorConfig("replace", {"new_value": "[IDADE]"}),
+        "BR_PROFESSION": OperatorConfig("replace", {"new_value": "[PROFISSÃO]"}),
+        "BR_MARITAL_STATUS": OperatorConfig("replace", {"new_value": "[ESTADO_CIVIL]"}),
+        "BR_NATIONALITY": OperatorConfig("replace", {"new_value": "[NACIONALIDADE]"}),
+        # Dados financeiros
+        "BR_BANK_ACCOUNT": OperatorConfig("replace", {"new_value": "[DADOS_BANCÁRIOS]"}),
+        "BR_CONTRACT_NUMBER": OperatorConfig("replace", {"new_value": "[CONTRATO/PROTOCOLO]"}),
+        # Dados de localização
+        "BR_VEHICLE_PLATE": OperatorConfig("replace", {"new_value": "XXX-XXXX"}),
+        "BR_GEOLOCATION": OperatorConfig("replace", {"new_value": "[COORDENADAS]"}),
+        "BR_USERNAME": OperatorConfig("replace", {"new_value": "[USUÁRIO]"}),
+        "BR_IP_EXPLICIT": OperatorConfig("replace", {"new_value": "IP XXX.XXX.XXX.XXX"}),
+        # Dados sensíveis LGPD
+        "BR_ETHNICITY": OperatorConfig("replace", {"new_value": "[DADO_SENSÍVEL]"}),
+        "BR_RELIGION": OperatorConfig("replace", {"new_value": "[DADO_SENSÍVEL]"}),
+        "BR_POLITICAL_OPINION": OperatorConfig("replace", {"new_value": "[DADO_SENSÍVEL]"}),
+        "BR_UNION_MEMBERSHIP": OperatorConfig("replace", {"new_value": "[DADO_SENSÍVEL]"}),
+        "BR_HEALTH_DATA": OperatorConfig("replace", {"new_value": "[DADO_SENSÍVEL]"}),
+        "BR_SEXUAL_ORIENTATION": OperatorConfig("replace", {"new_value": "[DADO_SENSÍVEL]"}),
+        # Documentos adicionais
+        "BR_VOTER_ID": OperatorConfig("replace", {"new_value": "[TÍTULO_ELEITOR]"}),
+        "BR_WORK_CARD": OperatorConfig("replace", {"new_value": "[CTPS]"}),
+        "BR_DRIVER_LICENSE": OperatorConfig("replace", {"new_value": "[CNH]"}),
+        "BR_PIS_PASEP": OperatorConfig("replace", {"new_value": "[PIS/PASEP]"}),
+        "BR_CNS": OperatorConfig("replace", {"new_value": "[CNS]"}),
+        "BR_PASSPORT": OperatorConfig("replace", {"new_value": "[PASSAPORTE]"}),
+        "BR_RESERVISTA": OperatorConfig("replace", {"new_value": "[CERTIFICADO_RESERVISTA]"}),
+        "BR_PROFESSIONAL_REGISTRY": OperatorConfig("replace", {"new_value": "[REGISTRO_PROFISSIONAL]"}),
+        "BR_PIX_KEY": OperatorConfig("replace", {"new_value": "[CHAVE_PIX]"}),
+        "BR_RENAVAM": OperatorConfig("replace", {"new_value": "[RENAVAM]"}),
+        "BR_SCHOOL_REGISTRATION": OperatorConfig("replace", {"new_value": "[MATRÍCULA_ESCOLAR]"}),
+        "BR_BENEFIT_NUMBER": OperatorConfig("replace", {"new_value": "[NÚMERO_BENEFÍCIO]"}),
+        # Default
+        "DEFAULT": OperatorConfig("replace", {"new_value": "[OCULTO]"}),
+    }
+    
+    # Anonimizar texto
+    anonymized_result = motores.anonymizer.anonymize(
+        text=texto,
+        analyzer_results=results,
+        operators=operators
+    )
+    
+    # Preparar lista de entidades encontradas
+    entidades_encontradas = [
+        {
+            "tipo": result.entity_type,
+            "inicio": result.start,
+            "fim": result.end,
+            "confianca": result.score
+        }
+        for result in results
+    ]
+    
+    return {
+        "textoOriginal": texto,
+        "textoTarjado": anonymized_result.text,
+        "dadosOcultados": len(results),
+        "entidadesEncontradas": entidades_encontradas
+    }
+
+
+def criar_artefatos_leves(texto: str, language: str, motores: "MotoresPresidio") -> NlpArtifacts:
+    """
+    NlpArtifacts só com o tokenizador do spaCy (sem tagger, lemmatizer e NER)
+
+    Basta para os PatternRecognizer e para o realce por contexto do Presidio,
+    que procura as palavras de CONTEXT nos tokens antes da entidade. O lema
+    é aproximado pelo token em minúsculas.
+    """
+    nlp_engine = motores.analyzer.nlp_engine
+    with cronometro_atual().etapa("nlp"):
+        doc = nlp_engine.get_nlp(language).make_doc(texto)
+    return NlpArtifacts(
+        entities=[],
+        tokens=doc,
+        tokens_indices=[token.idx for token in doc],
+        lemmas=[token.lower_ for token in doc],
+        nlp_engine=nlp_engine,
+        language=language,
+    )
+
+
+def analisar_somente_regex(texto: str, language: str, entidades: List[str],
+                           motores: "MotoresPresidio") -> list:
+    """
+    Caminho rápido para requisições só com entidades de regex (BR_CPF, BR_CEP,
+    BR_PIX_KEY...): pula o pipeline spaCy e roda apenas os reconhecedores
+    das entidades pedidas
+    """
+    return motores.analyzer.analyze(
+        text=texto,
+        language=language,
+        entities=entidades,
+        score_threshold=0.30,
+        nlp_artifacts=criar_artefatos_leves(texto, language, motores)
+    )
+
+
+def analisar_trechos(trechos: List[str], language: str, entidades: List[str],
+                     motores: "MotoresPresidio") -> List[list]:
+    """
+    Analisa vários textos de uma vez: com entidades de NER, todos passam
+    juntos pelo spaCy (nlp.pipe via BatchAnalyzerEngine); sem elas, cada um
+    vai pelo caminho só-regex
+    """
+    if not motores.requer_nlp(entidades):
+        return [analisar_somente_regex(trecho, language, entidades, motores) for trecho in trechos]
+
+    # nlp.pipe é consumido dentro do analyze_iterator: o tempo dos reconhecedores
+    # (medido no AnalisadorInstrumentado) é descontado da etapa "nlp"
+    with cronometro_atual().etapa("nlp"):
+        return motores.batch_analyzer.analyze_iterator(
+            texts=trechos,
+            language=language,
+            entities=entidades,
+            score_threshold=0.30
+        )
+
+
+def analisar_em_janelas(texto: str, janelas: List[Janela], language: str,
+                        entidades: List[str], motores: "MotoresPresidio") -> list:
+    """
+    Analisa as janelas de um texto longo e devolve os resultados em
+    coordenadas do texto completo
+
+    As janelas passam juntas pelo spaCy (nlp.pipe via BatchAnalyzerEngine);
+    cada uma tem custo limitado, então a latência cresce linearmente com o
+    tamanho do documento e nenhum Doc passa do max_length do spaCy.
+    """
+    trechos = [texto[j.inicio:j.fim] for j in janelas]
+    resultados_por_janela = analisar_trechos(trechos, language, entidades, motores)
+    results = mesclar_resultados(janelas, resultados_por_janela)
+    logger.info(f"🪟 Texto de {len(texto)} caracteres analisado em {len(janelas)} janelas")
+    return results
+
+
+def marcar_incompleto(resultado: Dict[str, Any], padroes: List[str]) -> None:
+    """
+    Sinaliza no resultado os padrões que não varreram o texto inteiro no
+    orçamento de tempo (motor_regex.py): PII pode ter ficado sem máscara
+    """
+    resultado["analiseIncompleta"] = bool(padroes)
+    resultado["padroesIncompletos"] = padroes
+    if padroes:
+        logger.warning(f"⚠️ Análise incompleta - padrões sem varredura completa: {', '.join(padroes)}")
+
+
+def processar_texto(texto: str, language: str = "pt", entities: List[str] = None,
+                    estrito: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Analisa, filtra e anonimiza um texto (síncrono - roda no executor)
+
+    Args:
+        estrito: Rejeitar documentos com dígito verificador inválido
+            (None = PRESIDIO_DIGITO_VERIFICADOR_ESTRITO - ver digitos_verificadores.py)
+
+    Returns:
+        Resultado no formato da API + "tempos" (segundos por etapa - metricas.py)
+        + "custos" (por reconhecedor/padrão - custo_reconhecedores.py)
+    """
+    with medir() as cronometro, verificacao_estrita(estrito), registrar_incompletos() as incompletos:
+        resultado = _processar_texto(texto, language, entities)
+    marcar_incompleto(resultado, padroes_incompletos(incompletos, texto))
+    resultado["tempos"] = cronometro.tempos
+    resultado["custos"] = cronometro.custos
+    return resultado
+
+
+def _processar_texto(texto: str, language: str, entities: List[str]) -> Dict[str, Any]:
+    motores = obter_motores()
+    cronometro = cronometro_atual()
+    
+    # ====================================================================
+    # ANALISAR TEXTO COM PRESIDIO
+    # ====================================================================
+    # Threshold 0.30: Baixo para capturar padrões customizados
+    # Os validadores (NameDataset + Geopy) filtram falsos positivos depois
+    # Textos longos: janelas sobrepostas em nlp.pipe (ver janelas.py)
+    # Sem entidades de NER pedidas: caminho rápido só-regex, sem spaCy
+    entidades = entidades_solicitadas(entities)
+    janelas = dividir_em_janelas(texto)
+    if len(janelas) > 1:
+        results = analisar_em_janelas(texto, janelas, language, entidades, motores)
+    elif not motores.requer_nlp(entidades):
+        results = analisar_somente_regex(texto, language, entidades, motores)
+    else:
+        results = motores.analyzer.analyze(
+            text=texto,
+            language=language,
+            entities=entidades,
+            score_threshold=0.30
+        )
+    
+    # Log de diagnóstico: primeiras 10 detecções
+    logger.info(f"📊 Presidio detectou {len(results)} entidades (antes do filtro)")
+    for r in results[:10]:
+        texto_ent = texto[r.start:r.end]
+        logger.debug(f"  ✓ '{texto_ent}' → {r.entity_type} (score: {r.score:.2f})")
+    
+    with cronometro.etapa("filtros"):
+        results = filtrar_resultados(texto, results, motores)
+        contar_sobreviventes(results)
+    with cronometro.etapa("anonimizacao"):
+        return anonimizar(texto, results, motores)
+
+
+def processar_lote(textos: List[str], language: str = "pt", entities: List[str] = None,
+                   estrito: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Analisa uma lista de textos com nlp.pipe (BatchAnalyzerEngine) - ou pelo
+    caminho só-regex, sem entidades de NER - e então filtra e anonimiza cada
+    documento (síncrono - roda no executor)
+
+    No modo estrito os números de documento de todos os textos são validados
+    de uma vez (NumPy) antes da análise. Textos longos (anexos) são divididos
+    em janelas como no processar_texto, e as janelas de todos os textos vão
+    juntas no mesmo nlp.pipe.
+
+    Returns:
+        {"resultados": [um resultado por texto], "tempos": segundos por etapa (lote inteiro),
+         "custos": custo/rendimento por reconhecedor (lote inteiro)}
+    """
+    with medir() as cronometro, verificacao_estrita(estrito, textos), \
+            registrar_incompletos() as incompletos:
+        motores = obter_motores()
+        
+        janelas_por_texto = [dividir_em_janelas(texto) for texto in textos]
+        trechos = [
+            texto[j.inicio:j.fim] if len(janelas) > 1 else texto
+            for texto, janelas in zip(textos, janelas_por_texto)
+            for j in janelas
+        ]
+        resultados_trechos = iter(analisar_trechos(trechos, language, entidades_solicitadas(entities), motores))
+        
+        # Resultados de volta por texto (janelas em coordenadas do texto completo)
+        resultados_lote = []
+        for texto, janelas in zip(textos, janelas_por_texto):
+            resultados_janelas = [next(resultados_trechos) for _ in janelas]
+            if len(janelas) > 1:
+                resultados_lote.append(mesclar_resultados(janelas, resultados_janelas))
+                logger.info(f"🪟 Texto de {len(texto)} caracteres do lote analisado em {len(janelas)} janelas")
+            else:
+                resultados_lote.append(resultados_janelas[0])
+        
+        resultados = []
+        for texto, results in zip(textos, resultados_lote):
+            with cronometro.etapa("filtros"):
+                results = filtrar_resultados(texto, results, motores)
+                contar_sobreviventes(results)
+            with cronometro.etapa("anonimizacao"):
+                resultados.append(anonimizar(texto, results, motores))
+    
+    for texto, resultado in zip(textos, resultados):
+        marcar_incompleto(resultado, padroes_incompletos(incompletos, texto) if incompletos else [])
+    
+    return {"resultados": resultados, "tempos": cronometro.tempos, "custos": cronometro.custos}
@@ -0,0 +1,152 @@
+"""
+Pré-filtro de Reconhecedores por Características do Texto
+
+A maioria dos reconhecedores só casa em textos com certos caracteres ou
+palavras: sem dígito não há CPF, CEP, telefone, RG...; sem "@" não há e-mail;
+sem "pix", "oab", "crm", "reservista" os padrões com palavra-chave não
+disparam. A maior parte das manifestações curtas não tem dígito nenhum, e
+mesmo assim todos os padrões numéricos varriam o texto.
+
+Antes do analyze(), as características do texto viram um bitset:
+- classes de caracteres presentes (dígito, "@", "-"), a partir do conjunto
+  de caracteres do texto (uma passada)
+- palavras-chave presentes no texto em casefold (superconjunto do que o
+  IGNORECASE das regex aceita)
+
+Cada reconhecedor declara, em REQUISITOS, as alternativas de bits (uma por
+padrão) sem as quais nenhum padrão dele casa; o RegistroIndexado entrega ao
+analyze() só os reconhecedores com alguma alternativa satisfeita.
+Reconhecedores fora da tabela (nomes, dicionários, spaCy) rodam sempre. O
+resultado é idêntico ao da análise sem o pré-filtro.
+
+Configuração por variável de ambiente:
+- PRESIDIO_PREFILTRO: 1 liga (padrão), 0 desliga
+"""
+import logging
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+from presidio_analyzer import EntityRecognizer
+
+logger = logging.getLogger(__name__)
+
+PREFILTRO_ATIVO = os.getenv("PRESIDIO_PREFILTRO", "1") == "1"
+
+# ============================================================================
+# CARACTERÍSTICAS
+# ============================================================================
+DIGITO = 1 << 0
+ARROBA = 1 << 1
+HIFEN = 1 << 2
+
+# Palavras-chave (bit → termos em casefold; basta um deles)
+PIX = 1 << 3
+OAB = 1 << 4
+CONSELHO_CR = 1 << 5  # crm, crea, crc, coren, cref, crp, cro
+CFP = 1 << 6
+CNH = 1 << 7
+RENAVAM = 1 << 8
+RESERVISTA = 1 << 9
+MATRICULA = 1 << 10
+CTPS = 1 << 11
+SERIE = 1 << 12
+USUARIO = 1 << 13
+LOGIN = 1 << 14
+
+PALAVRAS_CHAVE: Dict[int, Tuple[str, ...]] = {
+    PIX: ("pix",),
+    OAB: ("oab",),
+    CONSELHO_CR: ("cr",),
+    CFP: ("cfp",),
+    CNH: ("cnh",),
+    RENAVAM: ("renavam",),
+    RESERVISTA: ("reservista",),
+    MATRICULA: ("matricula", "matrícula"),
+    CTPS: ("ctps",),
+    SERIE: ("série",),
+    USUARIO: ("usuario", "usuário"),
+    LOGIN: ("login",),
+}
+
+# Reconhecedor → alternativas (basta uma ter todos os bits presentes)
+REQUISITOS: Dict[str, Tuple[int, ...]] = {
+    "BrazilCpfRecognizer": (DIGITO,),
+    "BrazilRgRecognizer": (DIGITO,),
+    "BrazilCepRecognizer": (DIGITO,),
+    "BrazilPhoneRecognizer": (DIGITO,),
+    "BrazilGenericPhoneRecognizer": (DIGITO,),
+    "BrazilCnpjRecognizer": (DIGITO,),
+    "BrazilEmailRecognizer": (ARROBA,),
+    "BrazilDateOfBirthRecognizer": (DIGITO,),
+    "BrazilAgeRecognizer": (DIGITO,),
+    "BrazilBankAccountRecognizer": (DIGITO,),
+    "BrazilContractNumberRecognizer": (DIGITO,),
+    "BrazilVehiclePlateRecognizer": (DIGITO,),
+    "BrazilGeolocationRecognizer": (DIGITO,),
+    "BrazilUsernameRecognizer": (USUARIO, LOGIN),
+    "BrazilIpAddressRecognizer": (DIGITO,),
+    "BrazilVoterIdRecognizer": (DIGITO,),
+    "BrazilWorkCardRecognizer": (DIGITO | SERIE, DIGITO | CTPS),
+    "BrazilDriverLicenseRecognizer": (DIGITO | CNH,),
+    "BrazilPisPasepRecognizer": (DIGITO,),
+    "BrazilCnsRecognizer": (DIGITO,),
+    "BrazilPassportRecognizer": (DIGITO,),
+    "BrazilReservistaRecognizer": (DIGITO | RESERVISTA,),
+    "BrazilProfessionalRegistryRecognizer": (DIGITO | OAB, DIGITO | CONSELHO_CR, DIGITO | CFP),
+    # Chave aleatória (hex com hífens) ou "chave pix"
+    "BrazilPixKeyRecognizer": (HIFEN, PIX),
+    "BrazilRenavamRecognizer": (DIGITO | RENAVAM,),
+    "BrazilSchoolRegistrationRecognizer": (DIGITO | MATRICULA,),
+    "BrazilBenefitNumberRecognizer": (DIGITO,),
+}
+
+
+def caracteristicas(texto: str) -> int:
+    """Bitset das características presentes em `texto`"""
+    caracteres = set(texto)
+    bits = 0
+    # isdecimal = categoria Nd, a mesma do \d das regex
+    if any(c.isdecimal() for c in caracteres):
+        bits |= DIGITO
+    if "@" in caracteres:
+        bits |= ARROBA
+    if "-" in caracteres:
+        bits |= HIFEN
+
+    # "İ" casa com "i" no IGNORECASE, mas o casefold dele é "i̇" (dois caracteres)
+    dobrado = (texto.replace("İ", "i") if "İ" in caracteres else texto).casefold()
+    for bit, termos in PALAVRAS_CHAVE.items():
+        if any(termo in dobrado for termo in termos):
+            bits |= bit
+    return bits
+
+
+def aplicavel(reconhecedor: EntityRecognizer, bits: int) -> bool:
+    """False se nenhum padrão do reconhecedor pode casar em um texto com `bits`"""
+    alternativas = REQUISITOS.get(reconhecedor.name)
+    if alternativas is None:
+        return True
+    return any(alternativa & bits == alternativa for alternativa in alternativas)
+
+
+# ============================================================================
+# TEXTO EM ANÁLISE
+# ============================================================================
+# Características do texto do analyze() em andamento (None = sem pré-filtro)
+_bits: ContextVar[Optional[int]] = ContextVar("prefiltro_bits", default=None)
+
+
+@contextmanager
+def prefiltrar(texto: str) -> Iterator[None]:
+    """Registra as características de `texto` enquanto o bloco executa"""
+    token = _bits.set(caracteristicas(texto) if PREFILTRO_ATIVO else None)
+    try:
+        yield
+    finally:
+        _bits.reset(token)
+
+
+def bits_atuais() -> Optional[int]:
+    return _bits.get()
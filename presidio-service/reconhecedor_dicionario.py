@@ -0,0 +1,225 @@
+"""
+Reconhecedor por Dicionário (dados sensíveis LGPD)
+
+Os reconhecedores de saúde, religião, origem étnica, opinião política,
+orientação sexual e filiação sindical eram alternâncias `\\b(termo|termo|...)\\b`:
+o motor de regex testa as alternativas em cada posição do texto, e o custo
+cresce com o vocabulário.
+
+Aqui cada conjunto de termos (TermosDicionario) vira um caminho em uma trie de
+palavras:
+
+- O texto é dividido em palavras (`\\w+`, mesmo `\\b` das regex) uma vez por
+  texto (por thread), e cada palavra é lida na visão canônica do texto
+  (texto_canonico.py): minúsculas e sem acentos ("Hipertensão" →
+  "hipertensao"). Os termos passam pela mesma normalização, então a grafia
+  com ou sem acento casa sem listar as variantes ([aã])
+- Para cada palavra do texto, a trie é percorrida enquanto as palavras
+  seguintes (separadas só por espaços, como `\\s+`) continuam um termo: o
+  custo por palavra depende do tamanho do maior termo, não do vocabulário
+- Termos com `cauda` (ex.: "filiado ao sindicato" + nome do sindicato) casam
+  a regex da cauda logo após a âncora
+
+Como no finditer, os matches de um mesmo conjunto não se sobrepõem; na mesma
+posição vence o termo mais longo. Tipos de entidade, scores e nomes dos
+padrões são os dos reconhecedores de regex que estes substituem.
+"""
+import logging
+import threading
+from functools import lru_cache
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import regex
+from presidio_analyzer import EntityRecognizer, PatternRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+from custo_reconhecedores import contar_matches
+from sobreposicoes import remover_duplicatas
+from texto_canonico import dobrar, texto_canonico
+
+logger = logging.getLogger(__name__)
+
+# Palavras do texto (mesma definição de \w e \b das regex dos padrões)
+PALAVRA = regex.compile(r"\w+")
+
+# Flags das regex de cauda (as mesmas do PatternRecognizer)
+FLAGS_CAUDA = regex.DOTALL | regex.MULTILINE | regex.IGNORECASE
+
+# Chave dos conjuntos que terminam em um nó da trie (palavras nunca são None)
+_FIM = None
+
+
+@lru_cache(maxsize=65536)
+def normalizar(palavra: str) -> str:
+    """Palavra em minúsculas e sem acentos ("Ação" → "acao")"""
+    return dobrar(palavra)
+
+
+def frases(*partes: Sequence[str]) -> List[str]:
+    """
+    Todas as combinações das partes, em ordem (parte "" = opcional)
+
+    frases(["histórico", "diagnóstico"], ["de", ""], ["asma"]) →
+    ["histórico de asma", "histórico asma", "diagnóstico de asma", "diagnóstico asma"]
+    """
+    return [" ".join(p for p in combinacao if p) for combinacao in product(*partes)]
+
+
+class TermosDicionario:
+    """
+    Conjunto de termos de um reconhecedor (ocupa o lugar de um Pattern)
+
+    Args:
+        name: Nome do padrão (aparece na explicação do resultado)
+        termos: Termos de uma ou mais palavras
+        score: Score dos resultados
+        cauda: Regex opcional casada logo após o termo (o resultado inclui a cauda)
+    """
+
+    def __init__(self, name: str, termos: Sequence[str], score: float, cauda: Optional[str] = None):
+        self.name = name
+        self.termos = list(termos)
+        self.score = score
+        self.cauda = cauda
+        self.cauda_compilada = regex.compile(cauda, FLAGS_CAUDA) if cauda else None
+
+
+# ============================================================================
+# PALAVRAS DO TEXTO
+# ============================================================================
+_local = threading.local()
+
+
+def palavras_do_texto(texto: str) -> Tuple[List[int], List[int], List[str]]:
+    """
+    (inícios, fins, palavras normalizadas) de `texto`, calculados uma vez por
+    texto (por thread): os demais reconhecedores de dicionário reaproveitam
+    """
+    if getattr(_local, "texto", None) is not texto:
+        canonico = texto_canonico(texto)
+        inicios, fins, palavras = [], [], []
+        for m in PALAVRA.finditer(texto):
+            inicios.append(m.start())
+            fins.append(m.end())
+            palavras.append(canonico.trecho(m.start(), m.end()))
+        _local.texto = texto
+        _local.palavras = (inicios, fins, palavras)
+    return _local.palavras
+
+
+# ============================================================================
+# RECONHECEDOR
+# ============================================================================
+class ReconhecedorDicionario(EntityRecognizer):
+    """
+    Reconhecedor de termos por trie de palavras normalizadas
+
+    Args:
+        supported_entity: Tipo de entidade (ex.: BR_HEALTH_DATA)
+        termos: Conjuntos de termos (TermosDicionario)
+        context: Palavras de contexto (realce por contexto do Presidio)
+    """
+
+    def __init__(
+        self,
+        supported_entity: str,
+        termos: List[TermosDicionario],
+        context: Optional[List[str]] = None,
+        supported_language: str = "pt",
+        name: Optional[str] = None,
+    ):
+        self.termos = termos
+        super().__init__(
+            supported_entities=[supported_entity],
+            supported_language=supported_language,
+            name=name,
+            context=context,
+        )
+        self._raiz: Dict = {}
+        for indice, conjunto in enumerate(termos):
+            for termo in conjunto.termos:
+                no = self._raiz
+                for palavra in PALAVRA.findall(termo):
+                    no = no.setdefault(normalizar(palavra), {})
+                indices = no.setdefault(_FIM, [])
+                if indice not in indices:
+                    indices.append(indice)
+
+    def load(self) -> None:
+        pass
+
+    def analyze(
+        self, text: str, entities: List[str], nlp_artifacts: Optional[NlpArtifacts] = None
+    ) -> List[RecognizerResult]:
+        inicios, fins, palavras = palavras_do_texto(text)
+        raiz = self._raiz
+        # Fim do último match de cada conjunto (matches de um conjunto não se sobrepõem)
+        ultimo_fim = [0] * len(self.termos)
+        # Termos encontrados por conjunto, antes da cauda e das sobreposições (custo_reconhecedores.py)
+        encontrados_por_conjunto = [0] * len(self.termos)
+        results = []
+
+        for i, palavra in enumerate(palavras):
+            no = raiz.get(palavra)
+            if no is None:
+                continue
+
+            # Conjunto → fins (em palavras) dos termos que começam em i, do mais curto ao mais longo
+            encontrados: Dict[int, List[int]] = {}
+            j = i
+            while True:
+                for indice in no.get(_FIM, ()):
+                    encontrados.setdefault(indice, []).append(j)
+                j += 1
+                if j >= len(palavras) or not text[fins[j - 1]:inicios[j]].isspace():
+                    break
+                no = no.get(palavras[j])
+                if no is None:
+                    break
+
+            inicio = inicios[i]
+            for indice, fins_termo in encontrados.items():
+                encontrados_por_conjunto[indice] += 1
+                if inicio < ultimo_fim[indice]:
+                    continue
+                fim = self._fim_do_match(text, self.termos[indice], [fins[k] for k in reversed(fins_termo)])
+                if fim is not None:
+                    ultimo_fim[indice] = fim
+                    results.append(self._resultado(self.termos[indice], inicio, fim))
+
+        for conjunto, quantidade in zip(self.termos, encontrados_por_conjunto):
+            contar_matches(self.name, conjunto.name, quantidade)
+        return remover_duplicatas(results)
+
+    @staticmethod
+    def _fim_do_match(texto: str, conjunto: TermosDicionario, fins: List[int]) -> Optional[int]:
+        """Fim do match (termo mais longo cuja cauda, se houver, casa) ou None"""
+        if conjunto.cauda_compilada is None:
+            return fins[0]
+        for fim in fins:
+            m = conjunto.cauda_compilada.match(texto, fim)
+            if m:
+                return m.end()
+        return None
+
+    def _resultado(self, conjunto: TermosDicionario, inicio: int, fim: int) -> RecognizerResult:
+        explicacao = PatternRecognizer.build_regex_explanation(
+            self.name,
+            conjunto.name,
+            conjunto.cauda,
+            conjunto.score,
+            None,
+            FLAGS_CAUDA,
+        )
+        return RecognizerResult(
+            entity_type=self.supported_entities[0],
+            start=inicio,
+            end=fim,
+            score=conjunto.score,
+            analysis_explanation=explicacao,
+            recognition_metadata={
+                RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
+            },
+        )
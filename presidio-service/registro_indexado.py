@@ -0,0 +1,112 @@
+"""
+Registro de Reconhecedores Indexado por Entidade
+
+O RecognizerRegistry do Presidio percorre e filtra a lista inteira de
+reconhecedores (37+) para cada entidade pedida, em toda chamada de analyze().
+Com a lista padrão de 44 entidades são ~1600 comparações por requisição - e
+um aviso no log para cada entidade sem reconhecedor.
+
+O RegistroIndexado mantém:
+- um índice (idioma, entidade) → reconhecedores, montado uma única vez
+- a lista resolvida para cada (idioma, conjunto de entidades) já pedido
+
+Assim uma requisição com ["BR_CPF", "EMAIL_ADDRESS"] recebe só esses dois
+reconhecedores com um lookup em dicionário. Os caches são refeitos quando a
+lista de reconhecedores muda (add_recognizer, remove_recognizer, etc.).
+
+Dentro de um analyze() com pré-filtro (prefiltro.py), a lista entregue deixa
+de fora os reconhecedores que não podem casar no texto (ex.: sem dígitos, os
+de documentos numéricos).
+"""
+import logging
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from presidio_analyzer import EntityRecognizer, RecognizerRegistry
+
+from prefiltro import aplicavel, bits_atuais
+
+logger = logging.getLogger(__name__)
+
+# Conjuntos de entidades distintos mantidos em cache (as requisições escolhem
+# livremente as entidades; o limite evita crescimento sem fim)
+MAX_CONJUNTOS_EM_CACHE = 256
+
+
+class RegistroIndexado(RecognizerRegistry):
+    """
+    RecognizerRegistry com índice por entidade e cache por conjunto de entidades
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._assinatura = None
+        self._indice: Dict[Tuple[str, str], List[EntityRecognizer]] = {}
+        self._resolvidos: Dict[Tuple[str, FrozenSet[str], bool], List[EntityRecognizer]] = {}
+
+    def _validar_caches(self) -> None:
+        """Reconstrói o índice se a lista de reconhecedores mudou desde a última consulta"""
+        # remove_recognizer troca a lista; add/load_predefined a estendem
+        assinatura = (id(self.recognizers), len(self.recognizers))
+        if assinatura == self._assinatura:
+            return
+
+        indice: Dict[Tuple[str, str], List[EntityRecognizer]] = {}
+        for reconhecedor in self.recognizers:
+            for entidade in reconhecedor.supported_entities:
+                indice.setdefault((reconhecedor.supported_language, entidade), []).append(reconhecedor)
+
+        self._indice = indice
+        self._resolvidos = {}
+        self._assinatura = assinatura
+        logger.debug(f"Índice de reconhecedores: {len(self.recognizers)} reconhecedores, {len(indice)} entradas")
+
+    def get_recognizers(
+        self,
+        language: str,
+        entities: Optional[List[str]] = None,
+        all_fields: bool = False,
+        ad_hoc_recognizers: Optional[List[EntityRecognizer]] = None,
+    ) -> List[EntityRecognizer]:
+        """Mesmo contrato de RecognizerRegistry.get_recognizers, resolvido pelo índice"""
+        # Reconhecedores ad hoc mudam a cada requisição: sem cache
+        if ad_hoc_recognizers:
+            return super().get_recognizers(language, entities, all_fields, ad_hoc_recognizers)
+
+        if language is None:
+            raise ValueError("No language provided")
+        if entities is None and all_fields is False:
+            raise ValueError("No entities provided")
+
+        self._validar_caches()
+        chave = (language, frozenset(entities) if not all_fields else frozenset(), all_fields)
+        resolvidos = self._resolvidos.get(chave)
+
+        if resolvidos is None:
+            if all_fields:
+                resolvidos = [r for r in self.recognizers if r.supported_language == language]
+            else:
+                selecionados = set()
+                for entidade in chave[1]:
+                    subconjunto = self._indice.get((language, entidade))
+                    if subconjunto:
+                        selecionados.update(subconjunto)
+                    else:
+                        logger.warning(
+                            "Entity %s doesn't have the corresponding recognizer in language : %s",
+                            entidade,
+                            language,
+                        )
+                # Ordem do registro: resultado determinístico entre chamadas
+                resolvidos = [r for r in self.recognizers if r in selecionados]
+
+            if not resolvidos:
+                raise ValueError("No matching recognizers were found to serve the request.")
+            if len(self._resolvidos) >= MAX_CONJUNTOS_EM_CACHE:
+                self._resolvidos = {}
+            self._resolvidos[chave] = resolvidos
+
+        bits = bits_atuais()
+        if bits is not None:
+            return [r for r in resolvidos if aplicavel(r, bits)]
+        # Cópia: quem chama pode estender a lista (ad hoc) sem afetar o cache
+        return list(resolvidos)
@@ -0,0 +1,270 @@
+"""
+Servidor de Produção Pre-fork - modelos carregados uma vez, compartilhados copy-on-write
+
+Com `uvicorn --workers N` cada worker importa a aplicação do zero e carrega de
+novo o pt_core_news_lg, o NameDataset e os 37 reconhecedores: a memória cresce
+linearmente com o número de workers.
+
+Aqui o processo master:
+1. Carrega os motores uma única vez (pipeline.criar_motores + NameDataset no import)
+2. Chama gc.freeze() - os objetos já carregados vão para a geração permanente e
+   o coletor dos filhos não escreve nos cabeçalhos deles (o que forçaria a cópia
+   das páginas)
+3. Abre o socket e faz fork de N workers, cada um rodando um uvicorn.Server
+   sobre o socket herdado
+4. Supervisiona os workers (reinicia os que morrem) e reporta periodicamente a
+   memória de cada um (RSS, PSS, compartilhada e privada via /proc)
+
+Cada worker atende com um executor de 1 thread que usa os motores herdados
+(pipeline.obter_motores); a escala entre núcleos vem do número de processos.
+
+Uso:
+    python server.py --workers 4 --port 8000
+    PRESIDIO_PREFORK_WORKERS=4 python main.py
+
+Configuração por variáveis de ambiente:
+- PRESIDIO_PREFORK_WORKERS: número de processos (padrão em main.py: 1 = uvicorn.run simples)
+- PRESIDIO_RELATORIO_MEMORIA_S: intervalo do relatório de memória (padrão: 60 s, 0 desliga)
+
+Requer os.fork (Linux/macOS). Sem fork, cai para uvicorn.run com um processo.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+import pipeline
+
+logger = logging.getLogger(__name__)
+
+# Campos de /proc/<pid>/smaps_rollup (kB)
+CAMPOS_SMAPS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+# Tempo máximo para os workers terminarem as requisições em andamento
+TIMEOUT_ENCERRAMENTO_S = 30
+
+
+# ============================================================================
+# MEMÓRIA POR PROCESSO
+# ============================================================================
+def memoria_processo(pid: int) -> Optional[Dict[str, int]]:
+    """
+    Lê a memória de um processo em kB
+
+    PSS divide cada página compartilhada entre os processos que a mapeiam:
+    a soma do PSS dos workers é o consumo real, enquanto a soma do RSS conta
+    os modelos compartilhados N vezes.
+
+    Returns:
+        {"rss", "pss", "compartilhada", "privada"} ou None se o processo não existe
+    """
+    valores = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for linha in f:
+                partes = linha.split()
+                campo = partes[0].rstrip(":")
+                if campo in CAMPOS_SMAPS:
+                    valores[campo] = int(partes[1])
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        # Processo já terminou ou sistema sem /proc/<pid>/smaps_rollup (kernel < 4.14, macOS)
+        return None
+
+    return {
+        "rss": valores.get("Rss", 0),
+        "pss": valores.get("Pss", 0),
+        "compartilhada": valores.get("Shared_Clean", 0) + valores.get("Shared_Dirty", 0),
+        "privada": valores.get("Private_Clean", 0) + valores.get("Private_Dirty", 0),
+    }
+
+
+def _mb(kb: int) -> str:
+    return f"{kb / 1024:.0f} MB"
+
+
+def reportar_memoria(workers: Dict[int, int]) -> None:
+    """Loga RSS/PSS/compartilhada/privada do master e de cada worker"""
+    total_rss = 0
+    total_pss = 0
+    processos = [("master", os.getpid())] + [
+        (f"worker {indice}", pid) for pid, indice in sorted(workers.items(), key=lambda item: item[1])
+    ]
+    for nome, pid in processos:
+        memoria = memoria_processo(pid)
+        if memoria is None:
+            continue
+        total_rss += memoria["rss"]
+        total_pss += memoria["pss"]
+        logger.info(
+            f"🧠 {nome} (pid {pid}): RSS {_mb(memoria['rss'])} | PSS {_mb(memoria['pss'])} | "
+            f"compartilhada {_mb(memoria['compartilhada'])} | privada {_mb(memoria['privada'])}"
+        )
+    if total_rss:
+        logger.info(
+            f"🧠 Total: soma RSS {_mb(total_rss)} | soma PSS {_mb(total_pss)} (consumo real) | "
+            f"economia pelo compartilhamento {_mb(total_rss - total_pss)}"
+        )
+
+
+# ============================================================================
+# MASTER / WORKERS
+# ============================================================================
+def _criar_socket(host: str, port: int) -> socket.socket:
+    """Socket de escuta criado no master e herdado por todos os workers"""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _executar_worker(app, sock: socket.socket, indice: int) -> None:
+    """Corpo do processo filho: uvicorn sobre o socket herdado (nunca retorna)"""
+    codigo = 0
+    try:
+        # Handlers do master não valem no filho; o uvicorn instala os seus
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        gc.enable()
+
+        logger.info(f"👷 Worker {indice} iniciado (pid {os.getpid()})")
+        config = uvicorn.Config(app, log_level="info")
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException as e:
+        logger.error(f"Worker {indice} falhou: {e}")
+        codigo = 1
+    finally:
+        # _exit: não executa atexit/finalizadores herdados do master
+        os._exit(codigo)
+
+
+def _iniciar_worker(app, sock: socket.socket, indice: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        _executar_worker(app, sock, indice)
+    return pid
+
+
+def _encerrar_workers(workers: Dict[int, int]) -> None:
+    """SIGTERM (encerramento gracioso do uvicorn) e SIGKILL após o timeout"""
+    for pid in workers:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    limite = time.monotonic() + TIMEOUT_ENCERRAMENTO_S
+    while workers and time.monotonic() < limite:
+        pid, _ = os.waitpid(-1, os.WNOHANG)
+        if pid:
+            workers.pop(pid, None)
+        else:
+            time.sleep(0.1)
+
+    for pid in workers:
+        logger.warning(f"Worker pid {pid} não encerrou em {TIMEOUT_ENCERRAMENTO_S}s - SIGKILL")
+        try:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+
+
+def iniciar_servidor(app, host: str = "0.0.0.0", port: int = 8000, workers: int = 1) -> None:
+    """
+    Ponto de entrada de produção
+
+    Args:
+        app: Aplicação FastAPI (main.app)
+        host/port: Endereço de escuta
+        workers: Número de processos; com 1 (ou sem os.fork) usa uvicorn.run simples
+    """
+    if workers <= 1 or not hasattr(os, "fork"):
+        if workers > 1:
+            logger.warning("os.fork indisponível nesta plataforma - iniciando um único processo")
+        logger.info(f"Iniciando servidor Presidio Service na porta {port}...")
+        uvicorn.run(app, host=host, port=port)
+        return
+
+    # Cada worker é um processo com 1 thread de análise sobre os motores herdados:
+    # mais threads disputariam os mesmos objetos e o modo "process" recarregaria os modelos
+    if os.getenv("PRESIDIO_EXECUTOR", "thread") != "thread" or os.getenv("PRESIDIO_WORKERS", "1") != "1":
+        logger.warning("Modo pre-fork: ignorando PRESIDIO_EXECUTOR/PRESIDIO_WORKERS (1 thread por processo)")
+    os.environ["PRESIDIO_EXECUTOR"] = "thread"
+    os.environ["PRESIDIO_WORKERS"] = "1"
+
+    # 1. Carregar os modelos uma única vez, sem coletas no meio da carga
+    inicio = time.perf_counter()
+    gc.disable()
+    pipeline.compartilhar_motores(pipeline.criar_motores())
+    logger.info(f"📚 Motores carregados no master em {time.perf_counter() - inicio:.1f}s")
+
+    # 2. Congelar o heap: o GC dos filhos não toca (nem copia) as páginas dos modelos
+    gc.freeze()
+    logger.info(f"🧊 gc.freeze(): {gc.get_freeze_count()} objetos na geração permanente")
+
+    # 3. Socket compartilhado + fork dos workers
+    sock = _criar_socket(host, port)
+    ativos: Dict[int, int] = {}
+    for indice in range(workers):
+        ativos[_iniciar_worker(app, sock, indice)] = indice
+    logger.info(f"🚀 Servidor pre-fork em {host}:{port} com {workers} workers")
+
+    encerrando = False
+
+    def _sinal_encerrar(signum, frame):
+        nonlocal encerrando
+        encerrando = True
+
+    signal.signal(signal.SIGTERM, _sinal_encerrar)
+    signal.signal(signal.SIGINT, _sinal_encerrar)
+
+    # 4. Supervisão + relatório de memória
+    intervalo_relatorio = float(os.getenv("PRESIDIO_RELATORIO_MEMORIA_S", "60"))
+    # Primeiro relatório logo após o startup (workers já aquecidos)
+    proximo_relatorio = time.monotonic() + min(intervalo_relatorio, 10) if intervalo_relatorio > 0 else None
+
+    while not encerrando:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+
+        if pid and pid in ativos:
+            indice = ativos.pop(pid)
+            logger.warning(f"⚠️  Worker {indice} (pid {pid}) terminou com status {status} - reiniciando")
+            time.sleep(1)
+            ativos[_iniciar_worker(app, sock, indice)] = indice
+            continue
+
+        if proximo_relatorio is not None and time.monotonic() >= proximo_relatorio:
+            reportar_memoria(ativos)
+            proximo_relatorio = time.monotonic() + intervalo_relatorio
+
+        time.sleep(0.5)
+
+    logger.info("Encerrando workers...")
+    _encerrar_workers(ativos)
+    sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Presidio Service - servidor de produção pre-fork")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int,
+        default=int(os.getenv("PRESIDIO_PREFORK_WORKERS", str(os.cpu_count() or 1))),
+        help="Processos (padrão: PRESIDIO_PREFORK_WORKERS ou número de CPUs)",
+    )
+    args = parser.parse_args()
+
+    from main import app
+    iniciar_servidor(app, host=args.host, port=args.port, workers=args.workers)
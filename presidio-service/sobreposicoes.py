@@ -0,0 +1,309 @@
+"""
+Resolução de Sobreposições - deduplicação e prioridade entre tipos por varredura
+
+Três pontos do pipeline comparavam resultados todos contra todos ou só por
+span idêntico:
+
+- EntityRecognizer.remove_duplicates (mesclar_resultados das janelas e
+  reconhecedores de dicionário) testa cada resultado contra todos os já
+  mantidos: O(n²), segundos em documentos longos com milhares de detecções
+- O filtro do pipeline agrupava os resultados só por span idêntico
+  `(start, end)`: um PERSON que cobre parte de um e-mail escapava da
+  prioridade EMAIL > PERSON
+- Spans PERSON/LOCATION parcialmente sobrepostos (spaCy, BrazilNameRecognizer,
+  GeradorCandidatosNome) passavam cada um pelo validador. Spans idênticos ou
+  contidos do mesmo tipo já saem no remove_duplicates do AnalyzerEngine; os
+  parcialmente sobrepostos não
+
+Aqui os três viram varreduras sobre os intervalos ordenados por início:
+
+- remover_duplicatas: mesma saída do remove_duplicates do Presidio (mesma
+  ordem, mesmo critério de "contido em outro do mesmo tipo"), com uma árvore
+  de Fenwick de máximo por tipo - "algum mantido começa antes e termina
+  depois?" vira uma consulta O(log n)
+- PrioridadesTipo.resolver: antes da validação, recorta dos resultados de tipo
+  dominado a parte coberta por um resultado de tipo prioritário - busca binária
+  nos intervalos (fundidos) do tipo dominante. Só sai o que fica inteiro dentro
+  dele: em "Maria Silva maria.silva@gov.br", o PERSON "Maria Silva maria.silva"
+  vira "Maria Silva" e o EMAIL fica com o endereço
+- regioes_sobrepostas + escolher_na_regiao: agrupa os resultados do mesmo tipo
+  ligados por sobreposição (uma região) e valida os membros do mais longo para o
+  mais curto, pulando os contidos em um já aceito; os aceitos sobrepostos viram
+  a união (o que o AnonymizerEngine faria com eles). No caso comum a região
+  inteira tem um único veredito
+
+Colisões entre identificadores numéricos (CPF × telefone, CEP × RG) não
+entram aqui: a malha numérica (malha_numerica.py) decide por dígito
+verificador e máscara depois da validação.
+
+Configuração por variável de ambiente:
+- PRESIDIO_PRIORIDADES: regras "DOMINANTE>DOMINADO" separadas por vírgula;
+  cadeias valem para todos os seguintes ("A>B>C" = A>B, A>C, B>C)
+  (padrão: EMAIL_ADDRESS>PERSON)
+"""
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Set, Tuple
+
+from presidio_analyzer import RecognizerResult
+
+logger = logging.getLogger(__name__)
+
+PRIORIDADES_PADRAO = "EMAIL_ADDRESS>PERSON"
+
+
+# ============================================================================
+# DEDUPLICAÇÃO (remove_duplicates do Presidio)
+# ============================================================================
+class _MaximoPrefixo:
+    """Árvore de Fenwick: maior fim entre os intervalos com início até i"""
+
+    def __init__(self, tamanho: int):
+        self._arvore = [-1] * (tamanho + 1)
+
+    def inserir(self, i: int, fim: int) -> None:
+        i += 1
+        while i < len(self._arvore):
+            if self._arvore[i] < fim:
+                self._arvore[i] = fim
+            i += i & -i
+
+    def maximo(self, i: int) -> int:
+        i += 1
+        maior = -1
+        while i > 0:
+            if self._arvore[i] > maior:
+                maior = self._arvore[i]
+            i -= i & -i
+        return maior
+
+
+def remover_duplicatas(resultados: List[RecognizerResult]) -> List[RecognizerResult]:
+    """
+    Mesmo resultado de EntityRecognizer.remove_duplicates, em O(n log n)
+
+    Remove resultados iguais (span, tipo e score), de score 0 e contidos em
+    outro do mesmo tipo com score maior (ou igual e que vem antes na ordem
+    score ↓, início ↑, tamanho ↓). Entre iguais fica o primeiro.
+    """
+    unicos = list(dict.fromkeys(resultados))
+    unicos.sort(key=lambda r: (-r.score, r.start, -(r.end - r.start)))
+
+    # Inícios distintos de cada tipo (coordenadas da árvore)
+    inicios: Dict[str, List[int]] = {}
+    for r in unicos:
+        inicios.setdefault(r.entity_type, []).append(r.start)
+    for tipo, lista in inicios.items():
+        inicios[tipo] = sorted(set(lista))
+    arvores = {tipo: _MaximoPrefixo(len(lista)) for tipo, lista in inicios.items()}
+
+    mantidos = []
+    for r in unicos:
+        if r.score == 0:
+            continue
+        indice = bisect_left(inicios[r.entity_type], r.start)
+        arvore = arvores[r.entity_type]
+        # Contido: algum mantido do mesmo tipo com início <= r.start e fim >= r.end
+        if arvore.maximo(indice) >= r.end:
+            continue
+        arvore.inserir(indice, r.end)
+        mantidos.append(r)
+    return mantidos
+
+
+# ============================================================================
+# PRIORIDADE ENTRE TIPOS
+# ============================================================================
+def ler_prioridades(regras: str) -> Dict[str, Set[str]]:
+    """
+    Tipo dominante → tipos que ele descarta ("EMAIL_ADDRESS>PERSON,BR_CPF>BR_PHONE")
+    """
+    dominados: Dict[str, Set[str]] = {}
+    for regra in regras.split(","):
+        tipos = [tipo.strip() for tipo in regra.split(">") if tipo.strip()]
+        for i, dominante in enumerate(tipos):
+            for dominado in tipos[i + 1:]:
+                if dominado == dominante:
+                    raise ValueError(f"Tipo com prioridade sobre si mesmo: {regra!r}")
+                dominados.setdefault(dominante, set()).add(dominado)
+    return dominados
+
+
+class PrioridadesTipo:
+    """
+    Recorta dos resultados a parte sobreposta a um resultado de tipo
+    prioritário (e descarta os que ficam inteiros dentro dele)
+    """
+
+    def __init__(self, regras: str = PRIORIDADES_PADRAO):
+        """
+        Args:
+            regras: Regras "DOMINANTE>DOMINADO" separadas por vírgula
+        """
+        self.dominados = ler_prioridades(regras)
+        # Dominado → dominantes (consulta por tipo do resultado)
+        self.dominantes: Dict[str, Set[str]] = {}
+        for dominante, tipos in self.dominados.items():
+            for tipo in tipos:
+                self.dominantes.setdefault(tipo, set()).add(dominante)
+
+    def resolver(self, resultados: List[RecognizerResult], texto: str) -> List[RecognizerResult]:
+        """
+        Resultados com a parte sobreposta a um de tipo dominante recortada
+        (ordem mantida). As pontas do que sobra perdem espaços e pontuação;
+        se sobrar só isso, o resultado sai.
+        """
+        if not self.dominantes:
+            return resultados
+        tipos_presentes = {r.entity_type for r in resultados}
+        if not any(tipo in tipos_presentes for tipo in self.dominados):
+            return resultados
+
+        # Por tipo dominante: intervalos fundidos (disjuntos), inícios e fins ordenados
+        intervalos: Dict[str, Tuple[List[int], List[int]]] = {}
+        for tipo in self.dominados:
+            fundidos = _fundir([(r.start, r.end) for r in resultados if r.entity_type == tipo])
+            if fundidos:
+                intervalos[tipo] = ([inicio for inicio, _ in fundidos], [fim for _, fim in fundidos])
+
+        mantidos = []
+        for r in resultados:
+            cobertos = self._cobertos(r, intervalos)
+            if not cobertos:
+                mantidos.append(r)
+                continue
+            pedacos = _restos(texto, r.start, r.end, cobertos)
+            logger.debug(
+                f"✂️ {r.entity_type} [{r.start}:{r.end}] sobreposto por tipo prioritário → "
+                f"{[(inicio, fim) for inicio, fim in pedacos] or 'descartado'}"
+            )
+            for inicio, fim in pedacos:
+                mantidos.append(_recortado(r, inicio, fim))
+        return mantidos
+
+    def _cobertos(self, r: RecognizerResult, intervalos: Dict[str, tuple]) -> List[Tuple[int, int]]:
+        """Trechos de `r` cobertos por resultados de tipo dominante (fundidos, ordenados)"""
+        cobertos = []
+        for tipo in self.dominantes.get(r.entity_type, ()):
+            if tipo not in intervalos:
+                continue
+            inicios, fins = intervalos[tipo]
+            # Primeiro intervalo com fim > r.start; segue enquanto começar antes de r.end
+            k = bisect_right(fins, r.start)
+            while k < len(inicios) and inicios[k] < r.end:
+                cobertos.append((max(inicios[k], r.start), min(fins[k], r.end)))
+                k += 1
+        return _fundir(cobertos)
+
+
+def _fundir(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Intervalos ordenados, com os sobrepostos ou encostados fundidos"""
+    fundidos: List[Tuple[int, int]] = []
+    for inicio, fim in sorted(spans):
+        if fundidos and inicio <= fundidos[-1][1]:
+            if fim > fundidos[-1][1]:
+                fundidos[-1] = (fundidos[-1][0], fim)
+        else:
+            fundidos.append((inicio, fim))
+    return fundidos
+
+
+def _restos(texto: str, inicio: int, fim: int, cobertos: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Trechos de [inicio, fim) fora dos cobertos, sem espaços/pontuação nas pontas"""
+    livres = []
+    cursor = inicio
+    for inicio_coberto, fim_coberto in cobertos + [(fim, fim)]:
+        a, b = cursor, inicio_coberto
+        while a < b and not texto[a].isalnum():
+            a += 1
+        while b > a and not texto[b - 1].isalnum():
+            b -= 1
+        if a < b:
+            livres.append((a, b))
+        cursor = max(cursor, fim_coberto)
+    return livres
+
+
+def _recortado(r: RecognizerResult, inicio: int, fim: int) -> RecognizerResult:
+    """Cópia de `r` com outro span (mesmo tipo, score, explicação e metadados)"""
+    return RecognizerResult(
+        entity_type=r.entity_type,
+        start=inicio,
+        end=fim,
+        score=r.score,
+        analysis_explanation=r.analysis_explanation,
+        recognition_metadata=dict(r.recognition_metadata or {}),
+    )
+
+
+# ============================================================================
+# REGIÕES DO MESMO TIPO (um veredito por região)
+# ============================================================================
+def regioes_sobrepostas(resultados: List[RecognizerResult], tipos) -> Dict[int, List[RecognizerResult]]:
+    """
+    id(resultado) → região: resultados do mesmo tipo (entre `tipos`) ligados
+    por sobreposição, do mais longo para o mais curto (score ↓ no empate)
+
+    Varredura por início: o resultado entra na região aberta se começar antes
+    do maior fim visto nela. Resultados sem sobreposição não entram no dicionário.
+    """
+    por_tipo: Dict[str, List[RecognizerResult]] = {}
+    for r in resultados:
+        if r.entity_type in tipos:
+            por_tipo.setdefault(r.entity_type, []).append(r)
+
+    regioes: Dict[int, List[RecognizerResult]] = {}
+    for lista in por_tipo.values():
+        lista.sort(key=lambda r: (r.start, r.end))
+        regiao: List[RecognizerResult] = []
+        fim_regiao = -1
+        for r in lista + [None]:
+            if r is not None and r.start < fim_regiao:
+                regiao.append(r)
+                fim_regiao = max(fim_regiao, r.end)
+                continue
+            if len(regiao) > 1:
+                regiao.sort(key=lambda m: (-(m.end - m.start), -m.score, m.start))
+                for membro in regiao:
+                    regioes[id(membro)] = regiao
+            if r is not None:
+                regiao = [r]
+                fim_regiao = r.end
+    return regioes
+
+
+def escolher_na_regiao(
+    regiao: List[RecognizerResult], aceitar: Callable[[RecognizerResult], bool]
+) -> List[RecognizerResult]:
+    """
+    Aceitos de uma região, com os sobrepostos fundidos na união (score máximo)
+
+    Os membros são validados na ordem da região; membro contido em um já
+    aceito não é validado (não acrescenta cobertura). A cobertura final é a
+    mesma de validar todos e deixar o AnonymizerEngine fundir os aceitos.
+    """
+    aceitos: List[RecognizerResult] = []
+    for membro in regiao:
+        if any(a.start <= membro.start and membro.end <= a.end for a in aceitos):
+            continue
+        if aceitar(membro):
+            aceitos.append(membro)
+
+    aceitos.sort(key=lambda r: r.start)
+    fundidos: List[RecognizerResult] = []
+    for r in aceitos:
+        ultimo = fundidos[-1] if fundidos else None
+        if ultimo is not None and r.start < ultimo.end:
+            base = ultimo if ultimo.score >= r.score else r
+            fundido = _recortado(base, ultimo.start, max(ultimo.end, r.end))
+            fundido.score = max(ultimo.score, r.score)
+            fundidos[-1] = fundido
+        else:
+            fundidos.append(r)
+    return fundidos
+
+
+def criar_prioridades_do_ambiente() -> PrioridadesTipo:
+    """Cria as prioridades a partir de PRESIDIO_PRIORIDADES"""
+    return PrioridadesTipo(os.getenv("PRESIDIO_PRIORIDADES", PRIORIDADES_PADRAO))
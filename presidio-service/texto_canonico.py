@@ -0,0 +1,113 @@
+"""
+Visão Canônica do Texto - minúsculas sem acento, com mapa de posições
+
+Cada etapa normalizava de novo os próprios trechos: o filtro do pipeline
+chamava .lower() em cada entidade, o NameValidator em cada candidato, o
+índice de contexto no texto inteiro, os dicionários em cada palavra. E como
+as comparações eram só em minúsculas, as listas guardavam cada palavra duas
+vezes ("fósforo"/"fosforo", "análise"/"analise") - e a que faltava um dos
+dois não casava ("ministerio" não pegava "Ministério").
+
+O TextoCanonico calcula uma vez por texto (por thread) a versão em
+minúsculas e sem acentos - a mesma normalização de
+reconhecedor_dicionario.normalizar - e o mapa de posições entre ela e o
+original:
+
+    texto:    "Secretaria de Saúde"
+    dobrado:  "secretaria de saude"
+
+- trecho(inicio, fim): o trecho texto[inicio:fim] já dobrado, sem cópia
+  extra nem normalização por candidato
+- original(posicao): posição no texto de uma posição do dobrado (para
+  achados feitos no dobrado, como o índice de termos de contexto)
+
+No caso comum (cada caractere vira um caractere) o mapa é a identidade e não
+é guardado. Caracteres decompostos (acento combinante separado) somem e
+caracteres que viram mais de um ("İ") alongam o dobrado; o mapa cobre os dois.
+
+As listas comparadas com o dobrado passam por dobrar() ao serem montadas.
+"""
+import threading
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Optional
+
+
+@lru_cache(maxsize=4096)
+def _dobrar_caractere(caractere: str) -> str:
+    decomposto = unicodedata.normalize("NFD", caractere)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def dobrar(texto: str) -> str:
+    """Texto em minúsculas e sem acentos ("Saúde Pública" → "saude publica")"""
+    minusculo = texto.lower()
+    if minusculo.isascii():
+        return minusculo
+    return "".join(_dobrar_caractere(c) for c in minusculo)
+
+
+class TextoCanonico:
+    """
+    Texto em minúsculas e sem acentos + mapa de posições para o original
+    """
+
+    def __init__(self, texto: str):
+        self.texto = texto
+        # Início, no dobrado, de cada caractere do texto (None = identidade)
+        self._inicios: Optional[List[int]] = None
+
+        minusculo = texto.lower()
+        if len(minusculo) == len(texto):
+            if minusculo.isascii():
+                self.dobrado = minusculo
+                return
+            pedacos = [_dobrar_caractere(c) for c in minusculo]
+        else:
+            # lower() mudou o tamanho ("İ" → "i̇"): caractere a caractere
+            pedacos = [_dobrar_caractere(c.lower()) for c in texto]
+
+        self.dobrado = "".join(pedacos)
+        if len(self.dobrado) == len(texto) and all(len(p) == 1 for p in pedacos):
+            return
+
+        inicios = [0] * (len(texto) + 1)
+        posicao = 0
+        for i, pedaco in enumerate(pedacos):
+            inicios[i] = posicao
+            posicao += len(pedaco)
+        inicios[len(texto)] = posicao
+        self._inicios = inicios
+
+    @property
+    def identidade(self) -> bool:
+        """True se as posições do dobrado são as do texto"""
+        return self._inicios is None
+
+    def posicao(self, original: int) -> int:
+        """Posição no dobrado do caractere `original` do texto"""
+        return original if self._inicios is None else self._inicios[original]
+
+    def original(self, posicao: int) -> int:
+        """Posição no texto do caractere que gerou `posicao` do dobrado"""
+        if self._inicios is None:
+            return posicao
+        return bisect_right(self._inicios, posicao) - 1
+
+    def trecho(self, inicio: int, fim: int) -> str:
+        """texto[inicio:fim] em minúsculas e sem acentos"""
+        if self._inicios is None:
+            return self.dobrado[inicio:fim]
+        return self.dobrado[self._inicios[inicio]:self._inicios[fim]]
+
+
+_local = threading.local()
+
+
+def texto_canonico(texto: str) -> TextoCanonico:
+    """Visão canônica de `texto`, calculada uma vez por texto (por thread)"""
+    canonico = getattr(_local, "canonico", None)
+    if canonico is None or canonico.texto is not texto:
+        canonico = _local.canonico = TextoCanonico(texto)
+    return canonico
@@ -13,16 +13,29 @@ com foco em eliminar falsos positivos através de múltiplas camadas de verifica
 3. PersonLocationFilter: Orquestra a validação integrada de PERSON e LOCATION
 
 Camadas de Proteção:
-- Blacklists definitivas (never_names/never_locations)
+- Blacklists definitivas (never_names/never_locations) e listas de substrings
+  compiladas em autômatos Aho-Corasick (blacklist.py)
 - Validação por componentes (primeiro nome + sobrenome)
-- Análise de contexto (100 chars antes/depois)
+- Análise de contexto (janelas de 40-50 chars antes/depois, termos indexados por documento)
 - Detecção de padrões (artístico, institucional, técnico)
 
 Autor: Sistema de Anonimização LGPD
 """
 import logging
 from typing import Optional, Set
-from functools import lru_cache
+
+from blacklist import AutomatoTermos
+from contexto_documento import indice_termos
+# Países/subdivisões: o PyCountry só é usado através do índice (indice_paises.py)
+from indice_paises import PYCOUNTRY_AVAILABLE, indice_paises
+from localidades import localidades
+from lexico_compacto import carregar_lexico
+from texto_canonico import dobrar, texto_canonico
+from vereditos_token import (
+    VereditoToken,
+    criar_cache_do_ambiente as criar_cache_tokens,
+    criar_cache_locais_do_ambiente,
+)
 
 # ============================================================================
 # IMPORTAÇÕES DE BIBLIOTECAS EXTERNAS
@@ -43,17 +56,14 @@ try:
 except ImportError:
     GEOPY_AVAILABLE = False
 
-# Importar biblioteca de países/localidades
-try:
-    import pycountry
-    PYCOUNTRY_AVAILABLE = True
-except ImportError:
-    PYCOUNTRY_AVAILABLE = False
-
 logger = logging.getLogger(__name__)
 
-# Inicializar NameDataset globalmente (carrega uma vez)
-if NAMES_DATASET_AVAILABLE:
+# Léxico compacto mapeado em memória (construir_lexico_nomes.py); sem ele,
+# carrega o NameDataset inteiro
+name_dataset = carregar_lexico()
+if name_dataset is not None:
+    NAMES_DATASET_AVAILABLE = True
+elif NAMES_DATASET_AVAILABLE:
     try:
         name_dataset = NameDataset()
         logger.info("NameDataset carregado com sucesso - validação robusta de nomes ativada")
@@ -65,6 +75,34 @@ else:
     name_dataset = None
     logger.warning("names-dataset não instalado - validação de nomes limitada")
 
+# Vereditos por palavra compartilhados entre requisições (vereditos_token.py)
+vereditos_tokens = criar_cache_tokens()
+
+# Vereditos de localização independentes do contexto, por texto em minúsculas
+vereditos_locais = criar_cache_locais_do_ambiente()
+LOCAL_REJEITADO = 0
+LOCAL_ACEITO = 1
+LOCAL_DEPENDE_CONTEXTO = 2
+
+
+def recarregar_lexico_nomes() -> bool:
+    """
+    Reabre o léxico compacto de nomes (arquivo regerado por
+    construir_lexico_nomes.py) e invalida os vereditos por palavra
+
+    Returns:
+        True se o léxico foi recarregado
+    """
+    global name_dataset, NAMES_DATASET_AVAILABLE
+    lexico = carregar_lexico()
+    if lexico is None:
+        return False
+    name_dataset = lexico
+    NAMES_DATASET_AVAILABLE = True
+    vereditos_tokens.invalidar()
+    return True
+
+
 # Inicializar Nominatim para geocoding
 if GEOPY_AVAILABLE:
     try:
@@ -79,6 +117,23 @@ else:
     logger.warning("geopy não instalado - validação de localizações limitada")
 
 
+# ============================================================================
+# BLACKLISTS COMPILADAS (Aho-Corasick - ver blacklist.py)
+# ============================================================================
+# Frases de órgãos/instituições: rejeitam o candidato a nome se aparecem em qualquer posição
+INSTITUTIONAL_KEYWORDS = AutomatoTermos([
+    "escola", "universidade", "faculdade", "colegio", "instituto",
+    "centro universitario", "centro de ensino",
+    "politicas publicas", "ministerio", "secretaria de",
+    "prefeitura", "governo do", "tribunal de",
+    "banco de dados", "gestao", "governanca", "administracao",
+    "ouvidoria", "contoladoria", "infraestrutura"
+])
+
+# Sufixos de documento capturados junto com o nome ("Maria Silva CPF")
+DOCUMENT_SUFFIXES = AutomatoTermos([" cpf", " rg", " cnh", " oab", " cnpj"])
+
+
 class NameValidator:
     """
     Validador robusto de nomes usando NameDataset
@@ -86,13 +141,11 @@ class NameValidator:
     """
     
     def __init__(self):
-        self.dataset = name_dataset
-        self.available = NAMES_DATASET_AVAILABLE
         
         # Lista expandida de palavras que NUNCA são nomes (blacklist definitiva)
         self.never_names = {
             # Verbos comuns em documentos administrativos
-            "venho", "solicito", "requeiro", "peço", "peco", "encaminho", "apresento",
+            "venho", "solicito", "requeiro", "peco", "encaminho", "apresento",
             "informo", "comunico", "manifesto", "declaro", "afirmo", "ratifico",
             "pergunto", "questiono", "indago", "consulto", "verifico", "confirmo",
             "gostaria", "quero", "preciso", "necessito", "desejo", "pretendo",
@@ -113,17 +166,16 @@ class NameValidator:
             "carteira de trabalho", "interesse", "ajuda", "ouvidoria", "canal",
             "contoladoria", "assunto", "esbulho", "texto", "superior", "juvenil",
             # Saudações e interjeições - NUNCA SÃO NOMES
-            "ola", "olá", "oi", "bom", "boa", "tarde", "dia", "noite",
+            "ola", "oi", "bom", "boa", "tarde", "dia", "noite",
             "prezados", "prezadas", "caro", "cara", "senhor", "senhora",
             # Siglas de estados/documentos que aparecem sozinhas
             "er", "es", "rj", "sp", "mg", "ba", "pr", "sc", "rs", "go", "df",
             "cpf", "rg", "cnh", "oab", "cnpj", "cep",
             # Termos químicos e ambientais
-            "fosforo", "fósforo", "nitrogenio", "nitrogênio", "oxigenio", "oxigênio",
-            "coliformes", "solidos", "sólidos", "termotolerantes", "amoniacal",
-            "dissolvido", "total", "totais",
+            "fosforo", "nitrogenio", "oxigenio", "coliformes", "solidos",
+            "termotolerantes", "amoniacal", "dissolvido", "total", "totais",
             # Artistas e figuras históricas
-            "athos", "bulsao", "bulsão",
+            "athos", "bulsao",
             # Palavras compostas técnicas
             "governo", "distrito", "federal", "mestrado", "escola", "politicas",
             "instituto", "brasileiro", "ensino", "desenvolvimento", "pesquisa",
@@ -186,7 +238,6 @@ class NameValidator:
             "manuela", "marina", "melissa", "nicole", "olivia", "pietra", "rafaela",
             "raquel", "regina", "rosangela", "sandra", "sophia", "valentina", "yasmin",
             "conceicao", "aparecida", "socorro", "penha", "gloria", "graca", "lourdes",
-            "conceição",  # Versão com acento
             # Nomes compostos comuns (primeira parte)
             "joao", "jose", "maria", "ana", "paulo", "carlos", "pedro", "luiz",
             "marcos", "antonio", "francisco", "luiza", "clara", "eduarda", "gabriela",
@@ -194,7 +245,7 @@ class NameValidator:
             "beto", "betina", "carlinhos", "duda", "juju", "lulu", "nando", "rafa",
             "tati", "vivi", "gabi", "fabi", "dani", "cris", "mari", "leti", "nath",
             "bia", "carol", "cacá", "zeca", "chico", "binho", "nino", "tito",
-            "aura", "ruth", "edson", "walter", "cassandra", "pablo", "lúcio", "lucio",
+            "aura", "ruth", "edson", "walter", "cassandra", "pablo", "lucio",
             "thiago", "conceicao"
         }
         
@@ -203,38 +254,38 @@ class NameValidator:
             # Top 20 (> 1% da população)
             "silva", "santos", "oliveira", "souza", "sousa", "rodrigues", "ferreira", 
             "alves", "pereira", "lima", "gomes", "costa", "ribeiro", "martins",
-            "carvalho", "rocha", "almeida", "nascimento", "araujo", "araújo",
+            "carvalho", "rocha", "almeida", "nascimento", "araujo",
             # Top 21-50
             "melo", "barbosa", "cardoso", "reis", "castro", "andrade", "pinto", 
             "moreira", "freitas", "fernandes", "dias", "cavalcanti", "monteiro", 
             "mendes", "barros", "batista", "tavares", "sampaio", "braga", "cruz",
-            "simoes", "simões", "mota", "franco", "garcia", "moreira", "miranda",
-            "guimaraes", "guimarães", "neves",
+            "simoes", "mota", "franco", "garcia", "moreira", "miranda",
+            "guimaraes", "neves",
             # Top 51-100
-            "correa", "corrêa", "teixeira", "pires", "rosa", "nunes", "borges",
+            "correa", "teixeira", "pires", "rosa", "nunes", "borges",
             "camargo", "valle", "marques", "vasconcelos", "farias", "ramos", "bezerra",
             "cunha", "santiago", "aguiar", "rezende", "moura", "nogueira", "machado",
             "sales", "azevedo", "duarte", "macedo", "vargas", "jesus", "paiva",
-            "magalhaes", "magalhães", "medeiros", "coelho", "xavier", "lourenco",
-            "lourenço", "aragao", "aragão", "siqueira", "fonseca", "goncalves", "gonçalves",
+            "magalhaes", "medeiros", "coelho", "xavier", "lourenco",
+            "aragao", "siqueira", "fonseca", "goncalves",
             # Top 101-150
             "leite", "brito", "amaral", "bueno", "dantas", "godoy", "barreto",
-            "pessoa", "matos", "fogaca", "fogaça", "ramalho", "delgado", "santana",
-            "bastos", "viana", "toledo", "avila", "ávila", "porto", "lacerda",
+            "pessoa", "matos", "fogaca", "ramalho", "delgado", "santana",
+            "bastos", "viana", "toledo", "avila", "porto", "lacerda",
             "salgado", "leal", "menezes", "moraes", "morais", "figueiredo",
             "mesquita", "rangel", "queiroz", "novais", "vaz", "pacheco",
             "furtado", "cardozo", "muniz", "fontes", "rossi", "goulart", "ventura",
             # Top 151-200 e outros muito comuns
-            "brandao", "brandão", "medina", "vidal", "nery", "coutinho",
+            "brandao", "medina", "vidal", "nery", "coutinho",
             "domingues", "lemos", "esteves", "serra", "gonzaga", "assuncao",
-            "assunção", "silveira", "vilela", "fagundes", "guedes", "arruda",
+            "silveira", "vilela", "fagundes", "guedes", "arruda",
             "caetano", "carneiro", "bento", "amorim", "guerra", "escobar", "jardim",
-            "sequeira", "vale", "felix", "félix", "maia", "lara", "padilha", "torres",
+            "sequeira", "vale", "felix", "maia", "lara", "padilha", "torres",
             "serrano", "neto", "filho", "junior", "sobrinho", "segundo", "terceiro",
-            "villar", "bispo", "goes", "peixoto", "cabral", "camara", "câmara",
+            "villar", "bispo", "goes", "peixoto", "cabral", "camara",
             "vasques", "varela", "espinosa", "horta", "crespo", "bessa",
-            "cortes", "cortês", "seabra", "lobato", "portela", "afonso", "saraiva",
-            "cordeiro", "barroso", "guerreiro", "nobre", "galvao", "galvão",
+            "cortes", "seabra", "lobato", "portela", "afonso", "saraiva",
+            "cordeiro", "barroso", "guerreiro", "nobre", "galvao",
             "prado", "pestana", "paredes", "trindade", "bernardes", "gama",
             "lopes", "marques", "borges", "pires", "moura", "cunha", "correa", "campos",
             "teixeira", "vieira", "azevedo", "sales", "xavier", "macedo", "farias", "nunes",
@@ -245,11 +296,47 @@ class NameValidator:
             "sampaio", "tavares", "braga", "cruz", "simoes", "barbosa", "marques", "valle",
             "camargo", "mota", "franco", "garcia", "ribeiro"
         }
+        
+        # Listas comparadas sem acento (texto_canonico.py): "conceicao" casa
+        # "Conceição", sem listar as duas grafias
+        self.never_names = {dobrar(p) for p in self.never_names}
+        self.common_brazilian_first_names = {dobrar(p) for p in self.common_brazilian_first_names}
+        self.common_brazilian_surnames = {dobrar(p) for p in self.common_brazilian_surnames}
     
-    def is_valid_name(self, text: str) -> bool:
+    # Léxico atual do módulo (trocado por recarregar_lexico_nomes)
+    @property
+    def dataset(self):
+        return name_dataset
+
+    @property
+    def available(self) -> bool:
+        return NAMES_DATASET_AVAILABLE
+
+    def veredito_token(self, palavra: str) -> VereditoToken:
+        """Veredito de uma palavra em minúsculas (cache compartilhado entre requisições)"""
+        return vereditos_tokens.obter(palavra, self._calcular_veredito)
+
+    def _calcular_veredito(self, palavra: str) -> VereditoToken:
+        # O NameDataset distingue "joão" de "joao"; as listas, não
+        busca = self.dataset.search(palavra) if self.available and self.dataset else None
+        chave = dobrar(palavra)
+        return VereditoToken(
+            primeiro_nome=bool(busca and busca.get('first_name')),
+            sobrenome=bool(busca and busca.get('last_name')),
+            nunca_nome=chave in self.never_names,
+            primeiro_comum=chave in self.common_brazilian_first_names,
+            sobrenome_comum=chave in self.common_brazilian_surnames,
+        )
+
+    def is_valid_name(self, text: str, texto_dobrado: Optional[str] = None) -> bool:
         """
         Valida se o texto é realmente um nome de pessoa usando NameDataset
         
+        Args:
+            text: Texto do candidato
+            texto_dobrado: O mesmo trecho já em minúsculas e sem acento (visão
+                canônica do documento); calculado aqui se omitido
+        
         Returns:
             True se é um nome válido, False caso contrário
         """
@@ -261,42 +348,38 @@ class NameValidator:
         
         text_lower = text_normalized.lower().strip()
         palavras = text_lower.split()
+        # Listas e blacklists são comparadas sem acento
+        if texto_dobrado is None:
+            texto_dobrado = dobrar(text_normalized)
+        texto_dobrado = ' '.join(texto_dobrado.split())
+        palavras_dobradas = texto_dobrado.split()
         
         # 1. Blacklist definitiva - NUNCA são nomes
-        if text_lower in self.never_names:
+        if texto_dobrado in self.never_names:
             return False
         
         # 1.1. Verificar frases completas de órgãos que podem estar fragmentadas
         # Detectar padrões como "Escola de Políticas Públicas", "Mestrado da Escola"
-        institutional_keywords = [
-            "escola", "universidade", "faculdade", "colegio", "instituto",
-            "centro universitario", "centro de ensino",
-            "politicas publicas", "ministerio", "secretaria de",
-            "prefeitura", "governo do", "tribunal de",
-            "banco de dados", "gestao", "governanca", "administracao",
-            "ouvidoria", "contoladoria", "infraestrutura"
-        ]
-        if any(org in text_lower for org in institutional_keywords):
+        if INSTITUTIONAL_KEYWORDS.contem(texto_dobrado):
             return False
         
         # 1.2. Rejeitar palavras únicas que são claramente não-nomes
         single_word_blacklist = {
-            "ola", "olá", "oi", "id", "texto", "superior", "juvenil", "civil",
+            "ola", "oi", "id", "texto", "superior", "juvenil", "civil",
             "tarde", "dia", "noite", "bom", "boa", "box", "advogados", "sou", "inquilina", "sic",
             "referente", "administrativa", "gama", "oab", "ltda",
-            "coliformes", "fosforo", "fósforo", "nitrogenio", "nitrogênio", 
-            "oxigenio", "oxigênio", "solidos", "sólidos",
+            "coliformes", "fosforo", "nitrogenio", "oxigenio", "solidos",
             "empenho", "emenda", "inciso", "validador", "canal", "geral",
             "total", "totais", "amoniacal", "dissolvido", "termotolerantes",
             "er", "es", "rj", "sp", "mg", "ba", "pr", "sc", "rs", "go", "df",
             "cpf", "rg", "cnh", "cnpj", "cep"
         }
-        if len(palavras) == 1 and palavras[0] in single_word_blacklist:
+        if len(palavras_dobradas) == 1 and palavras_dobradas[0] in single_word_blacklist:
             return False
         
         # 1.3. Rejeitar artistas/personalidades históricas em contexto de obras
         # Padrão: "painéis Athos Bulsão", "vitrais X", "mosaicos Y"
-        artist_context_words = ["painel", "paineis", "painéis", "vitral", "vitrais", 
+        artist_context_words = ["painel", "paineis", "vitral", "vitrais", 
                                  "mosaico", "mosaicos", "obra", "obras", "escultura", 
                                  "pintura", "arte", "artista"]
         # Se o texto aparece após palavras de contexto artístico, não é nome de pessoa real
@@ -304,27 +387,25 @@ class NameValidator:
         # 1.4. Rejeitar combinações químicas/técnicas específicas
         if len(palavras) == 2:
             technical_combos = {
-                ("fosforo", "total"), ("fósforo", "total"),
-                ("nitrogenio", "total"), ("nitrogênio", "total"), 
-                ("nitrogenio", "amoniacal"), ("nitrogênio", "amoniacal"),
-                ("oxigenio", "dissolvido"), ("oxigênio", "dissolvido"),
-                ("solidos", "totais"), ("sólidos", "totais"),
+                ("fosforo", "total"), ("nitrogenio", "total"),
+                ("nitrogenio", "amoniacal"), ("oxigenio", "dissolvido"),
+                ("solidos", "totais"),
                 ("coliformes", "termotolerantes"),
                 ("er", "es"), # Siglas de estados juntas
             }
-            if tuple(palavras) in technical_combos:
+            if tuple(palavras_dobradas) in technical_combos:
                 return False
         
         # 1.4. Rejeitar se tem sufixos de documentos (nome + CPF/RG/etc)
-        if any(doc in text_lower for doc in [" cpf", " rg", " cnh", " oab", " cnpj"]):
+        if DOCUMENT_SUFFIXES.contem(texto_dobrado):
             # Se termina com documento, pode ser "Nome CPF" - aceitar só o nome
             # Mas se o spaCy capturou junto, rejeitar
-            if text_lower.endswith(("cpf", "rg", "cnh", "oab", "cnpj")):
+            if texto_dobrado.endswith(("cpf", "rg", "cnh", "oab", "cnpj")):
                 return False
         
         # Verificar cada palavra
         for palavra in palavras:
-            if palavra in self.never_names:
+            if self.veredito_token(palavra).nunca_nome:
                 return False
         
         # 2. Rejeitar se contém caracteres especiais inválidos para nomes
@@ -350,11 +431,11 @@ class NameValidator:
         
         # 5.1. NOVO: Rejeitar se contém verbos ou palavras de ação
         palavras_acao = {'saber', 'entrar', 'contato', 'constar', 'acesso', 'informar', 'fornecer', 'obter', 'solicitar', 'receber', 'possuir', 'ter', 'haver', 'fazer', 'dar', 'pedir', 'enviar', 'apresentar', 'encaminhar', 'chamo'}
-        if any(p in palavras_acao for p in palavras):
+        if any(p in palavras_acao for p in palavras_dobradas):
             return False
         
         # 6. NOVO: Rejeitar se começa com verbo conjugado ou palavra minúscula
-        if palavras and palavras[0] in {'gostaria', 'solicito', 'preciso', 'venho', 'quero', 'pedir', 'fazer', 'ter', 'saber', 'informar',
+        if palavras_dobradas and palavras_dobradas[0] in {'gostaria', 'solicito', 'preciso', 'venho', 'quero', 'pedir', 'fazer', 'ter', 'saber', 'informar',
                                          'caso', 'tendo', 'ao', 'em', 'para', 'com', 'de', 'sem', 'por', 'sobre', 'como', 'quando',
                                          'estou', 'sou', 'foi', 'houve', 'possui', 'todas', 'isso', 'favor', 'pelo', 'a', 'o', 'e',
                                          'mas', 'ja', 'ainda', 'apos', 'antes', 'durante', 'pelo', 'pela', 'pelos', 'pelas'}:
@@ -377,25 +458,22 @@ class NameValidator:
         # Se NameDataset não está disponível, usar validação básica
         if not self.available or not self.dataset:
             # Validação básica: pelo menos 1 sobrenome brasileiro comum
-            return any(sobrenome in palavras for sobrenome in self.common_brazilian_surnames)
+            return any(p in self.common_brazilian_surnames for p in palavras_dobradas)
         
         # 9. Validação robusta com NameDataset + Lista de nomes comuns brasileiros
         # Verificar cada palavra contra o dataset e nossa lista
         if len(palavras) == 1:
             # Nome único - deve estar no dataset como primeiro nome OU sobrenome OU na nossa lista
-            palavra_lower = palavras[0].lower()
+            veredito = self.veredito_token(palavras[0])
             
             # Verificar se está na lista de nomes brasileiros comuns
-            if palavra_lower in self.common_brazilian_first_names:
+            if veredito.primeiro_comum:
                 return True
             
-            search_result = self.dataset.search(palavras[0].capitalize())
-            
-            # search retorna dict com 'first_name' e 'last_name'
-            if search_result and (search_result.get('first_name') or search_result.get('last_name')):
+            if veredito.primeiro_nome or veredito.sobrenome:
                 # Encontrado no dataset
                 # Mas verificar se também é sobrenome comum (evitar "Santos" sozinho)
-                if palavra_lower in self.common_brazilian_surnames and palavra_lower not in self.common_brazilian_first_names:
+                if veredito.sobrenome_comum and not veredito.primeiro_comum:
                     # É APENAS sobrenome comum (não é nome), exigir contexto ou score alto
                     return False  # Rejeitar palavra solta como "Santos", "Silva" sem contexto
                 return True
@@ -404,38 +482,36 @@ class NameValidator:
         elif len(palavras) == 2:
             # Nome simples de 2 palavras - "Antonio Costa", "Fátima Lima", "Júlio Cesar"
             # AJUSTADO: Ser mais permissivo - aceitar se qualquer componente é válido
-            palavra1_lower = palavras[0].lower()
-            palavra2_lower = palavras[1].lower()
-            palavra1_cap = palavras[0].capitalize()
-            palavra2_cap = palavras[1].capitalize()
+            palavra1_lower = palavras[0]
+            palavra2_lower = palavras[1]
+            veredito1 = self.veredito_token(palavra1_lower)
+            veredito2 = self.veredito_token(palavra2_lower)
             
             # Verificar lista de nomes comuns primeiro (mais rápido)
-            if palavra1_lower in self.common_brazilian_first_names:
+            if veredito1.primeiro_comum:
                 # Primeira é nome brasileiro comum - aceitar se segunda tem 3+ chars
-                if palavra2_lower in self.common_brazilian_surnames or palavra2_lower in self.common_brazilian_first_names or len(palavra2_lower) >= 3:
+                if veredito2.sobrenome_comum or veredito2.primeiro_comum or len(palavra2_lower) >= 3:
                     return True
             
             # Se segunda palavra é sobrenome comum E primeira tem 3+ caracteres (não é sigla)
-            if palavra2_lower in self.common_brazilian_surnames and len(palavra1_lower) >= 3:
+            if veredito2.sobrenome_comum and len(palavra1_lower) >= 3:
                 return True
             
-            search1 = self.dataset.search(palavra1_cap)
-            search2 = self.dataset.search(palavra2_cap)
-            
             # Cenário 1: Primeira é first_name, segunda é last_name
-            if search1 and search1.get('first_name') and (search2 and search2.get('last_name') or palavra2_lower in self.common_brazilian_surnames):
+            if veredito1.primeiro_nome and (veredito2.sobrenome or veredito2.sobrenome_comum):
                 return True
             
-            # Cenário 2: Ambas aparecem no dataset (uma como nome, outra como sobrenome)
-            if search1 and search2:
+            # Cenário 2: Ambas consultadas no dataset (o search() devolve sempre
+            # um dict, então esta condição nunca foi seletiva)
+            if veredito1 and veredito2:
                 return True
             
             # Cenário 3: Segunda palavra é sobrenome brasileiro comum E primeira é válida
-            if palavra2_lower in self.common_brazilian_surnames and search1:
+            if veredito2.sobrenome_comum and veredito1:
                 return True
             
             # NOVO: Aceitar se primeira é nome comum no dataset E segunda tem 3+ chars
-            if search1 and search1.get('first_name') and len(palavra2_lower) >= 3:
+            if veredito1.primeiro_nome and len(palavra2_lower) >= 3:
                 return True
             
             return False
@@ -448,37 +524,69 @@ class NameValidator:
             valid_components = 0
             
             for i, palavra in enumerate(palavras):
-                palavra_lower = palavra.lower()
-                palavra_cap = palavra.capitalize()
-                
                 # Pular conectivos (de, da, dos, das, do)
-                if palavra_lower in ['de', 'da', 'dos', 'das', 'do', 'e']:
+                if palavra in ['de', 'da', 'dos', 'das', 'do', 'e']:
                     continue
                 
+                veredito = self.veredito_token(palavra)
+                
                 # Verificar lista de nomes comuns brasileiros primeiro
-                if palavra_lower in self.common_brazilian_first_names:
+                if veredito.primeiro_comum:
                     has_first_name = True
                     valid_components += 1
                 
-                if palavra_lower in self.common_brazilian_surnames:
+                if veredito.sobrenome_comum:
                     has_last_name = True
                     valid_components += 1
                 
                 # Se ainda não encontrou, buscar no NameDataset
                 if not (has_first_name and has_last_name):
-                    search_result = self.dataset.search(palavra_cap)
-                    
-                    if search_result:
-                        if search_result.get('first_name'):
-                            has_first_name = True
-                            valid_components += 1
-                        if search_result.get('last_name'):
-                            has_last_name = True
-                            valid_components += 1
+                    if veredito.primeiro_nome:
+                        has_first_name = True
+                        valid_components += 1
+                    if veredito.sobrenome:
+                        has_last_name = True
+                        valid_components += 1
             
             # Nome válido: tem primeiro nome E sobrenome OU tem 2+ componentes válidos
             return (has_first_name and has_last_name) or valid_components >= 2
 
+    # Termos de contexto por classe, sem acento: o IndiceTermos
+    # (contexto_documento.py) procura na visão sem acento do documento
+    CONTEXT_TERMS = {
+        # INDICADORES POSITIVOS (aumentam confiança que é nome real)
+        "assinatura": ["atenciosamente", "att", "at.te", "cordialmente",
+                       "assinado", "responsavel", "solicitante"],
+        # Nome seguido de CPF/RG/documento
+        "documento": ["cpf", "rg:", "cnh:", "telefone:", "tel:", "email:", "fone:"],
+        # INDICADORES NEGATIVOS (reduzem confiança)
+        # Contexto de obra de arte
+        "artistico": ["painel", "paineis", "vitral", "vitrais",
+                      "mosaico", "mosaicos", "obra de", "escultura"],
+        # Contexto institucional
+        "institucional": ["escola de", "universidade de", "instituto de",
+                          "mestrado", "doutorado", "curso de"],
+        # Contexto químico/técnico
+        "tecnico": ["concentracao", "nivel", "parametro", "analise"],
+    }
+    
+    # Classe → (lado da entidade, caracteres da janela, ajuste da confiança)
+    CONTEXT_WINDOWS = {
+        "assinatura": ("antes", 50, +0.3),
+        "documento": ("depois", 50, +0.4),
+        "artistico": ("antes", 50, -0.8),
+        "institucional": ("antes", 50, -0.5),
+        "tecnico": ("antes", 40, -0.6),
+    }
+    
+    CONTEXT_REASONS = {
+        "assinatura": "contexto_assinatura",
+        "documento": "seguido_de_documento",
+        "artistico": "contexto_artistico",
+        "institucional": "contexto_institucional",
+        "tecnico": "contexto_tecnico",
+    }
+
     def analyze_context(self, text: str, start: int, end: int, full_text: str) -> dict:
         """
         Analisa o contexto ao redor de uma entidade detectada para melhorar precisão
@@ -492,47 +600,21 @@ class NameValidator:
         Returns:
             dict com análise de contexto e score de confiança
         """
-        # Pegar 100 caracteres antes e depois para contexto
-        context_before = full_text[max(0, start - 100):start].lower()
-        context_after = full_text[end:min(len(full_text), end + 100)].lower()
+        # Termos localizados uma vez por documento (contexto_documento.py):
+        # cada verificação é uma busca binária na janela antes/depois da entidade
+        indice = indice_termos(full_text, self.CONTEXT_TERMS)
         
         confidence_score = 1.0
         reasons = []
         
-        # INDICADORES POSITIVOS (aumentam confiança que é nome real)
-        signature_patterns = ["atenciosamente", "att", "at.te", "cordialmente", 
-                              "assinado", "responsavel", "solicitante"]
-        if any(pattern in context_before[-50:] for pattern in signature_patterns):
-            confidence_score += 0.3
-            reasons.append("contexto_assinatura")
-        
-        # Nome seguido de CPF/RG/documento
-        doc_patterns = ["cpf", "rg:", "cnh:", "telefone:", "tel:", "email:", "fone:"]
-        if any(pattern in context_after[:50] for pattern in doc_patterns):
-            confidence_score += 0.4
-            reasons.append("seguido_de_documento")
-        
-        # INDICADORES NEGATIVOS (reduzem confiança)
-        # Contexto de obra de arte
-        art_patterns = ["painel", "paineis", "painéis", "vitral", "vitrais", 
-                        "mosaico", "mosaicos", "obra de", "escultura"]
-        if any(pattern in context_before[-50:] for pattern in art_patterns):
-            confidence_score -= 0.8
-            reasons.append("contexto_artistico")
-        
-        # Contexto institucional
-        inst_patterns = ["escola de", "universidade de", "instituto de", 
-                         "mestrado", "doutorado", "curso de"]
-        if any(pattern in context_before[-50:] for pattern in inst_patterns):
-            confidence_score -= 0.5
-            reasons.append("contexto_institucional")
-        
-        # Contexto químico/técnico
-        tech_patterns = ["concentracao", "concentração", "nivel", "nível", 
-                         "parametro", "parâmetro", "analise", "análise"]
-        if any(pattern in context_before[-40:] for pattern in tech_patterns):
-            confidence_score -= 0.6
-            reasons.append("contexto_tecnico")
+        for classe, (direcao, janela, ajuste) in self.CONTEXT_WINDOWS.items():
+            if direcao == "antes":
+                encontrado = indice.existe(classe, start - janela, start)
+            else:
+                encontrado = indice.existe(classe, end, end + janela)
+            if encontrado:
+                confidence_score += ajuste
+                reasons.append(self.CONTEXT_REASONS[classe])
         
         return {
             "confidence": max(0.0, min(2.0, confidence_score)),
@@ -553,12 +635,15 @@ class LocationValidator:
         # Cache de validações para evitar chamadas repetidas à API
         self._location_cache: dict = {}
         
+        # Países/subdivisões pré-indexados (no lugar do search_fuzzy por candidato)
+        self.indice_paises = indice_paises() if PYCOUNTRY_AVAILABLE else None
+        
         # Blacklist definitiva de palavras que NUNCA são localizações
         self.never_locations = {
             # Saudações/fechamentos
             "at.te", "atenciosamente", "cordialmente", "respeitosamente", "grata", "grato",
             # Verbos
-            "venho", "solicito", "requeiro", "peço", "peco", "encaminho", "apresento",
+            "venho", "solicito", "requeiro", "peco", "encaminho", "apresento",
             "informo", "comunico", "manifesto", "declaro", "afirmo", "ratifico",
             # Termos técnicos/abstratos
             "inteligencia", "artificial", "digital", "letramento", "generativa",
@@ -591,12 +676,17 @@ class LocationValidator:
         # Cidades brasileiras mais comuns (top 200)
         self.brazilian_cities = self._load_brazilian_cities()
         
+        # Municípios do IBGE + RAs e bairros do DF, offline (localidades.py)
+        self.localidades = localidades()
+        
         # Indicadores de localização genuína
         self.location_indicators = {
             "rua", "avenida", "av", "alameda", "travessa", "praca", "rodovia",
             "cidade", "estado", "municipio", "bairro", "quadra", "lote", "conjunto",
             "endereco", "cep", "residencia", "domicilio", "logradouro"
         }
+        # Compilado uma vez: uma passada pelo contexto em vez de um `in` por indicador
+        self._location_indicators_automato = AutomatoTermos(self.location_indicators)
     
     def _load_brazilian_cities(self) -> Set[str]:
         """Carrega lista de cidades brasileiras principais"""
@@ -617,7 +707,6 @@ class LocationValidator:
             "ponta grossa", "blumenau", "limeira", "uberaba", "paulista", "suzano"
         }
     
-    @lru_cache(maxsize=1000)
     def is_valid_location(self, text: str, context: str = "") -> bool:
         """
         Valida se o texto é realmente uma localização usando múltiplas estratégias
@@ -632,21 +721,52 @@ class LocationValidator:
         if not text or not text.strip():
             return False
         
-        text_lower = text.lower().strip()
-        palavras = text_lower.split()
+        # Passos que só dependem do texto: cache compartilhado (vereditos_token.py)
+        veredito = vereditos_locais.obter(text.lower().strip(), self._veredito_sem_contexto)
+        if veredito != LOCAL_DEPENDE_CONTEXTO:
+            return veredito == LOCAL_ACEITO
+        
+        # 5. VALIDAÇÃO COM CONTEXTO: Se tem indicadores de localização próximos, aceitar
+        context_dobrado = dobrar(context) if context else ""
+        has_location_indicator = self._location_indicators_automato.contem(context_dobrado)
+        
+        if has_location_indicator:
+            # Tem contexto forte de localização (ex: "Rua X", "Cidade Y")
+            # Validar se parece com nome de lugar
+            if self._looks_like_place_name(text):
+                return True
+        
+        # 7. VALIDAÇÃO COM GEOPY (última tentativa - pode ser lenta)
+        # DESABILITADO por padrão para evitar latência - os municípios e RAs
+        # vêm das localidades offline (passo 4)
+        # if self.available and self.geolocator and has_location_indicator:
+        #     try:
+        #         location = self.geolocator.geocode(text, language='pt')
+        #         return location is not None
+        #     except (GeocoderTimedOut, GeocoderServiceError):
+        #         pass
+        
+        # 8. FALLBACK: Rejeitar se não passou em nenhuma validação
+        return False
+    
+    def _veredito_sem_contexto(self, text_lower: str) -> int:
+        """Passos 1-4 e 6 do is_valid_location (só dependem do texto em minúsculas)"""
+        # Listas sem acento: "São Paulo" casa "sao paulo", "Praça" casa "praca"
+        texto_dobrado = dobrar(text_lower)
+        palavras = texto_dobrado.split()
         
         # 1. BLACKLIST DEFINITIVA - NUNCA são localizações
-        if text_lower in self.never_locations:
-            return False
+        if texto_dobrado in self.never_locations:
+            return LOCAL_REJEITADO
         
         # Verificar cada palavra
         for palavra in palavras:
             if palavra in self.never_locations:
-                return False
+                return LOCAL_REJEITADO
         
         # 2. REJEITAR frases muito longas (>5 palavras) - provavelmente conceitos/títulos
         if len(palavras) > 5:
-            return False
+            return LOCAL_REJEITADO
         
         # 3. REJEITAR se contém apenas palavras abstratas/técnicas
         palavras_abstratas = {
@@ -654,50 +774,21 @@ class LocationValidator:
             "politicas", "publicas", "privacidade", "seguranca", "tecnologia"
         }
         if all(palavra in palavras_abstratas for palavra in palavras):
-            return False
+            return LOCAL_REJEITADO
         
         # 4. VALIDAÇÃO ROBUSTA: Verificar se é estado ou cidade brasileira conhecida
-        if text_lower in self.brazilian_states or text_lower in self.brazilian_cities:
-            return True
-        
-        # 5. VALIDAÇÃO COM CONTEXTO: Se tem indicadores de localização próximos, aceitar
-        context_lower = context.lower() if context else ""
-        has_location_indicator = any(indicator in context_lower for indicator in self.location_indicators)
-        
-        if has_location_indicator:
-            # Tem contexto forte de localização (ex: "Rua X", "Cidade Y")
-            # Validar se parece com nome de lugar
-            if self._looks_like_place_name(text):
-                return True
+        if texto_dobrado in self.brazilian_states or texto_dobrado in self.brazilian_cities:
+            return LOCAL_ACEITO
+        if self.localidades.contem(texto_dobrado):
+            return LOCAL_ACEITO
         
         # 6. VALIDAÇÃO COM PYCOUNTRY: Verificar se é país/subdivisão conhecida
-        if PYCOUNTRY_AVAILABLE:
-            try:
-                # Verificar países
-                try:
-                    pycountry.countries.search_fuzzy(text)
-                    return True
-                except LookupError:
-                    pass
-                
-                # Verificar subdivisões (estados, províncias)
-                for subdivision in pycountry.subdivisions:
-                    if text_lower in subdivision.name.lower():
-                        return True
-            except Exception:
-                pass
-        
-        # 7. VALIDAÇÃO COM GEOPY (última tentativa - pode ser lenta)
-        # DESABILITADO por padrão para evitar latência
-        # if self.available and self.geolocator and has_location_indicator:
-        #     try:
-        #         location = self.geolocator.geocode(text, language='pt')
-        #         return location is not None
-        #     except (GeocoderTimedOut, GeocoderServiceError):
-        #         pass
+        # (mesma decisão do search_fuzzy + busca nas subdivisões - indice_paises.py)
+        # Antes do passo 5 aqui: os dois só aceitam, a ordem não muda a decisão
+        if self.indice_paises is not None and self.indice_paises.contem(text_lower):
+            return LOCAL_ACEITO
         
-        # 8. FALLBACK: Rejeitar se não passou em nenhuma validação
-        return False
+        return LOCAL_DEPENDE_CONTEXTO
     
     def _looks_like_place_name(self, text: str) -> bool:
         """Verifica se o texto parece com um nome de lugar válido"""
@@ -710,7 +801,7 @@ class LocationValidator:
         if not text[0].isupper():
             return False
         
-        palavras = text.lower().split()
+        palavras = dobrar(text).split()
         
         # Rejeitar se tem muitas palavras abstratas
         abstract_count = sum(1 for p in palavras if p in self.never_locations)
@@ -747,8 +838,10 @@ class PersonLocationFilter:
         Returns:
             True se deve manter como PERSON, False para rejeitar
         """
-        # Primeiro: validação básica de nome
-        if not self.name_validator.is_valid_name(text):
+        # Primeiro: validação básica de nome (trecho sem acento lido da visão
+        # canônica do documento, calculada uma vez por texto)
+        texto_dobrado = texto_canonico(full_text).trecho(start, end) if full_text and end > start else None
+        if not self.name_validator.is_valid_name(text, texto_dobrado):
             return False
         
         # Se temos acesso ao texto completo, usar análise de contexto
@@ -0,0 +1,256 @@
+"""
+Varredura Combinada dos Padrões dos Reconhecedores
+
+Cada PatternRecognizer executa um finditer por Pattern sobre o texto inteiro:
+são 65 passadas por requisição, algumas com a MESMA regex (cpf_without_dots e
+phone_only_digits_11 são ambos `(?<!\\d)\\d{11}(?!\\d)`).
+
+A VarreduraCombinada registra todos os padrões dos reconhecedores, cada um
+marcado com o seu índice, e entrega a cada Pattern os matches que o finditer
+dele produziria:
+
+- Padrões com a mesma regex e flags compartilham UMA passada
+- Padrões de palavras-chave literais - `\\b(solteiro|casado|viuv[oa])\\b` -
+  são atendidos por UMA passada de palavras (`\\w+`) e um dicionário
+  palavra → padrões: um match desses padrões é sempre uma palavra inteira
+  igual a uma das alternativas (profissões, nacionalidades, estado civil...)
+- Os demais padrões continuam com a própria passada
+
+Uma única alternância com todos os padrões não é usada: o motor de regex
+testaria as ~65 alternativas em cada posição, perderia a busca rápida por
+prefixo literal de cada padrão (fica mais lento que as passadas separadas)
+e só devolveria um padrão por posição - o resultado mudaria.
+
+As passadas são feitas sob demanda, uma vez por texto (por thread): o
+primeiro reconhecedor que pede um padrão paga a passada, os seguintes
+reaproveitam. O resultado do analyze() é idêntico ao das passadas
+separadas (benchmark_varredura.py compara os dois em AMOSTRA_e-SIC.txt).
+
+Configuração por variável de ambiente:
+- PRESIDIO_VARREDURA_COMBINADA: 1 liga (padrão), 0 desliga
+"""
+import logging
+import os
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import regex
+from presidio_analyzer import EntityRecognizer, PatternRecognizer
+
+from motor_regex import RegexProtegida
+
+logger = logging.getLogger(__name__)
+
+VARREDURA_ATIVA = os.getenv("PRESIDIO_VARREDURA_COMBINADA", "1") == "1"
+
+# Palavras do texto (mesma definição de \w e \b das regex dos padrões)
+PALAVRA = regex.compile(r"\w+")
+
+# Caractere de palavra fora do Latin-1 (ſ, K, İ...): ali o case folding da
+# regex pode diferir de lower()
+FORA_LATIN1 = regex.compile(r"[^\W\x00-\xff]")
+
+# Flags que não alteram o casamento de uma alternância de palavras literais
+FLAGS_COMPATIVEIS = regex.IGNORECASE | regex.MULTILINE | regex.DOTALL | regex.UNICODE
+
+# Limite de variantes por alternativa (ex.: ag?n[oó]stica? = 8 variantes)
+MAX_VARIANTES = 256
+
+# `\b(alt|alt|...)\b`, com (?i) opcional e grupo capturante ou não
+_PALAVRAS_CHAVE = regex.compile(r"\\b(\(\?i\))?\((?:\?:)?([^()]*)\)\\b")
+
+
+# ============================================================================
+# PADRÕES DE PALAVRAS-CHAVE LITERAIS
+# ============================================================================
+def _expandir_alternativa(alternativa: str) -> Optional[List[str]]:
+    """
+    Expande uma alternativa formada por letras, classes de letras ([aã]) e
+    `?` em todas as palavras que ela casa (None se usar outra sintaxe)
+    """
+    variantes = [""]
+    i = 0
+    while i < len(alternativa):
+        caractere = alternativa[i]
+        if caractere == "[":
+            fim = alternativa.find("]", i)
+            opcoes = alternativa[i + 1:fim] if fim > i + 1 else ""
+            if not opcoes.isalpha():
+                return None
+            i = fim + 1
+        elif caractere.isalpha():
+            opcoes = caractere
+            i += 1
+        else:
+            return None
+
+        if i < len(alternativa) and alternativa[i] == "?":
+            opcoes += "\0"  # Átomo opcional
+            i += 1
+
+        variantes = [v + o.replace("\0", "") for v in variantes for o in opcoes]
+        if len(variantes) > MAX_VARIANTES:
+            return None
+
+    return [v for v in variantes if v]
+
+
+def palavras_do_padrao(expressao: str) -> Optional[Tuple[FrozenSet[str], bool]]:
+    """
+    Palavras casadas por um padrão `\\b(alt|alt|...)\\b` de alternativas literais
+
+    Returns:
+        (palavras, ignora_maiusculas_inline) ou None se o padrão tiver outra forma
+    """
+    m = _PALAVRAS_CHAVE.fullmatch(expressao)
+    if not m:
+        return None
+
+    palavras = set()
+    for alternativa in m.group(2).split("|"):
+        variantes = _expandir_alternativa(alternativa)
+        if not variantes:
+            return None
+        palavras.update(variantes)
+
+    # Só Latin-1: para esses caracteres lower() coincide com o case folding da regex
+    if any(not _latin1(p) for p in palavras):
+        return None
+    return frozenset(palavras), bool(m.group(1))
+
+
+def _latin1(palavra: str) -> bool:
+    return palavra.isascii() or max(palavra) <= "\xff"
+
+
+# ============================================================================
+# VARREDURA
+# ============================================================================
+class _RegexCompartilhada:
+    """
+    Ocupa o lugar de `pattern.compiled_regex`: finditer devolve os matches da
+    varredura combinada; o resto é delegado à regex compilada original
+    """
+
+    def __init__(self, varredura: "VarreduraCombinada", indice: int, compilada):
+        self._varredura = varredura
+        self._indice = indice
+        self._compilada = compilada
+
+    def __getattr__(self, nome):
+        return getattr(self._compilada, nome)
+
+    def finditer(self, texto, *args, **kwargs):
+        if args or kwargs:
+            return self._compilada.finditer(texto, *args, **kwargs)
+        return iter(self._varredura.matches(self._indice, texto))
+
+
+class VarreduraCombinada:
+    """
+    Tabela única dos padrões dos reconhecedores, varrida uma vez por texto
+    """
+
+    def __init__(self, reconhecedores: List[EntityRecognizer]):
+        self._compiladas = []
+        self._indices: Dict[Tuple[str, int], int] = {}
+        # palavra → índices dos padrões (chave em minúsculas nos padrões sem distinção de caixa)
+        self._palavras: Dict[str, List[int]] = {}
+        self._palavras_exatas: Dict[str, List[int]] = {}
+        self._por_palavras: List[int] = []
+        self._local = threading.local()
+        self.padroes = 0
+
+        for reconhecedor in reconhecedores:
+            if not isinstance(reconhecedor, PatternRecognizer):
+                continue
+            flags = reconhecedor.global_regex_flags
+            for pattern in reconhecedor.patterns:
+                indice = self._registrar(pattern.regex, flags, pattern.name)
+                pattern.compiled_with_flags = flags
+                pattern.compiled_regex = _RegexCompartilhada(self, indice, self._compiladas[indice])
+                self.padroes += 1
+
+        logger.info(
+            f"🔎 Varredura combinada: {self.padroes} padrões → {self.passadas} passadas "
+            f"({len(self._por_palavras)} padrões de palavras-chave em uma passada)"
+        )
+
+    @property
+    def passadas(self) -> int:
+        """Passadas sobre o texto quando todos os padrões são usados"""
+        return len(self._compiladas) - len(self._por_palavras) + (1 if self._por_palavras else 0)
+
+    def _registrar(self, expressao: str, flags: int, nome: str) -> int:
+        chave = (expressao, flags)
+        indice = self._indices.get(chave)
+        if indice is not None:
+            return indice
+
+        indice = len(self._compiladas)
+        # Com orçamento de tempo por busca (motor_regex.py)
+        self._compiladas.append(RegexProtegida(expressao, flags, nome))
+        self._indices[chave] = indice
+
+        palavras = palavras_do_padrao(expressao) if not flags & ~FLAGS_COMPATIVEIS else None
+        if palavras:
+            palavras, ignora_inline = palavras
+            ignora_caixa = ignora_inline or bool(flags & regex.IGNORECASE)
+            destino = self._palavras if ignora_caixa else self._palavras_exatas
+            for palavra in palavras:
+                chave_palavra = palavra.lower() if ignora_caixa else palavra
+                indices = destino.setdefault(chave_palavra, [])
+                if indice not in indices:
+                    indices.append(indice)
+            self._por_palavras.append(indice)
+
+        return indice
+
+    def matches(self, indice: int, texto: str) -> list:
+        """Matches do padrão `indice` em `texto` (na ordem do finditer)"""
+        local = self._local
+        if getattr(local, "texto", None) is not texto:
+            local.texto = texto
+            local.matches = {}
+
+        encontrados = local.matches.get(indice)
+        if encontrados is None:
+            if indice in self._por_palavras:
+                self._varrer_palavras(texto, local.matches)
+            else:
+                local.matches[indice] = list(self._compiladas[indice].finditer(texto))
+            encontrados = local.matches[indice]
+        return encontrados
+
+    def _varrer_palavras(self, texto: str, destino: Dict[int, list]) -> None:
+        """Uma passada de palavras atende todos os padrões de palavras-chave"""
+        for indice in self._por_palavras:
+            destino[indice] = []
+
+        palavras = self._palavras
+        minusculo = texto.lower()
+        if (not self._palavras_exatas and len(minusculo) == len(texto)
+                and not FORA_LATIN1.search(texto)):
+            # Caso comum: o texto em minúsculas tem os mesmos offsets e basta
+            # procurar cada palavra no dicionário
+            for m in PALAVRA.finditer(minusculo):
+                indices = palavras.get(m.group())
+                if indices:
+                    for indice in indices:
+                        destino[indice].append(m)
+            return
+
+        exatas = self._palavras_exatas
+        for m in PALAVRA.finditer(texto):
+            palavra = m.group()
+            if _latin1(palavra):
+                for indice in palavras.get(palavra.lower(), ()):
+                    destino[indice].append(m)
+                for indice in exatas.get(palavra, ()):
+                    destino[indice].append(m)
+            else:
+                # Confere com a própria regex de cada padrão
+                inicio, fim = m.span()
+                for indice in self._por_palavras:
+                    if self._compiladas[indice].fullmatch(texto, inicio, fim):
+                        destino[indice].append(m)
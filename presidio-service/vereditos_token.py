@@ -0,0 +1,123 @@
+"""
+Cache de Vereditos por Palavra - compartilhado entre requisições
+
+O NameValidator.is_valid_name consulta o NameDataset (ou o léxico compacto)
+para cada palavra de cada candidato PERSON, e de novo a cada requisição,
+mesmo para palavras que aparecem em quase toda manifestação ("Maria",
+"Silva", "Secretaria"). O veredito de uma palavra não depende do texto:
+
+    VereditoToken(primeiro_nome, sobrenome,      ← NameDataset / léxico
+                  nunca_nome,                    ← blacklist definitiva
+                  primeiro_comum, sobrenome_comum)  ← listas brasileiras
+
+O CacheVereditos guarda esses vereditos por palavra em minúsculas (a busca
+do NameDataset é por Title Case, então a caixa não muda o resultado), em um
+LRU limitado por quantidade de palavras e protegido por lock - o mesmo
+validador atende as threads do executor. Cada recarga do léxico
+(validators.recarregar_lexico_nomes) invalida o cache; um veredito calculado
+com o léxico antigo durante a recarga não é guardado.
+
+O mesmo CacheVereditos guarda a parte do LocationValidator que não depende
+do contexto (blacklist, estados/cidades, localidades, PyCountry), por texto
+em minúsculas: "Brasília" em frases diferentes é decidida uma vez.
+
+Configuração por variáveis de ambiente:
+- PRESIDIO_CACHE_TOKENS: máximo de palavras em cache (padrão: 50000, 0 desliga)
+- PRESIDIO_CACHE_LOCAIS: máximo de textos de localização em cache (padrão: 20000, 0 desliga)
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple
+
+
+class VereditoToken(NamedTuple):
+    primeiro_nome: bool
+    sobrenome: bool
+    nunca_nome: bool
+    primeiro_comum: bool
+    sobrenome_comum: bool
+
+
+class CacheVereditos:
+    """
+    Cache LRU chave normalizada → veredito, seguro entre threads
+    """
+
+    def __init__(self, max_entradas: int = 50000):
+        """
+        Args:
+            max_entradas: Quantidade máxima de vereditos (0 desliga o cache)
+        """
+        if max_entradas < 0:
+            raise ValueError("max_entradas não pode ser negativo")
+
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._geracao = 0
+
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.invalidacoes = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.max_entradas > 0
+
+    def obter(self, chave: Hashable, calcular: Callable[[Any], Any]) -> Any:
+        """Veredito de `chave` (já normalizada), calculado por `calcular` na falha"""
+        if not self.ativo:
+            return calcular(chave)
+
+        with self._lock:
+            veredito = self._entradas.get(chave)
+            if veredito is not None:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return veredito
+            self.falhas += 1
+            geracao = self._geracao
+
+        # Fora do lock: a consulta ao léxico não bloqueia as outras threads
+        veredito = calcular(chave)
+
+        with self._lock:
+            if geracao == self._geracao:
+                self._entradas[chave] = veredito
+                if len(self._entradas) > self.max_entradas:
+                    self._entradas.popitem(last=False)
+                    self.remocoes += 1
+        return veredito
+
+    def invalidar(self) -> None:
+        """Descarta todos os vereditos (léxico ou listas recarregados)"""
+        with self._lock:
+            self._entradas.clear()
+            self._geracao += 1
+            self.invalidacoes += 1
+
+    def status(self) -> Dict[str, Any]:
+        """Estado atual do cache (usado pelo /api/health e /api/metrics)"""
+        consultas = self.acertos + self.falhas
+        return {
+            "ativo": self.ativo,
+            "entradas": len(self._entradas),
+            "max_entradas": self.max_entradas,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "remocoes": self.remocoes,
+            "invalidacoes": self.invalidacoes,
+            "taxa_acerto": round(self.acertos / consultas, 4) if consultas else 0.0,
+        }
+
+
+def criar_cache_do_ambiente() -> CacheVereditos:
+    """Cria o cache de palavras a partir de PRESIDIO_CACHE_TOKENS"""
+    return CacheVereditos(max_entradas=int(os.getenv("PRESIDIO_CACHE_TOKENS", "50000")))
+
+
+def criar_cache_locais_do_ambiente() -> CacheVereditos:
+    """Cria o cache de localizações a partir de PRESIDIO_CACHE_LOCAIS"""
+    return CacheVereditos(max_entradas=int(os.getenv("PRESIDIO_CACHE_LOCAIS", "20000")))